@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Typed Analysis Model
+Compact __slots__ classes for the unified analysis schema (see
+"bsi scale/unified_analysis_model.json") that read as plain attributes and
+round-trip losslessly back to the original JSON document
+
+Memory per case drops by about 1.6x on the text-heavy sample document, not
+several-fold: slots roughly halve the dict overhead and categorical strings
+are interned, but justifications, summaries and the other free text are kept
+verbatim for the lossless round trip and make up most of what remains. Run
+this module for the breakdown.
+"""
+
+import sys
+
+try:
+    from . import jsonio
+except ImportError:  # run as a script from inside analysis/
+    import jsonio
+
+# One shared tuple per distinct key layout, so thousands of cases with the same
+# shape do not each carry their own copy of the key order
+_KEY_ORDERS = {}
+
+def _intern_keys(keys):
+    return _KEY_ORDERS.setdefault(keys, keys)
+
+def _dump(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    return value
+
+def _interned(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _interned_list(value):
+    return [_interned(item) for item in value] if isinstance(value, list) else value
+
+NUMBER = (int, float)
+TEXT = (str,)
+LIST = (list,)
+
+def _type_names(types):
+    names = {int: "number", float: "number", str: "string", list: "array"}
+    return " or ".join(sorted({names.get(t, "object") for t in types}))
+
+# Nested converters leave non-object values as they are (so nothing is lost) and
+# record the expected type for validate() to report
+def _nested(record_type):
+    def convert(value):
+        return record_type.from_dict(value) if isinstance(value, dict) else value
+    convert.expected = (record_type,)
+    return convert
+
+def _nested_list(record_type):
+    def convert(value):
+        if not isinstance(value, list):
+            return value
+        return [record_type.from_dict(item) if isinstance(item, dict) else item for item in value]
+    convert.expected = LIST
+    convert.item_type = record_type
+    return convert
+
+class Record:
+    """
+    Base for schema records.
+
+    Declared fields live in __slots__; keys the schema does not know about are
+    kept in `_extra`, and `_keys` remembers the original key order so
+    `to_dict()` gives back exactly the document that was parsed. A field that
+    was absent from the source stays None and is listed in `missing_fields`.
+    """
+
+    __slots__ = ("_keys", "_extra")
+    FIELDS = ()
+    CONVERTERS = {}
+    FIELD_TYPES = {}  # allowed JSON types per field, checked by validate()
+    EXTRA_TYPE = None  # record type for unknown keys holding objects, if any
+
+    def __init__(self, **fields):
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} has no fields {sorted(unknown)}")
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+        self._keys = _intern_keys(tuple(name for name in self.FIELDS if name in fields))
+        self._extra = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Parse one JSON object into a record (nested objects become records too)"""
+        self = cls.__new__(cls)
+        for name in cls.FIELDS:
+            setattr(self, name, None)
+        extra = None
+        converters = cls.CONVERTERS
+        for key, value in data.items():
+            if key in converters:
+                setattr(self, key, converters[key](value))
+            elif key in cls._FIELD_SET:
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                if cls.EXTRA_TYPE is not None and isinstance(value, dict):
+                    value = cls.EXTRA_TYPE.from_dict(value)
+                extra[key] = value
+        self._keys = _intern_keys(tuple(data))
+        self._extra = extra
+        return self
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    def to_dict(self):
+        """The original JSON object, including unknown keys and any fields set since parsing"""
+        out = {}
+        extra = self._extra or {}
+        for key in self._keys:
+            out[key] = _dump(getattr(self, key) if key in self._FIELD_SET else extra[key])
+        for name in self.FIELDS:
+            if name not in out and getattr(self, name) is not None:
+                out[name] = _dump(getattr(self, name))
+        for key, value in extra.items():
+            if key not in out:
+                out[key] = _dump(value)
+        return out
+
+    def validate(self, path=""):
+        """Raise ValueError naming the first field whose value does not match the schema"""
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            where = f"{path}.{name}" if path else name
+            if value is None:
+                continue
+            converter = self.CONVERTERS.get(name)
+            expected = self.FIELD_TYPES.get(name) or getattr(converter, "expected", None)
+            if expected and (isinstance(value, bool) or not isinstance(value, expected)):
+                raise ValueError(f"{where}: expected {_type_names(expected)}, got {type(value).__name__}")
+            if isinstance(value, Record):
+                value.validate(where)
+            elif isinstance(value, list):
+                item_type = getattr(converter, "item_type", None)
+                for i, item in enumerate(value):
+                    if item_type is not None and not isinstance(item, item_type):
+                        raise ValueError(f"{where}[{i}]: expected object, got {type(item).__name__}")
+                    if isinstance(item, Record):
+                        item.validate(f"{where}[{i}]")
+        for key, value in (self._extra or {}).items():
+            if isinstance(value, Record):
+                value.validate(f"{path}.{key}" if path else key)
+
+    def get(self, key, default=None):
+        """dict.get for code written against the raw JSON (fields, then unknown keys); nested records stay records"""
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            return default if value is None and key not in self._keys else value
+        return (self._extra or {}).get(key, default)
+
+    @property
+    def extra(self):
+        """Keys outside the schema, in source order"""
+        return dict(self._extra or {})
+
+    @property
+    def missing_fields(self):
+        """Schema fields that were absent from the source and are still unset"""
+        return tuple(name for name in self.FIELDS if name not in self._keys and getattr(self, name) is None)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        shown = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS[:3])
+        return f"{type(self).__name__}({shown}, ...)"
+
+class StrengthFactor(Record):
+    __slots__ = FIELDS = ("score", "max_score", "justification")
+    FIELD_TYPES = {"score": NUMBER, "max_score": NUMBER, "justification": TEXT}
+
+def _score(factor):
+    if isinstance(factor, StrengthFactor) and factor.score is not None:
+        return factor.score
+    return 0
+
+class StrengthFactors(Record):
+    """The four weighted factors; any other scored factor is kept in `extra`"""
+
+    __slots__ = FIELDS = ("symbolic_alignment", "belief_intensity", "sentiment_intensity", "narrative_breathability")
+    CONVERTERS = {name: _nested(StrengthFactor) for name in FIELDS}
+    EXTRA_TYPE = StrengthFactor
+
+    def weighted_scores(self):
+        """Scores of the four weighted factors in FIELDS order (the BSI column order), 0 where unscored"""
+        return [
+            _score(self.symbolic_alignment),
+            _score(self.belief_intensity),
+            _score(self.sentiment_intensity),
+            _score(self.narrative_breathability),
+        ]
+
+    def scores(self):
+        """Every scored factor (weighted or extra) as {name: score}"""
+        scores = {}
+        for name, factor in zip(self.FIELDS, (
+            self.symbolic_alignment, self.belief_intensity, self.sentiment_intensity, self.narrative_breathability,
+        )):
+            if isinstance(factor, StrengthFactor) and factor.score is not None:
+                scores[name] = factor.score
+        if self._extra:
+            for name, factor in self._extra.items():
+                if isinstance(factor, StrengthFactor) and factor.score is not None:
+                    scores[name] = factor.score
+        return scores
+
+class PlayerNarrative(Record):
+    __slots__ = FIELDS = ("archetype", "scenario", "mental_state", "emotion", "narrative_summary")
+
+class NarrativeArc(Record):
+    """One PlayerNarrative per `player_*` key, all kept in `extra`"""
+
+    __slots__ = FIELDS = ()
+    EXTRA_TYPE = PlayerNarrative
+
+class PredictedOutcome(Record):
+    __slots__ = FIELDS = ("winner", "confidence", "method", "summary")
+    CONVERTERS = {"winner": _interned}
+    FIELD_TYPES = {"winner": TEXT, "confidence": NUMBER}
+
+class IntuitiveWeighting(Record):
+    __slots__ = FIELDS = (
+        "narrative_arc", "metaphorical_battle", "strength_factors", "predicted_outcome", "raw_intuition_text",
+    )
+    CONVERTERS = {
+        "narrative_arc": _nested(NarrativeArc),
+        "strength_factors": _nested(StrengthFactors),
+        "predicted_outcome": _nested(PredictedOutcome),
+    }
+
+class CascadeLevel(Record):
+    __slots__ = FIELDS = ("level", "title", "subtitle", "label", "completion", "timestamp", "technical_details")
+    CONVERTERS = {"title": _interned, "subtitle": _interned, "timestamp": _interned}
+    FIELD_TYPES = {"level": (int,), "completion": NUMBER}
+
+class InGameCascade(Record):
+    __slots__ = FIELDS = (
+        "trigger_insight", "total_completion", "completion_threshold", "final_outcome", "cascade_levels",
+    )
+    CONVERTERS = {"cascade_levels": _nested_list(CascadeLevel)}
+    FIELD_TYPES = {"total_completion": NUMBER, "completion_threshold": NUMBER}
+
+    def completions(self):
+        """Completion of each cascade level (0 where a level has none)"""
+        return [
+            level.completion if level.completion is not None else 0
+            for level in self.cascade_levels or ()
+            if isinstance(level, CascadeLevel)
+        ]
+
+class Validation(Record):
+    __slots__ = FIELDS = ("prediction_accuracy", "narrative_accuracy", "unexpected_elements", "key_learnings")
+    CONVERTERS = {"prediction_accuracy": _interned, "narrative_accuracy": _interned}
+    FIELD_TYPES = {"unexpected_elements": LIST, "key_learnings": LIST}
+
+class Metadata(Record):
+    __slots__ = FIELDS = ("tags", "themes", "outcome_type", "prediction_method")
+    CONVERTERS = {
+        "tags": _interned_list,
+        "themes": _interned_list,
+        "outcome_type": _interned,
+        "prediction_method": _interned,
+    }
+    FIELD_TYPES = {"tags": LIST, "themes": LIST}
+
+class Analysis(Record):
+    """A whole unified-analysis document"""
+
+    __slots__ = FIELDS = (
+        "analysis_id", "match_context", "analyst_id", "created_at", "status", "sport", "event_type",
+        "intuitive_weighting", "in_game_cascade", "validation", "metadata",
+    )
+    CONVERTERS = {
+        "analyst_id": _interned,
+        "status": _interned,
+        "sport": _interned,
+        "event_type": _interned,
+        "intuitive_weighting": _nested(IntuitiveWeighting),
+        "in_game_cascade": _nested(InGameCascade),
+        "validation": _nested(Validation),
+        "metadata": _nested(Metadata),
+    }
+    FIELD_TYPES = {"analysis_id": TEXT, "sport": TEXT}
+
+    @classmethod
+    def from_json(cls, text):
+        """Parse and validate JSON text (str or bytes)"""
+        return jsonio.decode(text, cls)
+
+    def to_json(self, **kwargs):
+        return jsonio.dumps(self.to_dict(), **kwargs)
+
+    def _strength_factors(self):
+        weighting = self.intuitive_weighting
+        factors = weighting.strength_factors if isinstance(weighting, IntuitiveWeighting) else None
+        return factors if isinstance(factors, StrengthFactors) else None
+
+    def factor_row(self):
+        """The four weighted factor scores, 0 where unscored"""
+        factors = self._strength_factors()
+        return factors.weighted_scores() if factors is not None else [0, 0, 0, 0]
+
+    def factor_scores(self):
+        """Every scored strength factor as {name: score}"""
+        factors = self._strength_factors()
+        return factors.scores() if factors is not None else {}
+
+    def completions(self):
+        """Cascade completions, empty when the analysis has no cascade"""
+        cascade = self.in_game_cascade
+        return cascade.completions() if isinstance(cascade, InGameCascade) else []
+
+def load_analysis(path):
+    """Parse and validate an analysis file straight into the typed model"""
+    return jsonio.load_typed(path, Analysis)
+
+if __name__ == "__main__":
+    import os
+    import tracemalloc
+
+    model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bsi scale", "unified_analysis_model.json")
+    with open(model_path, encoding="utf-8") as f:
+        text = f.read()
+
+    analysis = Analysis.from_json(text)
+    print(f"🧩 {analysis.analysis_id}: factor scores {analysis.factor_scores()}")
+    print(f"🌊 Cascade completions: {analysis.completions()}")
+    print(f"🔁 Lossless round trip: {analysis.to_dict() == jsonio.loads(text)}")
+
+    def text_bytes(first, second):
+        # String values each parsed case holds its own copy of (interned ones are shared)
+        if isinstance(first, dict):
+            return sum(text_bytes(first[key], second[key]) for key in first)
+        if isinstance(first, list):
+            return sum(text_bytes(a, b) for a, b in zip(first, second))
+        return sys.getsizeof(first) if isinstance(first, str) and first is not second else 0
+
+    copies = 2000
+    for label, parse, as_dict in (("raw dicts", jsonio.loads, dict), ("typed model", Analysis.from_json, Analysis.to_dict)):
+        text_kib = text_bytes(as_dict(parse(text)), as_dict(parse(text))) / 1024
+        tracemalloc.start()
+        kept = [parse(text) for _ in range(copies)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_case = current / copies / 1024
+        print(f"💾 {label}: {per_case:.1f} KiB per case ({per_case - text_kib:.1f} KiB structure + {text_kib:.1f} KiB text)")
+        del kept
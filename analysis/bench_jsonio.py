@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+JSON I/O Benchmark
+Loads and dumps the real case, model, log and PNL files scaled up N times
+(10,000x by default) with every installed jsonio backend
+"""
+
+import os
+import sys
+import time
+
+import jsonio
+from analysis_model import Analysis
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(ANALYSIS_DIR)
+
+SAMPLE_FILES = (
+    os.path.join(ANALYSIS_DIR, "historical_cases", "low_bsi_reference_case.json"),
+    os.path.join(ANALYSIS_DIR, "historical_cases", "case_index.json"),
+    os.path.join(ANALYSIS_DIR, "system_updates_log.json"),
+    os.path.join(REPO_DIR, "bsi scale", "unified_analysis_model.json"),
+    os.path.join(REPO_DIR, "data.json"),
+    os.path.join(REPO_DIR, "data", "pnl_data.json"),
+)
+MODEL_FILE = SAMPLE_FILES[3]
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def bench_backend(backend, blobs, scale):
+    """Seconds to load and dump every blob `scale` times, plus one scale-sized array document"""
+    documents = [backend.loads(blob) for blob in blobs]
+    case_array = [documents[0]] * scale
+    case_array_blob = backend.dumps(case_array).encode("utf-8")
+
+    def load_all():
+        for _ in range(scale):
+            for blob in blobs:
+                backend.loads(blob)
+
+    def dump_all():
+        for _ in range(scale):
+            for doc in documents:
+                backend.dumps(doc)
+
+    return {
+        "load": timed(load_all),
+        "dump": timed(dump_all),
+        "load_array": timed(lambda: backend.loads(case_array_blob)),
+        "dump_array": timed(lambda: backend.dumps(case_array)),
+    }
+
+if __name__ == "__main__":
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    blobs = []
+    for path in SAMPLE_FILES:
+        with open(path, "rb") as f:
+            blobs.append(f.read())
+    total_mb = sum(map(len, blobs)) * scale / 1e6
+
+    print(f"📊 JSON benchmark: {len(blobs)} real files x {scale:,} ({total_mb:,.0f} MB per pass)")
+    print(f"   default backend: {jsonio.BACKEND.name}")
+    results = {}
+    for name, backend in jsonio.BACKENDS.items():
+        results[name] = bench_backend(backend, blobs, scale)
+        r = results[name]
+        print(f"  {name:<8} load {r['load']:7.3f}s  dump {r['dump']:7.3f}s"
+              f"  | {scale:,}-case array: load {r['load_array']:6.3f}s  dump {r['dump_array']:6.3f}s")
+
+    baseline = results["json"]
+    for name, r in results.items():
+        if name != "json":
+            print(f"\n⚡ {name} vs stdlib: load {baseline['load'] / r['load']:.1f}x, dump {baseline['dump'] / r['dump']:.1f}x")
+
+    with open(MODEL_FILE, "rb") as f:
+        model_blob = f.read()
+
+    def decode_all():
+        for _ in range(scale):
+            Analysis.from_json(model_blob)
+
+    elapsed = timed(decode_all)
+    print(f"🧩 Typed decode of unified_analysis_model.json x {scale:,}: {elapsed:.3f}s ({scale / elapsed:,.0f} cases/s)")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Re-Path Benchmark
+Compares the precompiled prompt plan table against the original per-read re-path path
+
+The legacy_* functions are verbatim copies of the pre-batch bsi_repath code,
+so the baseline doesn't pick up any overhead from the current module.
+"""
+
+import gc
+import random
+import sys
+import time
+
+from bsi_repath import (
+    PATTERN_NAMES,
+    REPATH_PLANS,
+    STRENGTH_FACTORS,
+    calculate_bsi_score,
+    calculate_bsi_scores,
+    detect_low_flexibility_patterns,
+    detect_low_flexibility_patterns_batch,
+    generate_repath_prompts,
+    pattern_masks,
+)
+
+def make_synthetic_analyses(count, seed=7):
+    """Build random analyses shaped like the unified analysis model"""
+    rng = random.Random(seed)
+    analyses, contra_flags_list = [], []
+    for _ in range(count):
+        analyses.append({
+            "intuitive_weighting": {
+                "strength_factors": {
+                    name: {"score": round(rng.uniform(1.0, 10.0), 1)} for name in STRENGTH_FACTORS
+                }
+            },
+            "in_game_cascade": {
+                "cascade_levels": [{"completion": rng.randint(0, 100)} for _ in range(rng.randint(0, 5))]
+            }
+        })
+        contra_flags_list.append(["flag"] * rng.randint(0, 4))
+    return analyses, contra_flags_list
+
+def legacy_prompt_plan(patterns):
+    """Original path: build prompt dicts per call, then sort them by priority_order"""
+    prompts = []
+    if "high_contradiction_count" in patterns:
+        prompts.append({"type": "contradiction_resolution", "prompt": "...", "focus": "logical_consistency"})
+    if "uneven_reasoning_chain" in patterns:
+        prompts.append({"type": "reasoning_chain", "prompt": "...", "focus": "sequential_logic"})
+    if "incomplete_narrative" in patterns:
+        prompts.append({"type": "narrative_expansion", "prompt": "...", "focus": "narrative_depth"})
+    if "binary_thinking" in patterns:
+        prompts.append({"type": "nuance_injection", "prompt": "...", "focus": "dimensional_thinking"})
+    if any(pattern in patterns for pattern in ["incomplete_narrative", "binary_thinking"]):
+        prompts.append({"type": "eyes_never_lie_check", "prompt": "...", "focus": "direct_observation"})
+    if "high_contradiction_count" in patterns or "binary_thinking" in patterns:
+        prompts.append({"type": "reality_anchor", "prompt": "...", "focus": "evidence_grounding"})
+    prompts.append({"type": "state_reset", "prompt": "...", "focus": "intuitive_reset"})
+
+    priority_order = ["state_reset", "contradiction_resolution", "narrative_expansion", "reasoning_chain", "nuance_injection"]
+    sorted_prompts = []
+    for priority in priority_order:
+        for prompt in prompts:
+            if prompt["type"] == priority:
+                sorted_prompts.append(prompt)
+    return sorted_prompts
+
+def legacy_bsi_score(analysis_data):
+    factors = analysis_data.get('intuitive_weighting', {}).get('strength_factors', {})
+    
+    symbolic_alignment = factors.get('symbolic_alignment', {}).get('score', 0)
+    belief_intensity = factors.get('belief_intensity', {}).get('score', 0) 
+    sentiment_intensity = factors.get('sentiment_intensity', {}).get('score', 0)
+    narrative_breathability = factors.get('narrative_breathability', {}).get('score', 0)
+    
+    return (
+        symbolic_alignment * 0.2 +
+        belief_intensity * 0.3 + 
+        sentiment_intensity * 0.2 +
+        narrative_breathability * 0.3
+    )
+
+def legacy_detect_patterns(analysis_data, contra_flags):
+    patterns = []
+    
+    if len(contra_flags) > 2:
+        patterns.append("high_contradiction_count")
+    
+    cascade_levels = analysis_data.get('in_game_cascade', {}).get('cascade_levels', [])
+    if cascade_levels:
+        completions = [level.get('completion', 0) for level in cascade_levels]
+        if max(completions) - min(completions) > 40:
+            patterns.append("uneven_reasoning_chain")
+    
+    breathability = analysis_data.get('intuitive_weighting', {}).get('strength_factors', {}).get('narrative_breathability', {}).get('score', 0)
+    if breathability < 6.5:
+        patterns.append("incomplete_narrative")
+    
+    factors = analysis_data.get('intuitive_weighting', {}).get('strength_factors', {})
+    extreme_scores = 0
+    for factor in factors.values():
+        if isinstance(factor, dict) and 'score' in factor:
+            score = factor['score']
+            if score < 3 or score > 9:
+                extreme_scores += 1
+    
+    if extreme_scores >= 2:
+        patterns.append("binary_thinking")
+    
+    return patterns
+
+def run_legacy(analyses, contra_flags_list):
+    plans = []
+    for analysis_data, contra_flags in zip(analyses, contra_flags_list):
+        if legacy_bsi_score(analysis_data) < 7.0:
+            plans.append(legacy_prompt_plan(legacy_detect_patterns(analysis_data, contra_flags)))
+        else:
+            plans.append(None)
+    return plans
+
+def run_per_read(analyses, contra_flags_list):
+    """Current single-read functions, one analysis at a time (the interactive path)"""
+    plans = []
+    for analysis_data, contra_flags in zip(analyses, contra_flags_list):
+        if calculate_bsi_score(analysis_data) < 7.0:
+            plans.append(generate_repath_prompts(detect_low_flexibility_patterns(analysis_data, contra_flags), None))
+        else:
+            plans.append(None)
+    return plans
+
+def run_plan_table(analyses, contra_flags_list):
+    low_bsi = calculate_bsi_scores(analyses) < 7.0
+    masks = pattern_masks(detect_low_flexibility_patterns_batch(analyses, contra_flags_list))
+    return [REPATH_PLANS[mask] if low else None for mask, low in zip(masks.tolist(), low_bsi.tolist())]
+
+def run_legacy_scores(analyses):
+    return [legacy_bsi_score(analysis_data) for analysis_data in analyses]
+
+def run_legacy_detection(analyses, contra_flags_list):
+    return [legacy_detect_patterns(analysis_data, contra_flags) for analysis_data, contra_flags in zip(analyses, contra_flags_list)]
+
+def run_plan_lookup_only(pattern_lists):
+    return [generate_repath_prompts(patterns, None) for patterns in pattern_lists]
+
+def run_legacy_prompts_only(pattern_lists):
+    return [legacy_prompt_plan(patterns) for patterns in pattern_lists]
+
+def timed(label, func, *args, repeat=5):
+    """Best of `repeat` runs with the collector off (as timeit does), which filters out most noise"""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(*args)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    print(f"  {label:<32} {best:8.3f}s")
+    return result, best
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    analyses, contra_flags_list = make_synthetic_analyses(count)
+    pattern_lists = [
+        [name for name, detected in zip(PATTERN_NAMES, row) if detected]
+        for row in detect_low_flexibility_patterns_batch(analyses, contra_flags_list)
+    ]
+
+    print(f"📊 Re-path benchmark over {count:,} synthetic analyses")
+    print("Prompt generation + ordering:")
+    _, legacy_prompts = timed("legacy build + sort", run_legacy_prompts_only, pattern_lists)
+    _, table_prompts = timed("plan table lookup", run_plan_lookup_only, pattern_lists)
+    print("BSI scores:")
+    _, legacy_scores = timed("legacy per-read", run_legacy_scores, analyses)
+    _, batch_scores = timed("calculate_bsi_scores", calculate_bsi_scores, analyses)
+    print("Pattern detection:")
+    _, legacy_detect = timed("legacy per-read", run_legacy_detection, analyses, contra_flags_list)
+    _, batch_detect = timed("batch detector", detect_low_flexibility_patterns_batch, analyses, contra_flags_list)
+    print("Full re-path (score, detect, prompts):")
+    _, legacy_full = timed("legacy per-read", run_legacy, analyses, contra_flags_list)
+    _, per_read_full = timed("current per-read", run_per_read, analyses, contra_flags_list)
+    _, table_full = timed("batch + plan table", run_plan_table, analyses, contra_flags_list)
+
+    # Ratios above 1 are speedups over the legacy path, below 1 slowdowns
+    print(f"\n⚡ BSI scores: {legacy_scores / batch_scores:.2f}x")
+    print(f"⚡ Pattern detection: {legacy_detect / batch_detect:.2f}x")
+    print(f"⚡ Prompt generation: {legacy_prompts / table_prompts:.2f}x")
+    print(f"⚡ Per-read end-to-end: {legacy_full / per_read_full:.2f}x")
+    print(f"⚡ Batch end-to-end: {legacy_full / table_full:.2f}x")
@@ -4,144 +4,364 @@ BSI Re-Pathing System
 Detects low-conviction reads and guides user through targeted improvement prompts
 """
 
-def calculate_bsi_score(analysis_data):
-    """Calculate BSI score from analysis factors"""
-    factors = analysis_data.get('intuitive_weighting', {}).get('strength_factors', {})
-    
-    symbolic_alignment = factors.get('symbolic_alignment', {}).get('score', 0)
-    belief_intensity = factors.get('belief_intensity', {}).get('score', 0) 
-    sentiment_intensity = factors.get('sentiment_intensity', {}).get('score', 0)
-    narrative_breathability = factors.get('narrative_breathability', {}).get('score', 0)
-    
-    # Weighted BSI calculation (breathability is most important indicator)
-    bsi_score = (
-        symbolic_alignment * 0.2 +
-        belief_intensity * 0.3 + 
-        sentiment_intensity * 0.2 +
-        narrative_breathability * 0.3
+from itertools import chain
+from operator import itemgetter
+from types import MappingProxyType
+
+import numpy as np
+
+try:
+    from .analysis_model import Analysis
+except ImportError:  # run as a script from inside analysis/
+    from analysis_model import Analysis
+
+# Column order of the strength factor matrix used by the batch engine
+# (typed analyses return StrengthFactors.weighted_scores() in the same order)
+STRENGTH_FACTORS = (
+    "symbolic_alignment",
+    "belief_intensity",
+    "sentiment_intensity",
+    "narrative_breathability",
+)
+
+# Weighted BSI calculation (breathability is most important indicator)
+BSI_WEIGHTS = np.array([0.2, 0.3, 0.2, 0.3])
+_BSI_WEIGHT_LIST = BSI_WEIGHTS.tolist()
+
+# Cut-offs used by the re-path trigger and pattern detection
+DEFAULT_THRESHOLDS = MappingProxyType({
+    "low_bsi": 7.0,             # re-path below this BSI
+    "contradiction_count": 2,   # more contra flags than this
+    "cascade_spread": 40,       # max - min cascade completion above this
+    "breathability": 6.5,       # narrative breathability below this
+    "extreme_low": 3,           # factor scores below this are extreme
+    "extreme_high": 9,          # factor scores above this are extreme
+    "min_extreme_scores": 2,    # binary thinking at this many extremes
+})
+
+def _strength_factors(analysis_data):
+    return analysis_data.get('intuitive_weighting', {}).get('strength_factors', {})
+
+def _factor_values(analyses):
+    """Flat stream of the four weighted factor scores of each analysis (0 where unscored)"""
+    for analysis_data in analyses:
+        try:
+            # Fully scored dict analyses (the common case) by plain subscripts
+            factors = analysis_data['intuitive_weighting']['strength_factors']
+            row = (
+                factors['symbolic_alignment']['score'],
+                factors['belief_intensity']['score'],
+                factors['sentiment_intensity']['score'],
+                factors['narrative_breathability']['score'],
+            )
+        except (KeyError, TypeError):
+            row = _factor_row(analysis_data)
+        yield from row
+
+def _factor_row(analysis_data):
+    """The four weighted factor scores in STRENGTH_FACTORS order (0 where unscored)"""
+    if isinstance(analysis_data, Analysis):
+        return analysis_data.factor_row()
+    factors = _strength_factors(analysis_data)
+    return [factors.get(name, {}).get('score', 0) for name in STRENGTH_FACTORS]
+
+_SCORE = itemgetter('score')
+_COMPLETION = itemgetter('completion')
+
+def _pattern_inputs(analysis_data):
+    """(breathability, every scored factor, cascade completions) of one analysis"""
+    try:
+        # Well-formed dict analyses (the common case) by plain subscripts
+        factors = analysis_data['intuitive_weighting']['strength_factors']
+        return (
+            factors['narrative_breathability']['score'],
+            list(map(_SCORE, factors.values())),
+            list(map(_COMPLETION, analysis_data['in_game_cascade']['cascade_levels'])),
+        )
+    except (KeyError, TypeError):
+        pass
+    if isinstance(analysis_data, Analysis):
+        scores = analysis_data.factor_scores()
+        return scores.get('narrative_breathability', 0), list(scores.values()), analysis_data.completions()
+    factors = _strength_factors(analysis_data)
+    return (
+        factors.get('narrative_breathability', {}).get('score', 0),
+        [factor['score'] for factor in factors.values() if isinstance(factor, dict) and 'score' in factor],
+        [level.get('completion', 0) for level in analysis_data.get('in_game_cascade', {}).get('cascade_levels', [])],
     )
-    
-    return bsi_score
 
-def detect_low_flexibility_patterns(analysis_data, contra_flags):
-    """Detect specific patterns indicating reduced mental flexibility"""
+def load_factor_matrix(analyses):
+    """Load the strength factor scores of many analyses into an (N, 4) matrix"""
+    analyses = analyses if isinstance(analyses, (list, tuple)) else list(analyses)
+    width = len(STRENGTH_FACTORS)
+    # One pass straight into a preallocated buffer; no per-row lists
+    return np.fromiter(_factor_values(analyses), dtype=float, count=width * len(analyses)).reshape(-1, width)
+
+def weighted_factor_sum(factor_matrix, weights=BSI_WEIGHTS):
+    """BSI scores of an (N, 4) factor matrix
+
+    Column by column in the same order as calculate_bsi_score, so batch and
+    single-read scores agree to the last bit (a BLAS dot product may round
+    differently right at the re-path threshold). `weights` may also be a
+    (4, P) matrix, one column per weight profile, giving an (N, P) result.
+    """
+    weights = np.asarray(weights, dtype=float)
+    columns = factor_matrix.T if weights.ndim == 1 else factor_matrix.T[:, :, None]
+    total = columns[0] * weights[0]
+    for column, weight in zip(columns[1:], weights[1:]):
+        total = total + column * weight
+    return total
+
+def calculate_bsi_scores(analyses, weights=BSI_WEIGHTS):
+    """Calculate BSI scores for a batch of analyses in a few whole-column operations
+
+    `weights` may also be a (4, P) matrix, one column per weight profile,
+    giving an (N, P) score matrix.
+    """
+    return weighted_factor_sum(load_factor_matrix(analyses), weights)
+
+def calculate_bsi_score(analysis_data, weights=BSI_WEIGHTS):
+    """Calculate BSI score from analysis factors
+
+    Plain Python for a single read: building arrays for N=1 costs more than
+    the four multiplications, so use calculate_bsi_scores for batches.
+    """
+    symbolic, belief, sentiment, breathability = _BSI_WEIGHT_LIST if weights is BSI_WEIGHTS else np.asarray(weights, dtype=float).tolist()
+    if isinstance(analysis_data, Analysis):
+        row = analysis_data.factor_row()
+        return row[0] * symbolic + row[1] * belief + row[2] * sentiment + row[3] * breathability
+    factors = _strength_factors(analysis_data)
+    return (
+        factors.get('symbolic_alignment', {}).get('score', 0) * symbolic +
+        factors.get('belief_intensity', {}).get('score', 0) * belief +
+        factors.get('sentiment_intensity', {}).get('score', 0) * sentiment +
+        factors.get('narrative_breathability', {}).get('score', 0) * breathability
+    )
+
+# Column order of the pattern matrix returned by the batch detector
+PATTERN_NAMES = (
+    "high_contradiction_count",
+    "uneven_reasoning_chain",
+    "incomplete_narrative",
+    "binary_thinking",
+)
+
+_BREATHABILITY, _SCORES, _COMPLETIONS = itemgetter(0), itemgetter(1), itemgetter(2)
+
+def _ragged(inputs, field, count):
+    """Row lengths and concatenated values of one list field of the per-analysis inputs"""
+    lengths = np.fromiter(map(len, map(field, inputs)), dtype=np.intp, count=count)
+    values = np.fromiter(chain.from_iterable(map(field, inputs)), dtype=float, count=int(lengths.sum()))
+    return lengths, values
+
+def extract_pattern_features(analyses, contra_flags_list):
+    """Gather the columnar inputs of pattern detection for N analyses
+
+    Each analysis is read once; every column is then filled from flat C-level
+    iterators, and the ragged factor scores and cascade completions are
+    scattered or reduced as whole arrays rather than row by row.
+    """
+    inputs = list(map(_pattern_inputs, analyses))
+    count = len(inputs)
+
+    # Every scored factor counts towards binary thinking, not just the weighted four.
+    # Rows are NaN-padded to the widest; row-major order lets one masked assignment fill them.
+    score_counts, scores = _ragged(inputs, _SCORES, count)
+    factor_scores = np.full((count, int(score_counts.max(initial=0))), np.nan)
+    factor_scores[np.arange(factor_scores.shape[1]) < score_counts[:, None]] = scores
+
+    # Spread per row by segment-wise max/min over the concatenated completions
+    level_counts, completions = _ragged(inputs, _COMPLETIONS, count)
+    has_levels = level_counts > 0
+    cascade_spread = np.full(count, -np.inf)
+    starts = (np.cumsum(level_counts) - level_counts)[has_levels]
+    if starts.size:
+        cascade_spread[has_levels] = np.maximum.reduceat(completions, starts) - np.minimum.reduceat(completions, starts)
+
+    return {
+        "contra_counts": np.fromiter(map(len, contra_flags_list), dtype=int, count=count),
+        "has_levels": has_levels,
+        "cascade_spread": cascade_spread,
+        "breathability": np.fromiter(map(_BREATHABILITY, inputs), dtype=float, count=count),
+        "factor_scores": factor_scores,
+    }
+
+def patterns_from_features(features, thresholds=DEFAULT_THRESHOLDS):
+    """Apply detection thresholds to extracted pattern features
+
+    Scalar thresholds give an (N, 4) boolean matrix. Threshold arrays of
+    length P (one entry per weight profile) give an (N, P, 4) matrix.
+    """
+    t = {key: np.asarray(value, dtype=float) for key, value in thresholds.items()}
+    per_profile = any(value.ndim for value in t.values())
+
+    def column(name):
+        return features[name][:, None] if per_profile else features[name]
+
+    # Check for contradictory statements
+    high_contradiction = column("contra_counts") > t["contradiction_count"]
+
+    # Check for uneven cascade completion (high variance)
+    uneven_chain = column("has_levels") & (column("cascade_spread") > t["cascade_spread"])
+
+    # Check for low narrative breathability
+    incomplete_narrative = column("breathability") < t["breathability"]
+
+    # Check for binary thinking (extreme scores)
+    scores = features["factor_scores"][:, None, :] if per_profile else features["factor_scores"]
+    extreme = (scores < t["extreme_low"][..., None]) | (scores > t["extreme_high"][..., None])
+    binary_thinking = extreme.sum(axis=-1) >= t["min_extreme_scores"]
+
+    return np.stack([high_contradiction, uneven_chain, incomplete_narrative, binary_thinking], axis=-1)
+
+def detect_low_flexibility_patterns_batch(analyses, contra_flags_list, thresholds=DEFAULT_THRESHOLDS):
+    """Detect low-flexibility patterns for N analyses in one columnar pass
+
+    Returns an (N, len(PATTERN_NAMES)) boolean matrix whose columns follow
+    PATTERN_NAMES. `contra_flags_list` holds one list of contra flags per analysis.
+    """
+    return patterns_from_features(extract_pattern_features(analyses, contra_flags_list), thresholds)
+
+def detect_low_flexibility_patterns(analysis_data, contra_flags, thresholds=DEFAULT_THRESHOLDS):
+    """Detect specific patterns indicating reduced mental flexibility
+
+    Plain Python for a single read (same rules as the batch detector, which
+    only pays off for N > 1).
+    """
+    t = thresholds
+    breathability, scores, completions = _pattern_inputs(analysis_data)
     patterns = []
     
     # Check for contradictory statements
-    if len(contra_flags) > 2:
+    if len(contra_flags) > t["contradiction_count"]:
         patterns.append("high_contradiction_count")
     
     # Check for uneven cascade completion
-    cascade_levels = analysis_data.get('in_game_cascade', {}).get('cascade_levels', [])
-    if cascade_levels:
-        completions = [level.get('completion', 0) for level in cascade_levels]
-        if max(completions) - min(completions) > 40:  # High variance
-            patterns.append("uneven_reasoning_chain")
+    if completions and max(completions) - min(completions) > t["cascade_spread"]:  # High variance
+        patterns.append("uneven_reasoning_chain")
     
     # Check for low narrative breathability
-    breathability = analysis_data.get('intuitive_weighting', {}).get('strength_factors', {}).get('narrative_breathability', {}).get('score', 0)
-    if breathability < 6.5:
+    if breathability < t["breathability"]:
         patterns.append("incomplete_narrative")
     
     # Check for binary thinking (extreme scores)
-    factors = analysis_data.get('intuitive_weighting', {}).get('strength_factors', {})
-    extreme_scores = 0
-    for factor in factors.values():
-        if isinstance(factor, dict) and 'score' in factor:
-            score = factor['score']
-            if score < 3 or score > 9:
-                extreme_scores += 1
-    
-    if extreme_scores >= 2:
+    low, high = t["extreme_low"], t["extreme_high"]
+    if sum(1 for score in scores if score < low or score > high) >= t["min_extreme_scores"]:
         patterns.append("binary_thinking")
     
     return patterns
 
-def generate_repath_prompts(low_flexibility_patterns, original_read):
-    """Generate targeted prompts based on detected patterns"""
-    prompts = []
-    
-    if "high_contradiction_count" in low_flexibility_patterns:
-        prompts.append({
-            "type": "contradiction_resolution",
-            "prompt": "I notice contradictory statements in your read. Let's clarify: You said [Player A] has X quality, but also said [Player B] can match it. Which is the dominant factor? Take 30 seconds to think through this one point only.",
-            "focus": "logical_consistency"
-        })
-    
-    if "uneven_reasoning_chain" in low_flexibility_patterns:
-        prompts.append({
-            "type": "reasoning_chain", 
-            "prompt": "Your initial insight is strong, but the reasoning chain breaks down. Let's trace one path: IF your initial insight is correct, what would you expect to see happen first in the match? Just focus on the immediate next step.",
-            "focus": "sequential_logic"
-        })
-    
-    if "incomplete_narrative" in low_flexibility_patterns:
-        prompts.append({
-            "type": "narrative_expansion",
-            "prompt": "The story feels incomplete. Imagine you're explaining this matchup to someone who's never seen either player. What's the ONE thing that makes this interesting? What's at stake beyond just winning?",
-            "focus": "narrative_depth"
-        })
-    
-    if "binary_thinking" in low_flexibility_patterns:
-        prompts.append({
-            "type": "nuance_injection",
-            "prompt": "You're thinking in extremes (all power vs. no power). Let's add nuance: On a scale of 1-10, rate both players on the SAME dimension. Where do they actually differ by 2-3 points rather than 8-10 points?",
-            "focus": "dimensional_thinking"
-        })
-    
-    # Add reality anchor prompts based on Low BSI Reference Case learnings
-    if any(pattern in low_flexibility_patterns for pattern in ["incomplete_narrative", "binary_thinking"]):
-        prompts.append({
-            "type": "eyes_never_lie_check",
-            "prompt": "Stop analyzing and just observe: If you could see both players right now, what would their eyes tell you? What does their body language actually show? The eyes never lie - what do you SEE, not think?",
-            "focus": "direct_observation"
-        })
-    
-    if "high_contradiction_count" in low_flexibility_patterns or "binary_thinking" in low_flexibility_patterns:
-        prompts.append({
-            "type": "reality_anchor",
-            "prompt": "You're building a theoretical framework. Step back: What actual evidence from recent matches, interviews, or head-to-head history supports this? What specific examples can you point to?",
-            "focus": "evidence_grounding"
-        })
-    
-    # Always include a state reset prompt
-    prompts.append({
+# Prompt catalogue, built once at import. Entries are read-only views shared by
+# every plan; the public functions hand out dict copies that callers may edit.
+REPATH_PROMPTS = MappingProxyType({
+    "contradiction_resolution": MappingProxyType({
+        "type": "contradiction_resolution",
+        "prompt": "I notice contradictory statements in your read. Let's clarify: You said [Player A] has X quality, but also said [Player B] can match it. Which is the dominant factor? Take 30 seconds to think through this one point only.",
+        "focus": "logical_consistency"
+    }),
+    "reasoning_chain": MappingProxyType({
+        "type": "reasoning_chain",
+        "prompt": "Your initial insight is strong, but the reasoning chain breaks down. Let's trace one path: IF your initial insight is correct, what would you expect to see happen first in the match? Just focus on the immediate next step.",
+        "focus": "sequential_logic"
+    }),
+    "narrative_expansion": MappingProxyType({
+        "type": "narrative_expansion",
+        "prompt": "The story feels incomplete. Imagine you're explaining this matchup to someone who's never seen either player. What's the ONE thing that makes this interesting? What's at stake beyond just winning?",
+        "focus": "narrative_depth"
+    }),
+    "nuance_injection": MappingProxyType({
+        "type": "nuance_injection",
+        "prompt": "You're thinking in extremes (all power vs. no power). Let's add nuance: On a scale of 1-10, rate both players on the SAME dimension. Where do they actually differ by 2-3 points rather than 8-10 points?",
+        "focus": "dimensional_thinking"
+    }),
+    # Reality anchor prompts based on Low BSI Reference Case learnings
+    "eyes_never_lie_check": MappingProxyType({
+        "type": "eyes_never_lie_check",
+        "prompt": "Stop analyzing and just observe: If you could see both players right now, what would their eyes tell you? What does their body language actually show? The eyes never lie - what do you SEE, not think?",
+        "focus": "direct_observation"
+    }),
+    "reality_anchor": MappingProxyType({
+        "type": "reality_anchor",
+        "prompt": "You're building a theoretical framework. Step back: What actual evidence from recent matches, interviews, or head-to-head history supports this? What specific examples can you point to?",
+        "focus": "evidence_grounding"
+    }),
+    "state_reset": MappingProxyType({
         "type": "state_reset",
         "prompt": "Take 60 seconds. Close your eyes. What's your gut feeling about this match when you're not trying to analyze it? What's the first image or word that comes to mind?",
         "focus": "intuitive_reset"
-    })
-    
-    return prompts
+    }),
+})
+
+# Prompts triggered by each pattern
+PATTERN_PROMPTS = {
+    "high_contradiction_count": ("contradiction_resolution", "reality_anchor"),
+    "uneven_reasoning_chain": ("reasoning_chain",),
+    "incomplete_narrative": ("narrative_expansion", "eyes_never_lie_check"),
+    "binary_thinking": ("nuance_injection", "eyes_never_lie_check", "reality_anchor"),
+}
+
+# Priority order for prompts (state reset is always included)
+PROMPT_PRIORITY = (
+    "state_reset",
+    "contradiction_resolution",
+    "narrative_expansion",
+    "reasoning_chain",
+    "nuance_injection",
+    "eyes_never_lie_check",
+    "reality_anchor",
+)
+
+# Bit value of each pattern in a pattern bitmask
+PATTERN_BITS = {name: 1 << bit for bit, name in enumerate(PATTERN_NAMES)}
 
-def execute_repath_protocol(analysis_data, contra_flags, original_read):
+def patterns_to_mask(patterns):
+    """Encode a list of pattern names as a bitmask"""
+    mask = 0
+    for pattern in patterns:
+        mask |= PATTERN_BITS[pattern]
+    return mask
+
+def pattern_masks(pattern_matrix):
+    """Encode each row of a batch pattern matrix as a bitmask"""
+    return pattern_matrix.astype(int) @ (1 << np.arange(len(PATTERN_NAMES)))
+
+def _build_repath_plans():
+    plans = {}
+    for mask in range(1 << len(PATTERN_NAMES)):
+        wanted = {"state_reset"}
+        for name, bit in PATTERN_BITS.items():
+            if mask & bit:
+                wanted.update(PATTERN_PROMPTS[name])
+        plans[mask] = tuple(REPATH_PROMPTS[prompt_type] for prompt_type in PROMPT_PRIORITY if prompt_type in wanted)
+    return MappingProxyType(plans)
+
+# Frozen lookup from pattern bitmask to an already-ordered prompt tuple
+REPATH_PLANS = _build_repath_plans()
+
+def generate_repath_prompts(low_flexibility_patterns, original_read):
+    """Generate targeted prompts based on detected patterns, in priority order"""
+    return [prompt.copy() for prompt in REPATH_PLANS[patterns_to_mask(low_flexibility_patterns)]]
+
+def execute_repath_protocol(analysis_data, contra_flags, original_read, weights=BSI_WEIGHTS, thresholds=DEFAULT_THRESHOLDS):
     """Main re-pathing function"""
-    bsi_score = calculate_bsi_score(analysis_data)
+    bsi_score = calculate_bsi_score(analysis_data, weights)
     
     print(f"🧠 BSI Score: {bsi_score:.1f}/10")
     
-    if bsi_score < 7.0:  # Low BSI threshold
+    if bsi_score < thresholds["low_bsi"]:  # Low BSI threshold
         print("🚨 LOW BSI DETECTED - Initiating Re-Path Protocol")
         
-        patterns = detect_low_flexibility_patterns(analysis_data, contra_flags)
+        patterns = detect_low_flexibility_patterns(analysis_data, contra_flags, thresholds)
         prompts = generate_repath_prompts(patterns, original_read)
         
         print(f"\n🔍 Detected patterns: {', '.join(patterns)}")
         print(f"📋 Generated {len(prompts)} targeted prompts")
         
-        # Priority order for prompts
-        priority_order = ["state_reset", "contradiction_resolution", "narrative_expansion", "reasoning_chain", "nuance_injection"]
-        
-        sorted_prompts = []
-        for priority in priority_order:
-            for prompt in prompts:
-                if prompt["type"] == priority:
-                    sorted_prompts.append(prompt)
-        
         return {
             "repath_required": True,
             "bsi_score": bsi_score,
             "patterns_detected": patterns,
-            "prompts": sorted_prompts,
+            "prompts": prompts,
             "recommendation": "Complete at least the first 2 prompts before finalizing analysis"
         }
     else:
@@ -151,6 +371,139 @@ def execute_repath_protocol(analysis_data, contra_flags, original_read):
             "status": "Analysis quality acceptable"
         }
 
+class BSISession:
+    """Incremental BSI state for a single analysis being edited
+
+    Keeps the weighted sum and per-pattern state so that editing one strength
+    factor, one cascade level or the contra flags only updates what changed.
+    Each edit returns the delta: new score, patterns and prompts added or
+    removed.
+    """
+
+    def __init__(self, analysis_data, contra_flags=(), weights=BSI_WEIGHTS, thresholds=DEFAULT_THRESHOLDS):
+        self.factor_weights = dict(zip(STRENGTH_FACTORS, np.asarray(weights, dtype=float).tolist()))
+        self.thresholds = thresholds
+        if isinstance(analysis_data, Analysis):
+            self.factor_scores = analysis_data.factor_scores()
+            self.completions = analysis_data.completions()
+        else:
+            self.factor_scores = {
+                name: factor['score'] for name, factor in _strength_factors(analysis_data).items()
+                if isinstance(factor, dict) and 'score' in factor
+            }
+            self.completions = [
+                level.get('completion', 0)
+                for level in analysis_data.get('in_game_cascade', {}).get('cascade_levels', [])
+            ]
+        self.weighted_sum = self._weighted_sum()
+        self.extreme_count = sum(1 for score in self.factor_scores.values() if self._is_extreme(score))
+        self.contra_count = len(contra_flags)
+        self.pattern_mask = self._compute_mask()
+        self.prompt_plan = self._current_plan()
+
+    def _weighted_sum(self):
+        # Summed afresh in calculate_bsi_score's order, so the session agrees with it
+        # exactly; a running `sum += weight * delta` drifts by an ulp and can flip
+        # repath_required right at the low_bsi cut-off
+        scores, weights = self.factor_scores, self.factor_weights
+        return (
+            scores.get('symbolic_alignment', 0) * weights['symbolic_alignment'] +
+            scores.get('belief_intensity', 0) * weights['belief_intensity'] +
+            scores.get('sentiment_intensity', 0) * weights['sentiment_intensity'] +
+            scores.get('narrative_breathability', 0) * weights['narrative_breathability']
+        )
+
+    def _is_extreme(self, score):
+        return score < self.thresholds["extreme_low"] or score > self.thresholds["extreme_high"]
+
+    @property
+    def bsi_score(self):
+        return self.weighted_sum
+
+    @property
+    def repath_required(self):
+        return self.weighted_sum < self.thresholds["low_bsi"]
+
+    @property
+    def patterns(self):
+        return [name for name in PATTERN_NAMES if self.pattern_mask & PATTERN_BITS[name]]
+
+    def _compute_mask(self):
+        mask = 0
+        t = self.thresholds
+        if self.contra_count > t["contradiction_count"]:
+            mask |= PATTERN_BITS["high_contradiction_count"]
+        # The seesaw has a handful of levels, so the spread is a constant-size scan
+        if self.completions and max(self.completions) - min(self.completions) > t["cascade_spread"]:
+            mask |= PATTERN_BITS["uneven_reasoning_chain"]
+        if self.factor_scores.get('narrative_breathability', 0) < t["breathability"]:
+            mask |= PATTERN_BITS["incomplete_narrative"]
+        if self.extreme_count >= t["min_extreme_scores"]:
+            mask |= PATTERN_BITS["binary_thinking"]
+        return mask
+
+    def _current_plan(self):
+        return REPATH_PLANS[self.pattern_mask] if self.repath_required else ()
+
+    def _refresh(self):
+        """Recompute patterns and prompts, returning only what changed"""
+        previous_mask, previous_plan = self.pattern_mask, self.prompt_plan
+        self.pattern_mask = self._compute_mask()
+        self.prompt_plan = self._current_plan()
+
+        added_mask = self.pattern_mask & ~previous_mask
+        removed_mask = previous_mask & ~self.pattern_mask
+        previous_types = {prompt["type"] for prompt in previous_plan}
+        current_types = {prompt["type"] for prompt in self.prompt_plan}
+        return {
+            "bsi_score": self.bsi_score,
+            "repath_required": self.repath_required,
+            "patterns_added": [name for name in PATTERN_NAMES if added_mask & PATTERN_BITS[name]],
+            "patterns_removed": [name for name in PATTERN_NAMES if removed_mask & PATTERN_BITS[name]],
+            "prompts_added": [prompt.copy() for prompt in self.prompt_plan if prompt["type"] not in previous_types],
+            "prompts_removed": [prompt["type"] for prompt in previous_plan if prompt["type"] not in current_types],
+        }
+
+    def set_factor(self, name, score):
+        """Update one strength factor score"""
+        previous = self.factor_scores.get(name)
+        if previous is not None and self._is_extreme(previous):
+            self.extreme_count -= 1
+        if self._is_extreme(score):
+            self.extreme_count += 1
+        self.factor_scores[name] = score
+        self.weighted_sum = self._weighted_sum()
+        return self._refresh()
+
+    def set_cascade_level(self, index, completion):
+        """Update one cascade level's completion (index == len appends a new level)"""
+        if index == len(self.completions):
+            self.completions.append(completion)
+        else:
+            self.completions[index] = completion
+        return self._refresh()
+
+    def set_contra_flags(self, contra_flags):
+        """Replace the contra flags for the read"""
+        self.contra_count = len(contra_flags)
+        return self._refresh()
+
+    def result(self):
+        """Current state in the same shape as execute_repath_protocol"""
+        if self.repath_required:
+            return {
+                "repath_required": True,
+                "bsi_score": self.bsi_score,
+                "patterns_detected": self.patterns,
+                "prompts": [prompt.copy() for prompt in self.prompt_plan],
+                "recommendation": "Complete at least the first 2 prompts before finalizing analysis"
+            }
+        return {
+            "repath_required": False,
+            "bsi_score": self.bsi_score,
+            "status": "Analysis quality acceptable"
+        }
+
 # Example usage
 if __name__ == "__main__":
     # Test with the Anisimova vs Sabalenka analysis
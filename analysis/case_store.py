@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Historical Case Store
+Append-only log of archived cases with in-memory inverted indexes for tag,
+sport, case type, learning theme and BSI-range lookups. case_index.json is
+regenerated from the store as a derived view instead of being edited by hand.
+"""
+
+import bisect
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+
+try:
+    from . import jsonio
+except ImportError:  # run as a script from inside analysis/
+    import jsonio
+
+HISTORICAL_CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "historical_cases")
+DEFAULT_LOG_PATH = os.path.join(HISTORICAL_CASES_DIR, "case_log.ndjson")
+DEFAULT_INDEX_PATH = os.path.join(HISTORICAL_CASES_DIR, "case_index.json")
+
+def files_stamp(paths):
+    """(name, mtime, size) of each file, or of every file in each directory, to detect changes"""
+    stamp = []
+    for path in paths:
+        try:
+            if os.path.isdir(path):
+                for entry in sorted(os.scandir(path), key=lambda entry: entry.name):
+                    if entry.is_file():
+                        info = entry.stat()
+                        stamp.append((entry.path, info.st_mtime_ns, info.st_size))
+            else:
+                info = os.stat(path)
+                stamp.append((path, info.st_mtime_ns, info.st_size))
+        except FileNotFoundError:
+            stamp.append((path, None, None))
+    return tuple(stamp)
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class CaseStore:
+    """
+    Append-only case log plus inverted indexes.
+
+    Every change is one appended NDJSON record, so adding a case never rewrites
+    existing data. Replaying the log on open rebuilds the indexes; a later record
+    for the same case_id supersedes the earlier one.
+    """
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH):
+        self.log_path = log_path
+        self.cases = {}
+        self.case_types = {}
+        self.learning_themes = {}
+        self.last_updated = None
+        self.by_tag = defaultdict(set)
+        self.by_sport = defaultdict(set)
+        self.by_case_type = defaultdict(set)
+        self.by_learning_theme = defaultdict(set)
+        self._bsi_scores = []  # sorted (bsi_score, case_id)
+        self._bsi_pending = []  # appended since the last range query
+        self._bsi_stale = set()  # case_ids whose earlier score entries must be skipped
+
+        if os.path.exists(log_path):
+            with open(log_path, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    if line.strip():
+                        try:
+                            self._apply(jsonio.loads(line))
+                        except (ValueError, KeyError) as e:
+                            raise ValueError(f"{log_path}:{line_number}: bad case log record ({e})") from None
+
+    def __len__(self):
+        return len(self.cases)
+
+    # --- Writes -----------------------------------------------------------
+
+    def _append(self, record):
+        record.setdefault("recorded_at", _now())
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(jsonio.dumps(record) + "\n")
+        self._apply(record)
+
+    def add_case(self, case):
+        """Append (or supersede) one case index entry; needs at least a case_id"""
+        if not case.get("case_id"):
+            raise ValueError("case entry needs a case_id")
+        self._append({"kind": "case", "case": dict(case)})
+
+    def set_case_type(self, name, description, key_patterns=()):
+        self._append({"kind": "case_type", "name": name, "description": description, "key_patterns": list(key_patterns)})
+
+    def set_learning_theme(self, name, lesson):
+        self._append({"kind": "learning_theme", "name": name, "lesson": lesson})
+
+    def _apply(self, record):
+        kind = record["kind"]
+        if kind == "case":
+            self._index_case(record["case"])
+        elif kind == "case_type":
+            self.case_types[record["name"]] = {
+                "description": record["description"],
+                "key_patterns": record.get("key_patterns", []),
+            }
+        elif kind == "learning_theme":
+            self.learning_themes[record["name"]] = record["lesson"]
+        else:
+            raise KeyError(f"unknown record kind {kind!r}")
+        self.last_updated = max(filter(None, (self.last_updated, record.get("recorded_at"))), default=None)
+
+    def _index_case(self, case):
+        case_id = case["case_id"]
+        previous = self.cases.get(case_id)
+        if previous is not None:
+            self._unindex_case(previous)
+        self.cases[case_id] = case
+
+        for tag in case.get("tags", []):
+            self.by_tag[tag].add(case_id)
+        if case.get("sport"):
+            self.by_sport[case["sport"]].add(case_id)
+        if case.get("case_type"):
+            self.by_case_type[case["case_type"]].add(case_id)
+        for theme in case.get("learning_themes", []):
+            self.by_learning_theme[theme].add(case_id)
+        if case.get("bsi_score") is not None:
+            self._bsi_pending.append((case["bsi_score"], case_id))
+
+    def _unindex_case(self, case):
+        case_id = case["case_id"]
+        for tag in case.get("tags", []):
+            self.by_tag[tag].discard(case_id)
+        self.by_sport[case.get("sport")].discard(case_id)
+        self.by_case_type[case.get("case_type")].discard(case_id)
+        for theme in case.get("learning_themes", []):
+            self.by_learning_theme[theme].discard(case_id)
+        if case.get("bsi_score") is not None:
+            self._bsi_stale.add(case_id)
+
+    # --- Queries ----------------------------------------------------------
+
+    def _sorted_bsi(self):
+        if self._bsi_pending or self._bsi_stale:
+            scores = self._bsi_scores + self._bsi_pending
+            if self._bsi_stale:
+                scores = [(score, case_id) for score, case_id in scores if self.cases[case_id].get("bsi_score") == score]
+            self._bsi_scores = sorted(set(scores))
+            self._bsi_pending = []
+            self._bsi_stale = set()
+        return self._bsi_scores
+
+    def bsi_range(self, low=float("-inf"), high=float("inf")):
+        """case_ids with low <= bsi_score <= high, lowest score first"""
+        scores = self._sorted_bsi()
+        start = bisect.bisect_left(scores, (low, ""))
+        end = bisect.bisect_right(scores, (high, "￿"))
+        return [case_id for _, case_id in scores[start:end]]
+
+    def query(self, tags=(), sport=None, case_type=None, learning_theme=None, bsi_min=None, bsi_max=None):
+        """Cases matching every given filter (tags must all be present)"""
+        candidates = []
+        candidates.extend(self.by_tag.get(tag, set()) for tag in tags)
+        if sport is not None:
+            candidates.append(self.by_sport.get(sport, set()))
+        if case_type is not None:
+            candidates.append(self.by_case_type.get(case_type, set()))
+        if learning_theme is not None:
+            candidates.append(self.by_learning_theme.get(learning_theme, set()))
+        if bsi_min is not None or bsi_max is not None:
+            candidates.append(set(self.bsi_range(
+                float("-inf") if bsi_min is None else bsi_min,
+                float("inf") if bsi_max is None else bsi_max,
+            )))
+
+        if not candidates:
+            return list(self.cases.values())
+        matches = set.intersection(*sorted(candidates, key=len))
+        return [self.cases[case_id] for case_id in self.cases if case_id in matches]
+
+    # --- Derived views ----------------------------------------------------
+
+    def to_index(self):
+        """Build the case_index.json document from the store"""
+        cases = [
+            {key: value for key, value in case.items() if key != "learning_themes"}
+            for case in self.cases.values()
+        ]
+        return {
+            "historical_cases_index": {
+                "last_updated": self.last_updated,
+                "total_cases": len(cases),
+                "cases": cases,
+                "case_types": {
+                    name: {
+                        "description": case_type["description"],
+                        "count": len(self.by_case_type.get(name, ())),
+                        "key_patterns": case_type["key_patterns"],
+                    }
+                    for name, case_type in self.case_types.items()
+                },
+                "learning_themes": {
+                    name: {
+                        "cases": [case_id for case_id in self.cases if case_id in self.by_learning_theme.get(name, ())],
+                        "lesson": lesson,
+                    }
+                    for name, lesson in self.learning_themes.items()
+                },
+            }
+        }
+
+    def write_index(self, index_path=DEFAULT_INDEX_PATH):
+        """Regenerate case_index.json atomically"""
+        jsonio.dump(self.to_index(), index_path, indent=2)
+
+    def compact(self):
+        """Rewrite the log with only the latest record per case, type and theme"""
+        tmp_path = f"{self.log_path}.tmp"
+        stamp = self.last_updated or _now()
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for name, case_type in self.case_types.items():
+                f.write(jsonio.dumps({"kind": "case_type", "name": name, **case_type, "recorded_at": stamp}) + "\n")
+            for name, lesson in self.learning_themes.items():
+                f.write(jsonio.dumps({"kind": "learning_theme", "name": name, "lesson": lesson, "recorded_at": stamp}) + "\n")
+            for case in self.cases.values():
+                f.write(jsonio.dumps({"kind": "case", "case": case, "recorded_at": stamp}) + "\n")
+        os.replace(tmp_path, self.log_path)
+
+    @classmethod
+    def from_case_index(cls, index_path=DEFAULT_INDEX_PATH, log_path=DEFAULT_LOG_PATH):
+        """Seed a new case log from a hand-maintained case_index.json"""
+        if os.path.exists(log_path):
+            raise FileExistsError(f"{log_path} already exists; open it with CaseStore() instead")
+        index = jsonio.load(index_path)["historical_cases_index"]
+
+        themes_by_case = defaultdict(list)
+        for name, theme in index.get("learning_themes", {}).items():
+            for case_id in theme.get("cases", []):
+                themes_by_case[case_id].append(name)
+
+        stamp = index.get("last_updated") or _now()
+        store = cls(log_path)
+        for name, case_type in index.get("case_types", {}).items():
+            store._append({"kind": "case_type", "name": name, "description": case_type.get("description", ""),
+                           "key_patterns": case_type.get("key_patterns", []), "recorded_at": stamp})
+        for name, theme in index.get("learning_themes", {}).items():
+            store._append({"kind": "learning_theme", "name": name, "lesson": theme.get("lesson", ""), "recorded_at": stamp})
+        for case in index.get("cases", []):
+            store._append({"kind": "case", "case": {**case, "learning_themes": themes_by_case[case["case_id"]]},
+                           "recorded_at": stamp})
+        return store
+
+if __name__ == "__main__":
+    store = CaseStore() if os.path.exists(DEFAULT_LOG_PATH) else CaseStore.from_case_index()
+    print(f"🗃️  {len(store)} cases in {store.log_path}")
+    print(f"🏷️  low_bsi cases: {[case['case_id'] for case in store.query(tags=['low_bsi'])]}")
+    print(f"📉 BSI < 7.0: {store.bsi_range(high=6.999)}")
+    store.write_index()
+    print(f"📁 Regenerated {DEFAULT_INDEX_PATH}")
@@ -1,15 +1,22 @@
 import os
-import google.generativeai as genai
+import re
+
+try:
+    from .contra_backends import create_backend
+    from .contra_cache import ContraCache
+except ImportError:  # run as a script from inside analysis/
+    from contra_backends import create_backend
+    from contra_cache import ContraCache
 
 # --- Configuration ---
-# IMPORTANT: Set your Google API key as an environment variable before running.
+# IMPORTANT: Set your Google API key as an environment variable to use Gemini.
 # In your terminal: export GOOGLE_API_KEY='your_api_key_here'
-API_KEY = os.getenv("GOOGLE_API_KEY")
-
-if not API_KEY:
-    raise ValueError("🔴 GOOGLE_API_KEY environment variable not set. Please set it before running.")
+# Set CONTRA_BACKEND=local to force the offline rule-based backend. Without an
+# API key Contra falls back to it automatically. google.generativeai is only
+# imported once the Gemini backend is first used.
+CONTRA_BACKEND = os.getenv("CONTRA_BACKEND") or ("gemini" if os.getenv("GOOGLE_API_KEY") else "local")
 
-genai.configure(api_key=API_KEY)
+MODEL_NAME = 'gemini-1.5-pro-latest'
 
 # --- System Prompt for Contra ---
 # This prompt is derived from your example in `voices/contra`
@@ -32,29 +39,193 @@ When you analyze a read, you MUST follow this protocol:
 Your tone should be sharp, analytical, and focused on helping the user refine their thinking by exposing flaws in their reasoning. Do not provide market advice. Only analyze the user's text for internal consistency.
 """
 
-def check_read_with_contra(user_read: str) -> str:
+# Cognitive patterns Contra is asked to use in its **Pattern** field
+CONTRA_PATTERNS = (
+    "Expectation vs. Condition Mismatch",
+    "Paradox Identification Without Exploration",
+    "Power Factor Without Weight Assignment",
+    "Fundamental Trait vs. Arbitrary Limitation",
+)
+
+_model = None
+_cache = None
+
+def get_contra_model():
+    """Shared Contra backend (see CONTRA_BACKEND), created on first use"""
+    global _model
+    if _model is None:
+        _model = create_backend(CONTRA_BACKEND, MODEL_NAME, CONTRA_SYSTEM_PROMPT)
+    return _model
+
+def get_contra_cache():
+    """Shared on-disk response cache, opened on first use"""
+    global _cache
+    if _cache is None:
+        _cache = ContraCache()
+    return _cache
+
+def _cache_lookup(model, user_read, cache):
     """
-    Analyzes a user's trading read using the "Contra" Gemini model.
+    (cache, key, cached response) for a read. A cache that fails to open or
+    answer comes back as None, so callers fall through to an uncached call.
+    """
+    try:
+        cache = cache or get_contra_cache()
+        key = ContraCache.make_key(CONTRA_SYSTEM_PROMPT, getattr(model, 'model_name', MODEL_NAME), user_read)
+        return cache, key, cache.get(key)
+    except Exception as e:
+        print(f"⚠️ Contra cache unavailable, calling the model directly: {e}")
+        return None, None, None
+
+def _cache_store(cache, key, text):
+    try:
+        cache.put(key, text)
+    except Exception as e:
+        print(f"⚠️ Could not cache Contra analysis: {e}")
+
+def check_read_with_contra(user_read: str, model=None, cache=None, use_cache: bool = True) -> str:
+    """
+    Analyzes a user's trading read using the "Contra" model.
 
     Args:
         user_read: The text of the trading read to analyze.
+        model: Optional model client exposing `generate_content(text)` (e.g. a local fake).
+            Defaults to the shared backend from get_contra_model().
+        cache: Optional ContraCache. Defaults to the shared on-disk cache.
+        use_cache: Set to False to always call the model.
 
     Returns:
         The analysis from the Contra model as a string.
     """
+    model = model or get_contra_model()
+    cache, key, cached = _cache_lookup(model, user_read, cache) if use_cache else (None, None, None)
+    if cached is not None:
+        print("⚡ Contra analysis served from cache.")
+        return cached
+
     print("🧠 Accessing Contra for analysis...")
     try:
-        model = genai.GenerativeModel(
-            model_name='gemini-1.5-pro-latest',
-            system_instruction=CONTRA_SYSTEM_PROMPT
-        )
         response = model.generate_content(user_read)
+        # .text raises for blocked or empty candidates, so read it inside the try
+        text = response.text
         print("✅ Contra analysis complete.")
-        return response.text
     except Exception as e:
         print(f"🔴 Error communicating with Contra: {e}")
         return "Error: Could not get analysis from Contra."
 
+    if cache is not None:
+        _cache_store(cache, key, text)
+    return text
+
+def stream_read_with_contra(user_read: str, model=None, cache=None, use_cache: bool = True):
+    """
+    Streams Contra's analysis of a read, yielding text as it arrives.
+
+    Args:
+        user_read: The text of the trading read to analyze.
+        model: Optional model client supporting `generate_content(text, stream=True)`.
+        cache: Optional ContraCache. Defaults to the shared on-disk cache.
+        use_cache: Set to False to always call the model.
+
+    Yields:
+        Chunks of the analysis text. A cached analysis is yielded in one chunk.
+    """
+    model = model or get_contra_model()
+    cache, key, cached = _cache_lookup(model, user_read, cache) if use_cache else (None, None, None)
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    try:
+        for chunk in model.generate_content(user_read, stream=True):
+            if chunk.text:
+                chunks.append(chunk.text)
+                yield chunk.text
+    except Exception as e:
+        print(f"🔴 Error communicating with Contra: {e}")
+        yield "Error: Could not get analysis from Contra."
+        return
+
+    if cache is not None:
+        _cache_store(cache, key, "".join(chunks))
+
+# Matches "-   **Statement**: ...", "**Flag:** ...", "2. Pattern: ..." and similar
+_FIELD_LINE = re.compile(r"^[\s>*+\-\d.]*\**\s*(statement|pattern|flag)\s*\**\s*:\s*\**\s*(.*)$", re.IGNORECASE)
+
+def _clean_value(value):
+    return value.strip().strip("*`").strip()
+
+def _canonical_pattern(value):
+    value = _clean_value(value)
+    for pattern in CONTRA_PATTERNS:
+        if pattern.lower() in value.lower():
+            return pattern
+    return value
+
+class ContraFlagParser:
+    """
+    Incremental parser for Contra's Statement / Pattern / Flag blocks.
+
+    Feed it text chunks as they stream in; each call returns the records whose
+    block has completed, as `{"statement", "pattern", "flag"}` dicts. A block is
+    complete once its flag is followed by a blank line, a heading or the next
+    statement. Call `close()` at the end of the stream for the last block.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._record = None
+        self._field = None
+        self.records = []
+
+    def feed(self, chunk: str) -> list:
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split("\n")
+        completed = []
+        for line in lines:
+            self._parse_line(line, completed)
+        return completed
+
+    def close(self) -> list:
+        completed = []
+        if self._buffer:
+            self._parse_line(self._buffer, completed)
+            self._buffer = ""
+        self._finish(completed)
+        return completed
+
+    def _finish(self, completed):
+        if self._record and self._record["statement"]:
+            self.records.append(self._record)
+            completed.append(self._record)
+        self._record = None
+        self._field = None
+
+    def _parse_line(self, line, completed):
+        match = _FIELD_LINE.match(line)
+        if match:
+            field, value = match.group(1).lower(), match.group(2)
+            if field == "statement" or self._record is None:
+                self._finish(completed)
+                self._record = {"statement": None, "pattern": None, "flag": None}
+            self._record[field] = _canonical_pattern(value) if field == "pattern" else _clean_value(value)
+            self._field = field
+        elif not line.strip() or line.lstrip().startswith("#"):
+            if self._record and self._record["flag"]:
+                self._finish(completed)
+            self._field = None
+        elif self._record and self._field and self._field != "pattern":
+            # Wrapped continuation of the current statement or flag
+            self._record[self._field] = f"{self._record[self._field]} {_clean_value(line)}".strip()
+
+def parse_contra_flags(analysis_text: str) -> list:
+    """Parse a complete Contra analysis into `{"statement", "pattern", "flag"}` records"""
+    parser = ContraFlagParser()
+    parser.feed(analysis_text)
+    parser.close()
+    return parser.records
+
 if __name__ == '__main__':
     # This is an example of how to use the function.
     # The main orchestrator script will call `check_read_with_contra`.
@@ -70,5 +241,5 @@ if __name__ == '__main__':
     print("\n--- CONTRA ANALYSIS ---")
     print(analysis)
     print("-----------------------\n")
-    print("To run this yourself, make sure you have your GOOGLE_API_KEY set.")
+    print("To use Gemini, make sure you have your GOOGLE_API_KEY set (otherwise the local backend runs).")
     print("Then you can run: python analysis/contra.py") 
\ No newline at end of file
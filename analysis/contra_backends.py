@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Contra Backends
+Pluggable model backends for Contra: the Gemini provider (loaded lazily) and a
+deterministic local rule-based backend that runs offline, fast enough to call on
+every keystroke.
+
+Every backend mimics the slice of `genai.GenerativeModel` that Contra uses:
+`generate_content(text, stream=False)` returning an object with `.text`, or an
+iterator of such chunks when streaming.
+"""
+
+import os
+import re
+
+class ContraResponse:
+    """Minimal stand-in for a generate_content response or stream chunk"""
+
+    def __init__(self, text):
+        self.text = text
+
+class ContraBackend:
+    """Base class for Contra model backends"""
+
+    model_name = None
+
+    def generate_content(self, user_read, stream=False):
+        raise NotImplementedError
+
+class GeminiBackend(ContraBackend):
+    """Google Gemini backend; the SDK is only imported on first use"""
+
+    def __init__(self, model_name, system_instruction, api_key=None):
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.api_key = api_key
+        self._model = None
+
+    def _client(self):
+        if self._model is None:
+            api_key = self.api_key or os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("🔴 GOOGLE_API_KEY environment variable not set. Please set it before running.")
+
+            import google.generativeai as genai
+
+            genai.configure(api_key=api_key)
+            self._model = genai.GenerativeModel(
+                model_name=self.model_name,
+                system_instruction=self.system_instruction
+            )
+        return self._model
+
+    def generate_content(self, user_read, stream=False):
+        return self._client().generate_content(user_read, stream=stream)
+
+    async def generate_content_async(self, user_read):
+        return await self._client().generate_content_async(user_read)
+
+def _words(*phrases):
+    # (?!\w) rather than a trailing \b: the same for cues ending in a letter, but a
+    # \b after a cue ending in a symbol ("50%" before a space) would never match
+    return re.compile(r"\b(?:" + "|".join(phrases) + r")(?!\w)", re.IGNORECASE)
+
+# Sentence-level cues for each Contra pattern
+_CERTAINTY = _words(
+    r"i expect", r"will (?:win|dominate|cruise|walk)", r"not (?:even )?(?:going to|gonna) be close",
+    r"dont even think", r"don't even think", r"easily", r"no doubt", r"definitely", r"for sure", r"comfortably",
+)
+_HEDGE = _words(
+    r"could go either way", r"either way", r"might", r"possibly", r"maybe", r"not sure", r"could",
+    r"integrating", r"coming back", r"feeling (?:themselves|it) out", r"new players?",
+)
+_PARADOX = _words(
+    r"either way", r"on the other hand", r"or they will", r"or they'll", r"both ways", r"paradox",
+    r"the same thing", r"other side", r"but also",
+)
+_EXPLORATION = _words(r"because", r"which means", r"so that", r"therefore", r"the reason")
+_POWER = _words(
+    r"power", r"strength", r"dominant", r"damage", r"problems", r"threat", r"weapon", r"momentum",
+    r"counter[- ]?attack(?:ing)?", r"firing", r"banged \d+ goals?", r"in form",
+)
+_WEIGHTING = _words(
+    r"outweighs?", r"matters? more", r"more important", r"weight(?:ed|ing)? (?:it|this|that) (?:at|as)",
+    r"\d+\s?%", r"percent", r"decisive factor", r"biggest factor",
+)
+_LIMITATION = _words(
+    r"only", r"incapable", r"nothing but", r"no technique", r"no finesse", r"can't", r"cannot",
+    r"never", r"except", r"all (?:she|he|they) (?:has|have|can do)",
+)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+def _quote(sentence, limit=160):
+    sentence = " ".join(sentence.split())
+    return f'"{sentence[:limit - 3]}..."' if len(sentence) > limit else f'"{sentence}"'
+
+class LocalContraBackend(ContraBackend):
+    """
+    Deterministic, offline Contra backend.
+
+    Scans the read sentence by sentence with precompiled keyword cues for the
+    four Contra patterns and writes its findings in the same Statement / Pattern
+    / Flag format as the hosted model, so ContraFlagParser works unchanged.
+    """
+
+    model_name = "contra-local-rules-v1"
+
+    def analyze(self, user_read):
+        """Return the detected `(statement, pattern, flag)` triples for a read"""
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(user_read) if s.strip()]
+        findings = []
+
+        certain = [s for s in sentences if _CERTAINTY.search(s)]
+        hedged = [s for s in sentences if _HEDGE.search(s)]
+        if certain and hedged and certain[0] is not hedged[0]:
+            findings.append((
+                f"{_quote(certain[0])} vs. {_quote(hedged[0])}",
+                "Expectation vs. Condition Mismatch",
+                "You state the outcome with certainty, but the conditions you describe are still unsettled. "
+                "What would have to be true for your expected outcome to hold?",
+            ))
+        elif certain and hedged:
+            findings.append((
+                _quote(certain[0]),
+                "Expectation vs. Condition Mismatch",
+                "You expect a clear outcome in the same breath as admitting it is uncertain. Which one do you actually believe?",
+            ))
+
+        for sentence in sentences:
+            if _PARADOX.search(sentence) and not _EXPLORATION.search(sentence):
+                findings.append((
+                    _quote(sentence),
+                    "Paradox Identification Without Exploration",
+                    "You name both sides of this tension and move on. Which side wins, and why?",
+                ))
+                break
+
+        if not _WEIGHTING.search(user_read):
+            for sentence in sentences:
+                if _POWER.search(sentence):
+                    findings.append((
+                        _quote(sentence),
+                        "Power Factor Without Weight Assignment",
+                        "You flag this as a real factor but never say how much it matters. "
+                        "How much of your final call rests on it?",
+                    ))
+                    break
+
+        for sentence in sentences:
+            if _LIMITATION.search(sentence):
+                findings.append((
+                    _quote(sentence),
+                    "Fundamental Trait vs. Arbitrary Limitation",
+                    "Is this really an absolute limitation, or a core strength you are framing as a weakness? "
+                    "What evidence would prove it wrong?",
+                ))
+                break
+
+        return findings
+
+    def _blocks(self, user_read):
+        findings = self.analyze(user_read)
+        if not findings:
+            yield "No internal contradictions detected in this read.\n"
+            return
+        for statement, pattern, flag in findings:
+            yield (
+                f"-   **Statement**: {statement}\n"
+                f"-   **Pattern**: `{pattern}`\n"
+                f"-   **Flag**: {flag}\n\n"
+            )
+
+    def generate_content(self, user_read, stream=False):
+        if stream:
+            return (ContraResponse(block) for block in self._blocks(user_read))
+        return ContraResponse("".join(self._blocks(user_read)))
+
+def create_backend(name, model_name, system_instruction):
+    """Build a backend by name: 'gemini' or 'local'"""
+    name = name.lower()
+    if name == "local":
+        return LocalContraBackend()
+    if name == "gemini":
+        return GeminiBackend(model_name, system_instruction)
+    raise ValueError(f"Unknown Contra backend: {name!r} (expected 'gemini' or 'local')")
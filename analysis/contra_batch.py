@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Contra Batch Runner
+Runs Contra over many reads concurrently with a bounded semaphore, per-minute
+request/token budgets and jittered retries, returning results in input order
+"""
+
+import asyncio
+import collections
+import glob
+import os
+import random
+import time
+
+try:
+    from .contra import CONTRA_SYSTEM_PROMPT, MODEL_NAME, get_contra_cache, get_contra_model
+    from .contra_cache import ContraCache
+    from . import jsonio
+except ImportError:  # run as a script from inside analysis/
+    from contra import CONTRA_SYSTEM_PROMPT, MODEL_NAME, get_contra_cache, get_contra_model
+    from contra_cache import ContraCache
+    import jsonio
+
+HISTORICAL_CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "historical_cases")
+
+ERROR_RESPONSE = "Error: Could not get analysis from Contra."
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) used for budgeting"""
+    return max(1, len(text) // 4)
+
+class MinuteBudget:
+    """Sliding one-minute window limiting requests and tokens sent to the model"""
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, window=60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self._sent = collections.deque()  # (timestamp, tokens)
+        self._tokens_in_window = 0
+        self._lock = asyncio.Lock()
+
+    def _expire(self, now):
+        while self._sent and now - self._sent[0][0] >= self.window:
+            self._tokens_in_window -= self._sent.popleft()[1]
+
+    def _wait_time(self, tokens, now):
+        waits = [0.0]
+        if self.requests_per_minute and len(self._sent) >= self.requests_per_minute:
+            waits.append(self._sent[0][0] + self.window - now)
+        if self.tokens_per_minute and self._sent and self._tokens_in_window + tokens > self.tokens_per_minute:
+            # Wait until enough of the oldest requests leave the window
+            freed = self._tokens_in_window + tokens - self.tokens_per_minute
+            for sent_at, sent_tokens in self._sent:
+                freed -= sent_tokens
+                if freed <= 0:
+                    waits.append(sent_at + self.window - now)
+                    break
+        return max(waits)
+
+    async def acquire(self, tokens=1):
+        """Wait until `tokens` fit in the current minute, then record them"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                wait = self._wait_time(tokens, now)
+                if wait <= 0:
+                    self._sent.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return
+                await asyncio.sleep(wait)
+
+async def _generate(model, user_read):
+    if hasattr(model, "generate_content_async"):
+        response = await model.generate_content_async(user_read)
+    else:
+        response = await asyncio.to_thread(model.generate_content, user_read)
+    return response.text
+
+async def check_reads_with_contra_async(
+    reads,
+    model=None,
+    cache=None,
+    use_cache=True,
+    max_concurrency=4,
+    requests_per_minute=60,
+    tokens_per_minute=None,
+    max_retries=3,
+    base_delay=1.0,
+    max_delay=30.0,
+):
+    """
+    Analyzes many reads with Contra concurrently.
+
+    Args:
+        reads: Iterable of read texts.
+        model: Shared model client (defaults to the configured backend from
+            contra.get_contra_model(): Gemini or the offline local rules). Any object
+            with `generate_content` or `generate_content_async` works, e.g. a local stub.
+        cache: Optional ContraCache. Defaults to the shared on-disk cache.
+        use_cache: Set to False to always call the model.
+        max_concurrency: Maximum number of in-flight model calls.
+        requests_per_minute: Request budget per rolling minute (None for unlimited).
+        tokens_per_minute: Estimated token budget per rolling minute (None for unlimited).
+        max_retries: Retries per read after the first failed attempt.
+        base_delay: First backoff delay in seconds, doubled on each retry.
+        max_delay: Cap on a single backoff delay.
+
+    Returns:
+        List of Contra analyses, in the same order as `reads`.
+    """
+    reads = list(reads)
+    model = model or get_contra_model()
+    if use_cache:
+        try:
+            cache = cache or get_contra_cache()
+        except Exception as e:
+            print(f"⚠️ Contra cache unavailable, calling the model directly: {e}")
+            use_cache = False
+    model_name = getattr(model, "model_name", MODEL_NAME)
+    system_tokens = estimate_tokens(CONTRA_SYSTEM_PROMPT)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    budget = MinuteBudget(requests_per_minute, tokens_per_minute)
+
+    async def analyze(user_read):
+        key = ContraCache.make_key(CONTRA_SYSTEM_PROMPT, model_name, user_read)
+        if use_cache:
+            try:
+                cached = cache.get(key)
+            except Exception as e:
+                print(f"⚠️ Contra cache lookup failed, calling the model directly: {e}")
+                cached = None
+            if cached is not None:
+                return cached
+
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                await budget.acquire(system_tokens + estimate_tokens(user_read))
+                try:
+                    text = await _generate(model, user_read)
+                    break
+                except Exception as e:
+                    if attempt == max_retries:
+                        print(f"🔴 Error communicating with Contra after {attempt + 1} attempts: {e}")
+                        return ERROR_RESPONSE
+                    # Full jitter backoff
+                    await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+        if use_cache:
+            try:
+                cache.put(key, text)
+            except Exception as e:
+                print(f"⚠️ Could not cache Contra analysis: {e}")
+        return text
+
+    return await asyncio.gather(*(analyze(user_read) for user_read in reads))
+
+def check_reads_with_contra(reads, **kwargs):
+    """Blocking wrapper around check_reads_with_contra_async"""
+    return asyncio.run(check_reads_with_contra_async(reads, **kwargs))
+
+def _find_raw_texts(node):
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "raw_text" and isinstance(value, str):
+                yield value
+            else:
+                yield from _find_raw_texts(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _find_raw_texts(item)
+
+def archived_reads(cases_dir=HISTORICAL_CASES_DIR):
+    """Yield (case file, raw_text) for every read stored in the historical case archive"""
+    for path in sorted(glob.glob(os.path.join(cases_dir, "*.json"))):
+        for raw_text in _find_raw_texts(jsonio.load(path)):
+            yield path, raw_text
+
+if __name__ == "__main__":
+    archive = list(archived_reads())
+    print(f"🧠 Running Contra over {len(archive)} archived reads...")
+    started = time.perf_counter()
+    results = check_reads_with_contra([raw_text for _, raw_text in archive])
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s")
+
+    for (path, _), analysis in zip(archive, results):
+        print(f"\n--- {os.path.basename(path)} ---")
+        print(analysis)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Contra Response Cache
+Persistent SQLite cache for Contra analyses so resubmitted reads skip the network
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "CONTRA_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".contra_cache.sqlite3"),
+)
+
+def normalize_read(text):
+    """Collapse whitespace so lightly re-formatted reads share a cache entry"""
+    return " ".join(text.split())
+
+class ContraCache:
+    """On-disk LRU + TTL cache of Contra responses keyed by prompt, model and read"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=5000, ttl_seconds=30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        import sqlite3  # deferred so importing analysis.contra stays cheap
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(system_prompt, model_name, read_text):
+        """Hash of everything that determines the model's answer"""
+        digest = hashlib.sha256()
+        for part in (system_prompt, model_name, normalize_read(read_text)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached response, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return response
+
+    def put(self, key, response):
+        """Store a response, evicting the least recently used entries past max_entries"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN"
+                    " (SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+            self._db.commit()
+
+    def purge_expired(self):
+        """Drop every entry older than the TTL"""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._db.commit()
+            self.evictions += cursor.rowcount
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self):
+        """Hit/miss counters for this process plus the current entry count"""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
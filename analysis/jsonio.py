@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+JSON I/O
+Shared JSON loader/dumper for the analysis package: orjson when installed,
+then msgspec, then the standard library, with the same behaviour on all three
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+class _StdlibBackend:
+    name = "json"
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj, indent=None, sort_keys=False, default=None):
+        # Compact separators match what orjson and msgspec write
+        separators = (",", ":") if indent is None else None
+        return json.dumps(
+            obj, indent=indent, separators=separators, sort_keys=sort_keys, default=default, ensure_ascii=False
+        )
+
+class _OrjsonBackend:
+    name = "orjson"
+
+    @staticmethod
+    def loads(data):
+        return orjson.loads(data)
+
+    @staticmethod
+    def dumps(obj, indent=None, sort_keys=False, default=None):
+        if indent not in (None, 2):
+            return _StdlibBackend.dumps(obj, indent, sort_keys, default)
+        option = orjson.OPT_NON_STR_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which the stdlib encoder still handles
+            return _StdlibBackend.dumps(obj, indent, sort_keys, default)
+
+class _MsgspecBackend:
+    name = "msgspec"
+
+    @staticmethod
+    def loads(data):
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+
+    @staticmethod
+    def dumps(obj, indent=None, sort_keys=False, default=None):
+        if indent is not None or sort_keys:
+            return _StdlibBackend.dumps(obj, indent, sort_keys, default)
+        try:
+            return msgspec.json.encode(obj, enc_hook=default).decode("utf-8")
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            return _StdlibBackend.dumps(obj, indent, sort_keys, default)
+
+BACKENDS = {"json": _StdlibBackend}
+if msgspec is not None:
+    BACKENDS["msgspec"] = _MsgspecBackend
+if orjson is not None:
+    BACKENDS["orjson"] = _OrjsonBackend
+
+def _pick_backend():
+    wanted = os.getenv("ANALYSIS_JSON_BACKEND")
+    if wanted:
+        if wanted not in BACKENDS:
+            raise ValueError(f"JSON backend {wanted!r} is not available (installed: {', '.join(BACKENDS)})")
+        return BACKENDS[wanted]
+    for name in ("orjson", "msgspec", "json"):
+        if name in BACKENDS:
+            return BACKENDS[name]
+
+BACKEND = _pick_backend()
+
+def loads(data):
+    """Parse JSON from str or bytes; malformed input raises ValueError"""
+    return BACKEND.loads(data)
+
+def dumps(obj, indent=None, sort_keys=False, default=None):
+    """Serialize to a str (non-ASCII characters are written as UTF-8, not escaped)"""
+    return BACKEND.dumps(obj, indent=indent, sort_keys=sort_keys, default=default)
+
+def load(path):
+    """Read and parse a JSON file"""
+    with open(path, "rb") as f:
+        return BACKEND.loads(f.read())
+
+def dump(obj, path, indent=None, sort_keys=False, default=None):
+    """Write `obj` to `path` atomically (temp file + rename) with a trailing newline"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(dumps(obj, indent=indent, sort_keys=sort_keys, default=default))
+        f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def decode(data, record_type):
+    """
+    Parse JSON text straight into a typed record (e.g. analysis_model.Analysis).
+
+    The document must be a JSON object; the record's schema checks
+    (`validate()`) run before it is returned, so a malformed case raises
+    ValueError here instead of failing later in a hot path.
+    """
+    obj = loads(data)
+    if not isinstance(obj, dict):
+        raise ValueError(f"{record_type.__name__}: expected a JSON object, got {type(obj).__name__}")
+    record = record_type.from_dict(obj)
+    record.validate()
+    return record
+
+def load_typed(path, record_type):
+    """Read a JSON file straight into a validated typed record"""
+    with open(path, "rb") as f:
+        return decode(f.read(), record_type)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+PNL Analytics
+Loads the date-keyed PNL day map (data.json, data/pnl_data.json) into sorted
+NumPy columns and computes the calendar's monthly statistics plus drawdown,
+streak and Sharpe-like ratios for any date range, fully vectorized
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from .pnl_store import day_key, parse_day_key, read_day_map
+except ImportError:  # run as a script from inside analysis/
+    from pnl_store import day_key, parse_day_key, read_day_map
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Later sources win for a day present in both (server.js writes data/pnl_data.json)
+PNL_SOURCES = (
+    os.path.join(REPO_DIR, "data.json"),
+    os.path.join(REPO_DIR, "data", "pnl_data.json"),
+)
+
+TRADING_DAYS_PER_YEAR = 252
+
+def _number(value):
+    # Mirrors the browser's `dayData.pnl || 0`
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def load_day_map(paths=PNL_SOURCES):
+    """Merge the day maps of every source (later files override earlier days), including unflushed log records"""
+    merged = {}
+    for path in paths:
+        merged.update(read_day_map(path))
+    return merged
+
+class PnlSeries:
+    """
+    Daily PNL as sorted columns: `dates` (datetime64[D]), `pnl` and `trades`.
+
+    Range queries slice the columns with a binary search, so every statistic
+    below costs O(log n) to locate plus vectorized work over the days in range.
+    """
+
+    def __init__(self, dates, pnl, trades):
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.pnl = np.asarray(pnl, dtype=float)
+        self.trades = np.asarray(trades, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.dates)
+
+    @classmethod
+    def from_day_map(cls, day_map):
+        """Build from a {day_key: entry} map, skipping non-date keys such as "test" """
+        rows = []
+        for key, entry in day_map.items():
+            date = parse_day_key(key)
+            if date is not None and isinstance(entry, dict):
+                rows.append((date, _number(entry.get("pnl")), int(_number(entry.get("trades")))))
+        rows.sort(key=lambda row: row[0])
+
+        # A day written under both a padded and an unpadded key keeps the later entry
+        dates = np.array([row[0] for row in rows], dtype="datetime64[D]")
+        last = np.append(dates[1:] != dates[:-1], True) if len(dates) else np.array([], dtype=bool)
+        return cls(
+            dates[last],
+            np.array([row[1] for row in rows], dtype=float)[last],
+            np.array([row[2] for row in rows], dtype=np.int64)[last],
+        )
+
+    @classmethod
+    def load(cls, paths=PNL_SOURCES):
+        return cls.from_day_map(load_day_map(paths))
+
+    def between(self, start=None, end=None):
+        """Days with start <= date <= end (either bound may be None or a date string)"""
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, "D"), side="left")
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+        return PnlSeries(self.dates[lo:hi], self.pnl[lo:hi], self.trades[lo:hi])
+
+    def dense(self):
+        """Same series with every calendar day present (missing days are flat)"""
+        if not len(self):
+            return self
+        dates = np.arange(self.dates[0], self.dates[-1] + 1, dtype="datetime64[D]")
+        positions = (self.dates - dates[0]).astype(np.int64)
+        pnl = np.zeros(len(dates))
+        trades = np.zeros(len(dates), dtype=np.int64)
+        pnl[positions] = self.pnl
+        trades[positions] = self.trades
+        return PnlSeries(dates, pnl, trades)
+
+    @property
+    def trading_mask(self):
+        """Days that count as trading days: trades > 0 or pnl != 0"""
+        return (self.trades > 0) | (self.pnl != 0)
+
+    # --- Calendar statistics ----------------------------------------------
+
+    def summary(self, start=None, end=None):
+        """Month Total, Win Rate, Average Win, Best Day and Trading Days for a date range"""
+        series = self.between(start, end)
+        trading = series.trading_mask
+        pnl = series.pnl[trading]
+        dates = series.dates[trading]
+        wins = pnl > 0
+        win_count = int(wins.sum())
+        trading_days = int(trading.sum())
+
+        best = int(np.argmax(pnl)) if len(pnl) else None
+        worst = int(np.argmin(pnl)) if len(pnl) else None
+        has_best = best is not None and pnl[best] > 0
+        has_worst = worst is not None and pnl[worst] < 0
+        return {
+            "total": float(pnl.sum()),
+            "trading_days": trading_days,
+            "wins": win_count,
+            "losses": int((pnl < 0).sum()),
+            "win_rate": 100.0 * win_count / trading_days if trading_days else 0.0,
+            "average_win": float(pnl[wins].mean()) if win_count else 0.0,
+            "best_day": float(pnl[best]) if has_best else 0.0,
+            "best_day_date": day_key(dates[best]) if has_best else None,
+            "worst_day": float(pnl[worst]) if has_worst else 0.0,
+            "worst_day_date": day_key(dates[worst]) if has_worst else None,
+        }
+
+    def monthly_stats(self, start=None, end=None):
+        """summary() for every month in range in one grouped pass, keyed 'YYYY-MM'"""
+        series = self.between(start, end)
+        trading = series.trading_mask
+        pnl = np.where(trading, series.pnl, 0.0)
+        months, month_index = np.unique(series.dates.astype("datetime64[M]"), return_inverse=True)
+        n_months = len(months)
+
+        def per_month(values):
+            return np.bincount(month_index, weights=values, minlength=n_months)
+
+        trading_days = per_month(trading.astype(float))
+        wins = per_month((pnl > 0).astype(float))
+        losses = per_month((pnl < 0).astype(float))
+        totals = per_month(pnl)
+        win_totals = per_month(np.where(pnl > 0, pnl, 0.0))
+
+        # Best day per month: sort by month, then pnl descending (earliest day wins ties)
+        order = np.lexsort((-pnl, month_index))
+        best_rows = order[np.searchsorted(month_index[order], np.arange(n_months), side="left")]
+
+        stats = {}
+        for m, month in enumerate(months):
+            best = best_rows[m]
+            has_best = pnl[best] > 0
+            stats[str(month)] = {
+                "total": float(totals[m]),
+                "trading_days": int(trading_days[m]),
+                "wins": int(wins[m]),
+                "losses": int(losses[m]),
+                "win_rate": float(100.0 * wins[m] / trading_days[m]) if trading_days[m] else 0.0,
+                "average_win": float(win_totals[m] / wins[m]) if wins[m] else 0.0,
+                "best_day": float(pnl[best]) if has_best else 0.0,
+                "best_day_date": day_key(series.dates[best]) if has_best else None,
+            }
+        return stats
+
+    # --- Risk statistics ----------------------------------------------------
+
+    def drawdown(self, start=None, end=None):
+        """Equity curve, running drawdown series and the deepest peak-to-trough drop"""
+        series = self.between(start, end)
+        equity = np.cumsum(series.pnl)
+        # The curve starts from flat, so a first losing day is already a drawdown
+        peaks = np.maximum.accumulate(np.maximum(equity, 0.0)) if len(equity) else equity
+        drawdowns = equity - peaks
+        if not len(drawdowns):
+            return {"equity": equity, "drawdown": drawdowns, "max_drawdown": 0.0,
+                    "peak_date": None, "trough_date": None, "current_drawdown": 0.0}
+
+        trough = int(np.argmin(drawdowns))
+        peak_candidates = np.flatnonzero(equity[:trough + 1] == peaks[trough])
+        return {
+            "equity": equity,
+            "drawdown": drawdowns,
+            "max_drawdown": float(drawdowns[trough]),
+            "peak_date": day_key(series.dates[peak_candidates[-1]]) if len(peak_candidates) else None,
+            "trough_date": day_key(series.dates[trough]),
+            "current_drawdown": float(drawdowns[-1]),
+        }
+
+    def rolling_drawdown(self, window):
+        """Worst drawdown inside each trailing `window`-calendar-day window, as (dates, values)"""
+        dense = self.dense()
+        if not len(dense):
+            return dense.dates, np.zeros(0)
+        # Flat equity before the first day; window i spans equity[i .. i + window]
+        equity = np.concatenate([np.zeros(window), np.cumsum(dense.pnl)])
+        windows = np.lib.stride_tricks.sliding_window_view(equity, window + 1)
+        worst = (windows - np.maximum.accumulate(windows, axis=1)).min(axis=1)
+        return dense.dates, worst
+
+    def streaks(self, start=None, end=None):
+        """Longest and current winning/losing day streaks over trading days"""
+        series = self.between(start, end)
+        signs = np.sign(series.pnl[series.trading_mask]).astype(int)
+        if not len(signs):
+            return {"longest_win_streak": 0, "longest_loss_streak": 0, "current_streak": 0}
+
+        # Run-length encode the win/loss signs
+        boundaries = np.flatnonzero(np.diff(signs)) + 1
+        starts = np.concatenate([[0], boundaries])
+        lengths = np.diff(np.concatenate([starts, [len(signs)]]))
+        values = signs[starts]
+        win_runs = lengths[values > 0]
+        loss_runs = lengths[values < 0]
+        return {
+            "longest_win_streak": int(win_runs.max()) if len(win_runs) else 0,
+            "longest_loss_streak": int(loss_runs.max()) if len(loss_runs) else 0,
+            # Positive for a running win streak, negative for a losing one
+            "current_streak": int(lengths[-1] * values[-1]),
+        }
+
+    def ratios(self, start=None, end=None, periods_per_year=TRADING_DAYS_PER_YEAR):
+        """Sharpe- and Sortino-like ratios of daily PNL over trading days, annualised"""
+        series = self.between(start, end)
+        pnl = series.pnl[series.trading_mask]
+        if len(pnl) < 2:
+            return {"sharpe": 0.0, "sortino": 0.0, "profit_factor": 0.0}
+
+        mean = pnl.mean()
+        std = pnl.std(ddof=1)
+        downside = np.sqrt(np.mean(np.minimum(pnl, 0.0) ** 2))
+        gains = pnl[pnl > 0].sum()
+        losses = -pnl[pnl < 0].sum()
+        scale = np.sqrt(periods_per_year)
+        return {
+            "sharpe": float(mean / std * scale) if std else 0.0,
+            "sortino": float(mean / downside * scale) if downside else 0.0,
+            "profit_factor": float(gains / losses) if losses else float("inf") if gains else 0.0,
+        }
+
+    def report(self, start=None, end=None):
+        """Every statistic for a date range in one dict (no per-day arrays)"""
+        drawdown = self.drawdown(start, end)
+        return {
+            "summary": self.summary(start, end),
+            "months": self.monthly_stats(start, end),
+            "max_drawdown": drawdown["max_drawdown"],
+            "max_drawdown_peak": drawdown["peak_date"],
+            "max_drawdown_trough": drawdown["trough_date"],
+            "current_drawdown": drawdown["current_drawdown"],
+            **self.streaks(start, end),
+            **self.ratios(start, end),
+        }
+
+if __name__ == "__main__":
+    import time
+
+    series = PnlSeries.load()
+    print(f"📅 {len(series)} days loaded from {', '.join(os.path.relpath(p, REPO_DIR) for p in PNL_SOURCES)}")
+    for month, stats in series.monthly_stats().items():
+        print(f"🗓️  {month}: total ${stats['total']:,.0f} | win rate {stats['win_rate']:.0f}% | "
+              f"avg win ${stats['average_win']:,.0f} | best ${stats['best_day']:,.0f} | {stats['trading_days']} trading days")
+    report = series.report()
+    print(f"📉 Max drawdown ${report['max_drawdown']:,.0f} ({report['max_drawdown_peak']} → {report['max_drawdown_trough']})")
+    print(f"🔥 Longest win streak {report['longest_win_streak']}, loss streak {report['longest_loss_streak']}")
+    print(f"⚖️  Sharpe {report['sharpe']:.2f}, Sortino {report['sortino']:.2f}")
+
+    rng = np.random.default_rng(7)
+    dates = np.arange(np.datetime64("2015-01-01"), np.datetime64("2025-01-01"), dtype="datetime64[D]")
+    synthetic = PnlSeries(dates, rng.normal(20, 300, len(dates)).round(), rng.integers(0, 6, len(dates)))
+    started = time.perf_counter()
+    synthetic.report()
+    print(f"\n⚡ Full report over {len(dates):,} days (10 years): {(time.perf_counter() - started) * 1000:.1f} ms")
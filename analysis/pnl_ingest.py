@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Bet Slip Ingestion
+Streams bet slips from JSON-array or NDJSON files of any size, aggregates
+them per day in one pass (sum pnl, one trade per slip, append notes) and
+merges the result into data/pnl_data.json as one write-ahead log record
+"""
+
+import json
+import math
+import os
+import sys
+
+try:
+    from .pnl_store import PNL_DATA_PATH, REPO_DIR, PnlStore, day_key, parse_day_key
+except ImportError:  # run as a script from inside analysis/
+    from pnl_store import PNL_DATA_PATH, REPO_DIR, PnlStore, day_key, parse_day_key
+
+SAMPLE_SLIPS_PATH = os.path.join(REPO_DIR, "sample_bet_slips.json")
+
+# Fields of a fresh day entry, as index.html creates them
+EMPTY_DAY = {
+    "pnl": 0,
+    "trades": 0,
+    "notes": "",
+    "priorities": [],
+    "individualTrades": [],
+    "morningIntentions": "",
+    "focusAreas": "",
+    "eveningReflection": "",
+    "learned": "",
+    "patterns": "",
+    "improvements": "",
+    "winRate": 0,
+    "largestWin": 0,
+}
+
+MAX_REPORTED_ERRORS = 20
+
+def iter_bet_slips(path, chunk_size=1 << 16):
+    """
+    Yield `(position, slip)` from a JSON array or NDJSON file without loading it whole.
+
+    Arrays are decoded one element at a time with JSONDecoder.raw_decode over a
+    sliding buffer, so memory stays at one chunk plus the largest single slip.
+    `position` is the element index (arrays) or line number (NDJSON).
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = f.read(chunk_size)
+        start = len(buffer) - len(buffer.lstrip())
+        if not buffer[start:start + 1] == "[":
+            # NDJSON: rewind and go line by line
+            f.seek(0)
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, json.loads(line)
+            return
+
+        pos, index, eof = start + 1, 0, False
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ","):
+                pos += 1
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            if buffer[pos] == "]":
+                return
+
+            try:
+                slip, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                end = None
+            # A value touching the end of the buffer may be cut off mid-chunk
+            if end is None or (end == len(buffer) and not eof):
+                if eof:
+                    raise ValueError(f"{path}: malformed bet slip at element {index}")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            yield index, slip
+            index += 1
+            pos = end
+
+def _js_number(value):
+    # Render numbers the way the browser's template strings do (110.0 -> "110")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def validate_slip(slip):
+    """Return `(day, pnl)` for a valid slip, or raise ValueError saying what is wrong"""
+    if not isinstance(slip, dict):
+        raise ValueError(f"expected an object, got {type(slip).__name__}")
+    date = slip.get("date")
+    day = parse_day_key(date) if isinstance(date, str) else None
+    if day is None:
+        raise ValueError(f"invalid or missing date {date!r} (expected YYYY-MM-DD)")
+
+    pnl = slip.get("pnl")
+    try:
+        if isinstance(pnl, bool) or pnl is None:
+            raise TypeError
+        pnl = float(pnl)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid or missing pnl {slip.get('pnl')!r}") from None
+    if not math.isfinite(pnl):
+        raise ValueError(f"pnl must be finite, got {slip.get('pnl')!r}")
+    return day, pnl
+
+def slip_note(slip):
+    """One notes line per slip: `match: bet @ odds (result) $pnl`, as the dashboard writes it"""
+    note = ""
+    if slip.get("match"):
+        note += f"{slip['match']}: "
+    if slip.get("bet"):
+        note += f"{slip['bet']} "
+    if slip.get("odds"):
+        note += f"@ {_js_number(slip['odds'])} "
+    if slip.get("result"):
+        note += f"({slip['result']}) "
+    return note + f"${_js_number(slip['pnl'])}"
+
+def aggregate_slips(slips):
+    """
+    Fold `(position, slip)` pairs into per-day totals in a single pass.
+
+    Returns `(days, report)`: days maps numpy dates to {"pnl", "trades", "notes"}
+    and report counts imported/skipped slips with the first few skip reasons.
+    """
+    days = {}
+    report = {"imported": 0, "skipped": 0, "errors": []}
+    for position, slip in slips:
+        try:
+            day, pnl = validate_slip(slip)
+        except ValueError as e:
+            report["skipped"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append(f"slip {position}: {e}")
+            continue
+
+        totals = days.get(day)
+        if totals is None:
+            totals = days[day] = {"pnl": 0.0, "trades": 0, "notes": []}
+        totals["pnl"] += pnl
+        totals["trades"] += 1
+        totals["notes"].append(slip_note(slip))
+        report["imported"] += 1
+    report["days"] = len(days)
+    return days, report
+
+def merge_days(day_map, days):
+    """Add aggregated days onto a day map in place, as the dashboard import does"""
+    # Existing entries may use padded or unpadded keys for the same day
+    existing_keys = {parse_day_key(key): key for key in day_map}
+    existing_keys.pop(None, None)
+    for day, totals in sorted(days.items()):
+        key = existing_keys.get(day, day_key(day))
+        entry = day_map.get(key)
+        entry = dict(entry) if isinstance(entry, dict) else dict(EMPTY_DAY)
+        pnl = (entry.get("pnl") or 0) + totals["pnl"]
+        entry["pnl"] = int(pnl) if float(pnl).is_integer() else pnl
+        entry["trades"] = (entry.get("trades") or 0) + totals["trades"]
+        entry["notes"] = "\n".join(filter(None, [entry.get("notes") or "", *totals["notes"]])).strip()
+        day_map[key] = entry
+    return day_map
+
+def ingest_bet_slips(paths, pnl_path=PNL_DATA_PATH, dry_run=False):
+    """Stream, aggregate and merge bet slip files into the PNL store (one all-or-nothing log record)"""
+    def all_slips():
+        for path in paths:
+            for position, slip in iter_bet_slips(path):
+                yield f"{os.path.basename(path)}#{position}", slip
+
+    days, report = aggregate_slips(all_slips())
+    if not dry_run and days:
+        with PnlStore(pnl_path) as store:
+            touched = {day_key(day): store.get_day(day) for day in days if day in store}
+            store.put_days(merge_days(touched, days))
+    report["pnl_path"] = pnl_path
+    report["dry_run"] = dry_run
+    return days, report
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--dry-run"]
+    # Without files, preview the bundled sample rather than touching real data
+    dry_run = "--dry-run" in sys.argv or not args
+    paths = args or [SAMPLE_SLIPS_PATH]
+
+    days, report = ingest_bet_slips(paths, dry_run=dry_run)
+    for day, totals in sorted(days.items()):
+        print(f"📅 {day_key(day)}: ${totals['pnl']:,.2f} over {totals['trades']} slips")
+    print(f"\n✅ Imported {report['imported']} slips into {report['days']} days, skipped {report['skipped']}")
+    for error in report["errors"]:
+        print(f"   ⚠️  {error}")
+    print("🧪 Dry run - nothing written" if dry_run else f"📁 Merged into {report['pnl_path']}")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+PNL Rollups
+Materialized week / month / year tables (pnl, trades, wins, losses, best day)
+over the PNL day map, kept current one day at a time and backed by a segment
+tree so any date-range rollup is an O(log n) query instead of a walk over
+every day record
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from . import jsonio
+    from .pnl_analytics import PNL_SOURCES, PnlSeries, _number
+    from .pnl_store import REPO_DIR, day_key, parse_day_key
+except ImportError:  # run as a script from inside analysis/
+    import jsonio
+    from pnl_analytics import PNL_SOURCES, PnlSeries, _number
+    from pnl_store import REPO_DIR, day_key, parse_day_key
+
+ROLLUPS_PATH = os.path.join(REPO_DIR, "data", "pnl_rollups.json")
+
+# Summed per tree node; win_total feeds average_win
+SUM_FIELDS = ("total", "trades", "trading_days", "wins", "losses", "win_total")
+TABLES = ("weeks", "months", "years")
+
+def _as_date(day):
+    if isinstance(day, str):
+        date = parse_day_key(day)
+        if date is None:
+            raise ValueError(f"not a day key: {day!r}")
+        return date
+    return np.datetime64(day, "D")
+
+def week_start(date):
+    """Sunday that starts the calendar row containing `date` (the dashboards start weeks on Sunday)"""
+    date = np.datetime64(date, "D")
+    # 1970-01-01 was a Thursday, four days after a Sunday
+    return date - (date.astype(np.int64) + 4) % 7
+
+def bucket_bounds(table, date):
+    """(key, first day, day after last) of the week/month/year bucket holding `date`"""
+    date = np.datetime64(date, "D")
+    if table == "weeks":
+        start = week_start(date)
+        return str(start), start, start + 7
+    unit = {"months": "M", "years": "Y"}[table]
+    period = date.astype(f"datetime64[{unit}]")
+    return str(period), period.astype("datetime64[D]"), (period + 1).astype("datetime64[D]")
+
+def _leaf_row(pnl, trades):
+    trading = trades > 0 or pnl != 0
+    return (pnl, trades, float(trading), float(pnl > 0), float(pnl < 0), max(pnl, 0.0))
+
+class RollupTree:
+    """
+    Iterative segment tree over a dense day axis.
+
+    Each node holds the SUM_FIELDS of its span plus the span's best day (max
+    pnl, earliest day on ties), so updates and range queries both touch
+    O(log n) nodes. The axis grows by doubling when a day falls outside it.
+    """
+
+    def __init__(self, origin, days=0):
+        self.origin = np.datetime64(origin, "D")
+        self._build(np.zeros((max(days, 1), len(SUM_FIELDS))))
+
+    def _build(self, leaves):
+        size = 1
+        while size < len(leaves):
+            size *= 2
+        self.size = size
+        self.sums = np.zeros((2 * size, len(SUM_FIELDS)))
+        self.best = np.zeros(2 * size)
+        self.best_at = np.zeros(2 * size, dtype=np.int64)
+        self.sums[size:size + len(leaves)] = leaves
+        self.best[size:] = self.sums[size:, 0]
+        self.best_at[size:] = np.arange(size)
+
+        # Build a level at a time, vectorized
+        lo = size
+        while lo > 1:
+            parents = np.arange(lo // 2, lo)
+            left, right = 2 * parents, 2 * parents + 1
+            self.sums[parents] = self.sums[left] + self.sums[right]
+            take_right = self.best[right] > self.best[left]
+            self.best[parents] = np.where(take_right, self.best[right], self.best[left])
+            self.best_at[parents] = np.where(take_right, self.best_at[right], self.best_at[left])
+            lo //= 2
+
+    def _grow(self, date):
+        leaves = self.sums[self.size:]
+        offset = int((date - self.origin).astype(np.int64))
+        if offset < 0:
+            # Extend backwards with as much slack as the current span
+            shift = max(-offset, self.size)
+            self.origin -= shift
+            leaves = np.concatenate([np.zeros((shift, len(SUM_FIELDS))), leaves])
+        else:
+            leaves = np.concatenate([leaves, np.zeros((max(offset + 1, 2 * self.size) - self.size, len(SUM_FIELDS)))])
+        self._build(leaves)
+
+    def index(self, date):
+        return int((np.datetime64(date, "D") - self.origin).astype(np.int64))
+
+    def set(self, date, pnl, trades):
+        i = self.index(date)
+        if not 0 <= i < self.size:
+            self._grow(np.datetime64(date, "D"))
+            i = self.index(date)
+        node = self.size + i
+        self.sums[node] = _leaf_row(pnl, trades)
+        self.best[node] = pnl
+        node //= 2
+        while node:
+            left, right = 2 * node, 2 * node + 1
+            self.sums[node] = self.sums[left] + self.sums[right]
+            if self.best[right] > self.best[left]:
+                self.best[node], self.best_at[node] = self.best[right], self.best_at[right]
+            else:
+                self.best[node], self.best_at[node] = self.best[left], self.best_at[left]
+            node //= 2
+
+    def query(self, start, end):
+        """Sums and best (value, index) over days [start, end) of the axis"""
+        lo, hi = max(start, 0) + self.size, min(end, self.size) + self.size
+        sums = np.zeros(len(SUM_FIELDS))
+        best, best_at = 0.0, -1
+        # Left and right edges are visited in day order, so ">" keeps the earliest tie
+        right_nodes = []
+        while lo < hi:
+            if lo & 1:
+                sums += self.sums[lo]
+                if best_at < 0 or self.best[lo] > best:
+                    best, best_at = self.best[lo], self.best_at[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_nodes.append(hi)
+            lo //= 2
+            hi //= 2
+        for node in reversed(right_nodes):
+            sums += self.sums[node]
+            if best_at < 0 or self.best[node] > best:
+                best, best_at = self.best[node], self.best_at[node]
+        return sums, best, best_at
+
+class PnlRollups:
+    """
+    Week/month/year tables in the calendar's summary() shape, plus range queries.
+
+    `set_day()` refreshes only the three buckets that contain the changed day,
+    each with one tree query, so keeping the tables current is O(log n) per edit.
+    """
+
+    def __init__(self, origin=None):
+        self.tree = RollupTree(origin or np.datetime64("today", "D"))
+        self.tables = {table: {} for table in TABLES}
+
+    @classmethod
+    def from_series(cls, series):
+        rollups = cls(series.dates[0] if len(series) else None)
+        if len(series):
+            span = int((series.dates[-1] - series.dates[0]).astype(np.int64)) + 1
+            leaves = np.zeros((span, len(SUM_FIELDS)))
+            idx = (series.dates - series.dates[0]).astype(np.int64)
+            trading = series.trading_mask
+            leaves[idx] = np.column_stack([
+                series.pnl, series.trades, trading, series.pnl > 0, series.pnl < 0, np.maximum(series.pnl, 0.0),
+            ])
+            rollups.tree._build(leaves)
+            for table in TABLES:
+                for date in np.unique([bucket_bounds(table, d)[1] for d in series.dates]):
+                    rollups._refresh(table, date)
+        return rollups
+
+    @classmethod
+    def from_day_map(cls, day_map):
+        return cls.from_series(PnlSeries.from_day_map(day_map))
+
+    @classmethod
+    def load(cls, paths=PNL_SOURCES):
+        return cls.from_series(PnlSeries.load(paths))
+
+    def _stats(self, start, end):
+        sums, best, best_at = self.tree.query(self.tree.index(start), self.tree.index(end))
+        total, trades, trading_days, wins, losses, win_total = sums
+        has_best = best_at >= 0 and best > 0
+        return {
+            "total": float(total),
+            "trades": int(trades),
+            "trading_days": int(trading_days),
+            "wins": int(wins),
+            "losses": int(losses),
+            "win_rate": float(100.0 * wins / trading_days) if trading_days else 0.0,
+            "average_win": float(win_total / wins) if wins else 0.0,
+            "best_day": float(best) if has_best else 0.0,
+            "best_day_date": day_key(self.tree.origin + int(best_at)) if has_best else None,
+        }
+
+    def _refresh(self, table, date):
+        key, start, end = bucket_bounds(table, date)
+        stats = self._stats(start, end)
+        if stats["trading_days"] or stats["trades"]:
+            self.tables[table][key] = stats
+        else:
+            self.tables[table].pop(key, None)
+
+    def set_day(self, day, entry):
+        """Apply one day-map entry (None clears the day) and refresh its week, month and year"""
+        date = _as_date(day)
+        entry = entry if isinstance(entry, dict) else {}
+        self.tree.set(date, _number(entry.get("pnl")), int(_number(entry.get("trades"))))
+        for table in TABLES:
+            self._refresh(table, date)
+
+    def set_days(self, entries):
+        """set_day() for every date key of a day map (keys such as "test" are skipped)"""
+        for day, entry in entries.items():
+            if not isinstance(day, str) or parse_day_key(day) is not None:
+                self.set_day(day, entry)
+
+    def query(self, start, end):
+        """Rollup of every day from `start` through `end` inclusive (dates or day keys)"""
+        return self._stats(_as_date(start), _as_date(end) + 1)
+
+    def to_tables(self):
+        """Tables sorted by key, ready to serialize"""
+        return {table: dict(sorted(rows.items())) for table, rows in self.tables.items()}
+
+    def write(self, path=ROLLUPS_PATH):
+        jsonio.dump(self.to_tables(), path, indent=2)
+
+if __name__ == "__main__":
+    import time
+
+    rollups = PnlRollups.load()
+    for month, stats in rollups.to_tables()["months"].items():
+        print(f"🗓️  {month}: total ${stats['total']:,.0f} | {stats['trades']} trades | "
+              f"{stats['wins']}W/{stats['losses']}L | best ${stats['best_day']:,.0f} ({stats['best_day_date']})")
+    for week, stats in rollups.to_tables()["weeks"].items():
+        print(f"   week of {week}: ${stats['total']:,.0f}")
+
+    rng = np.random.default_rng(7)
+    dates = np.arange(np.datetime64("2015-01-01"), np.datetime64("2025-01-01"), dtype="datetime64[D]")
+    series = PnlSeries(dates, rng.normal(20, 300, len(dates)).round(), rng.integers(0, 6, len(dates)))
+    started = time.perf_counter()
+    synthetic = PnlRollups.from_series(series)
+    built = time.perf_counter() - started
+    started = time.perf_counter()
+    for i in range(1000):
+        synthetic.set_day(dates[i * 3], {"pnl": float(i), "trades": 1})
+    updated = (time.perf_counter() - started) / 1000
+    started = time.perf_counter()
+    for i in range(1000):
+        synthetic.query(dates[i], dates[-1 - i])
+    queried = (time.perf_counter() - started) / 1000
+    print(f"\n⚡ {len(dates):,} days: build {built * 1000:.0f} ms, day edit + 3 table refreshes "
+          f"{updated * 1e6:.0f} µs, range query {queried * 1e6:.0f} µs")
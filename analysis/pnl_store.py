@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+PNL Store
+Write-ahead storage for the dashboard's date-keyed PNL day map. Each save
+appends one NDJSON record to data/pnl_data.wal.ndjson instead of rewriting
+data/pnl_data.json; the log is folded back into the snapshot on compaction,
+so single-day reads and writes stay O(1) however many days accumulate
+"""
+
+import os
+import re
+
+import numpy as np
+
+try:
+    from . import jsonio
+except ImportError:  # run as a script from inside analysis/
+    import jsonio
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PNL_DATA_PATH = os.path.join(REPO_DIR, "data", "pnl_data.json")
+
+# Compact once the log outgrows the snapshot (and this floor), so replay stays
+# cheap and compaction costs amortized O(1) per write
+COMPACT_MIN_BYTES = 1 << 20
+
+# The dashboard writes unpadded keys (`2025-10-1`); padded keys are accepted too
+_DAY_KEY = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+
+def parse_day_key(key):
+    """Day key -> numpy datetime64[D], or None for keys that are not a valid date"""
+    match = _DAY_KEY.match(key)
+    if not match:
+        return None
+    year, month, day = match.groups()
+    try:
+        return np.datetime64(f"{year}-{int(month):02d}-{int(day):02d}", "D")
+    except ValueError:
+        return None
+
+def day_key(date):
+    """numpy/ISO date -> the dashboard's unpadded day key"""
+    year, month, day = str(np.datetime64(date, "D")).split("-")
+    return f"{int(year)}-{int(month)}-{int(day)}"
+
+def canonical_key(day):
+    """Unpadded key for a date or day key; other keys (e.g. "test") are kept verbatim"""
+    if isinstance(day, str):
+        date = parse_day_key(day)
+        return day if date is None else day_key(date)
+    return day_key(day)
+
+def wal_path_for(snapshot_path):
+    return f"{os.path.splitext(snapshot_path)[0]}.wal.ndjson"
+
+class PnlStore:
+    """
+    Day map held in memory, backed by a JSON snapshot plus a write-ahead log.
+
+    Records are `{"op": "put", "days": {...}}` or `{"op": "delete", "keys": [...]}`.
+    Both are idempotent, so replaying a log over a snapshot that already
+    contains it (a crash between snapshot replace and log truncation) is
+    harmless. One batch is one line: a torn final line from a crash mid-write
+    is dropped whole on the next open. The snapshot keeps server.js's format,
+    down to each day key's spelling: days are looked up padded or unpadded,
+    but an existing day is written back under the key it was stored with and
+    a new date under the dashboard's unpadded key. Don't let server.js write
+    the snapshot while the log holds unflushed records.
+    """
+
+    def __init__(self, snapshot_path=PNL_DATA_PATH, wal_path=None, durable=True, auto_compact=True):
+        self.snapshot_path = snapshot_path
+        self.wal_path = wal_path or wal_path_for(snapshot_path)
+        self.durable = durable
+        self.auto_compact = auto_compact
+        self.days = {}  # stored day key -> entry
+        self._keys = {}  # canonical day key -> stored day key
+        self.wal_records = 0
+        self.wal_bytes = 0  # up to the last complete record
+        self._wal = None
+
+        if os.path.exists(snapshot_path):
+            self._apply({"op": "put", "days": jsonio.load(snapshot_path)})
+        self.snapshot_bytes = os.path.getsize(snapshot_path) if os.path.exists(snapshot_path) else 0
+
+        if os.path.exists(self.wal_path):
+            with open(self.wal_path, "rb") as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.endswith(b"\n"):
+                        break  # torn write; never acknowledged
+                    if line.strip():
+                        try:
+                            self._apply(jsonio.loads(line))
+                        except (ValueError, KeyError) as e:
+                            raise ValueError(f"{self.wal_path}:{line_number}: bad PNL log record ({e})") from None
+                        self.wal_records += 1
+                    self.wal_bytes += len(line)
+
+    def __len__(self):
+        return len(self.days)
+
+    def __contains__(self, day):
+        return canonical_key(day) in self._keys
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Reads ------------------------------------------------------------
+
+    def get_day(self, day, default=None):
+        """Entry for a date or day key (padded or not); treat it as read-only"""
+        return self.days.get(self._keys.get(canonical_key(day)), default)
+
+    def day_map(self):
+        """Shallow copy of the full {day_key: entry} map"""
+        return dict(self.days)
+
+    # --- Writes -----------------------------------------------------------
+
+    def _apply(self, record):
+        op = record["op"]
+        if op == "put":
+            self.days.update(record["days"])
+            for key in record["days"]:
+                self._keys[canonical_key(key)] = key
+        elif op == "delete":
+            for key in record["keys"]:
+                self.days.pop(key, None)
+                if self._keys.get(canonical_key(key)) == key:
+                    del self._keys[canonical_key(key)]
+        else:
+            raise KeyError(f"unknown op {op!r}")
+
+    def _append(self, record):
+        if self._wal is None:
+            self._wal = open(self.wal_path, "ab")
+            # Cut off a torn tail so the next record starts on its own line
+            self._wal.truncate(self.wal_bytes)
+        line = jsonio.dumps(record).encode("utf-8") + b"\n"
+        self._wal.write(line)
+        self._wal.flush()
+        if self.durable:
+            os.fsync(self._wal.fileno())
+        self._apply(record)
+        self.wal_records += 1
+        self.wal_bytes += len(line)
+        if self.auto_compact and self.wal_bytes > max(self.snapshot_bytes, COMPACT_MIN_BYTES):
+            self.compact()
+
+    def put_day(self, day, entry):
+        """Store (replace) one day's entry"""
+        self.put_days({day: entry})
+
+    def _stored_key(self, day):
+        """Key a day is (or will be) stored under: its existing spelling, else as given"""
+        key = self._keys.get(canonical_key(day))
+        if key is not None:
+            return key
+        return day if isinstance(day, str) else day_key(day)
+
+    def put_days(self, entries):
+        """Store several days as one all-or-nothing log record"""
+        days = {self._stored_key(day): entry for day, entry in entries.items()}
+        if days:
+            self._append({"op": "put", "days": days})
+
+    def delete_day(self, day):
+        key = self._keys.get(canonical_key(day))
+        if key is not None:
+            self._append({"op": "delete", "keys": [key]})
+
+    def compact(self):
+        """Fold the log into the snapshot (atomic replace), then empty the log"""
+        jsonio.dump(self.days, self.snapshot_path, indent=2)
+        self.snapshot_bytes = os.path.getsize(self.snapshot_path)
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        with open(self.wal_path, "wb"):
+            pass
+        self.wal_records = 0
+        self.wal_bytes = 0
+
+    def close(self):
+        """Compact pending records so plain readers (server.js) see them, and release the log"""
+        if self.wal_records:
+            self.compact()
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+def read_day_map(snapshot_path=PNL_DATA_PATH):
+    """Current day map including unflushed log records, without opening the log for writing"""
+    return PnlStore(snapshot_path, auto_compact=False).days
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+    import time
+
+    store = PnlStore()
+    print(f"🗃️  {len(store)} days in {os.path.relpath(store.snapshot_path, REPO_DIR)}"
+          f" + {store.wal_records} pending log records")
+    for key in list(store.days)[:3]:
+        print(f"   {key}: {store.get_day(key)}")
+
+    # Simulate years of history in a scratch copy rather than the real data file
+    scratch = tempfile.mkdtemp()
+    try:
+        store = PnlStore(os.path.join(scratch, "pnl_data.json"), durable=False)
+        dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2025-01-01"), dtype="datetime64[D]")
+        trades = [{"symbol": "ES", "pnl": 25, "notes": "x" * 200}] * 8
+        started = time.perf_counter()
+        for date in dates:
+            store.put_day(date, {"pnl": 200, "trades": 8, "notes": "", "individualTrades": trades})
+        elapsed = time.perf_counter() - started
+        print(f"\n⚡ {len(dates):,} single-day saves: {elapsed / len(dates) * 1e6:.0f} µs each"
+              f" (snapshot {store.snapshot_bytes / 1e6:.1f} MB, log {store.wal_bytes / 1e6:.1f} MB)")
+        store.close()
+        print(f"✅ Reopened: {len(PnlStore(store.snapshot_path))} days")
+    finally:
+        shutil.rmtree(scratch)
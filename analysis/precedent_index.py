@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Precedent Index
+NumPy vector index over the historical case archive for nearest-neighbour
+precedent lookup, with exact batched cosine search and an approximate
+inverted-file (IVF) mode for large archives
+"""
+
+import os
+import zlib
+
+import numpy as np
+
+try:
+    from . import jsonio
+    from .bsi_repath import STRENGTH_FACTORS
+    from .case_store import DEFAULT_LOG_PATH, HISTORICAL_CASES_DIR, CaseStore, files_stamp
+except ImportError:  # run as a script from inside analysis/
+    import jsonio
+    from bsi_repath import STRENGTH_FACTORS
+    from case_store import DEFAULT_LOG_PATH, HISTORICAL_CASES_DIR, CaseStore, files_stamp
+
+CASCADE_LEVELS = 5
+TAG_BUCKETS = 32
+OUTCOMES = ("correct", "incorrect")
+EMBEDDING_DIM = len(STRENGTH_FACTORS) + CASCADE_LEVELS + TAG_BUCKETS + len(OUTCOMES)
+
+# Relative weight of each block once it has been scaled to unit length
+BLOCK_WEIGHTS = {"factors": 1.0, "cascade": 0.75, "tags": 0.75, "outcome": 0.5}
+
+# Prediction accuracy recorded for each outcome
+OUTCOME_ACCURACY = {"correct": 1.0, "incorrect": 0.0}
+
+def _unit(block, weight):
+    norm = np.linalg.norm(block)
+    return block * (weight / norm) if norm else block
+
+def _tag_bucket(tag):
+    # crc32 rather than hash() so buckets agree across processes
+    return zlib.crc32(tag.lower().encode("utf-8")) % TAG_BUCKETS
+
+def case_features(case):
+    """
+    Pull the embedded fields out of an analysis or an archived case.
+
+    Archived low-BSI cases only keep breathability and raw cascade completions
+    under original_low_bsi_read.bsi_indicators, so missing strength factors fall
+    back to the case's overall BSI score.
+    """
+    indicators = case.get("original_low_bsi_read", {}).get("bsi_indicators", {})
+    factors = case.get("intuitive_weighting", {}).get("strength_factors", {})
+    fallback = case.get("bsi_score", 5.0)
+    scores = [factors.get(name, {}).get("score") for name in STRENGTH_FACTORS]
+    if scores[-1] is None:
+        scores[-1] = indicators.get("low_narrative_breathability")
+    scores = [fallback if score is None else score for score in scores]
+
+    levels = case.get("in_game_cascade", {}).get("cascade_levels")
+    if levels is not None:
+        completions = [level.get("completion", 0) for level in levels]
+    else:
+        completions = indicators.get("uneven_cascade_completion", [])
+
+    outcome = case.get("prediction_outcome") or case.get("reality_vs_read_analysis", {}).get("prediction_outcome")
+    return {"factors": scores, "completions": completions, "tags": case.get("tags", []), "outcome": outcome}
+
+def embed_case(case):
+    """Embed one analysis or archived case as a unit vector of EMBEDDING_DIM floats"""
+    features = case_features(case)
+
+    cascade = np.zeros(CASCADE_LEVELS)
+    completions = features["completions"][:CASCADE_LEVELS]
+    cascade[:len(completions)] = completions
+
+    tags = np.zeros(TAG_BUCKETS)
+    for tag in features["tags"]:
+        tags[_tag_bucket(tag)] += 1.0
+
+    outcome = np.array([float(features["outcome"] == name) for name in OUTCOMES])
+
+    vector = np.concatenate([
+        _unit(np.asarray(features["factors"], dtype=float) / 10.0, BLOCK_WEIGHTS["factors"]),
+        _unit(cascade / 100.0, BLOCK_WEIGHTS["cascade"]),
+        _unit(tags, BLOCK_WEIGHTS["tags"]),
+        _unit(outcome, BLOCK_WEIGHTS["outcome"]),
+    ])
+    return _unit(vector, 1.0).astype(np.float32)
+
+class PrecedentIndex:
+    """
+    Cosine-similarity index over unit-length case vectors.
+
+    Vectors live in one float32 matrix that grows by doubling, so adding cases
+    is amortised O(1). search() scores a batch of queries with a single matrix
+    product; approximate=True restricts each query to the cases in its nearest
+    k-means clusters (an inverted file), built lazily on first use.
+    """
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self.case_ids = []
+        self.metadata = []
+        self._positions = {}
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._centroids = None
+        self._lists = None
+
+    def __len__(self):
+        return len(self.case_ids)
+
+    @property
+    def vectors(self):
+        return self._vectors[:len(self.case_ids)]
+
+    def add(self, case_id, vector, metadata=None):
+        """Append one unit vector; drops any approximate-search clusters"""
+        size = len(self.case_ids)
+        if size == len(self._vectors):
+            grown = np.empty((max(16, 2 * size), self.dim), dtype=np.float32)
+            grown[:size] = self._vectors[:size]
+            self._vectors = grown
+        self._vectors[size] = vector
+        self._positions[case_id] = size
+        self.case_ids.append(case_id)
+        self.metadata.append(metadata or {})
+        self._centroids = self._lists = None
+
+    def metadata_for(self, case_id):
+        return self.metadata[self._positions[case_id]]
+
+    def build_ivf(self, n_lists=None, iterations=10, seed=0):
+        """Cluster the vectors with spherical k-means for approximate search"""
+        vectors = self.vectors
+        n_lists = min(len(vectors), n_lists or max(1, int(np.sqrt(len(vectors)))))
+        if n_lists == 0:
+            self._centroids, self._lists = np.empty((0, self.dim), dtype=np.float32), []
+            return
+
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            for cluster in range(n_lists):
+                members = vectors[assignment == cluster]
+                if len(members):
+                    centroids[cluster] = _unit(members.sum(axis=0), 1.0)
+
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        self._centroids = centroids
+        self._lists = [np.flatnonzero(assignment == cluster) for cluster in range(n_lists)]
+
+    def _top_k(self, similarities, candidates, k, excluded):
+        if len(excluded):
+            keep = ~np.isin(candidates, excluded)
+            similarities, candidates = similarities[keep], candidates[keep]
+        if len(candidates) > k:
+            best = np.argpartition(-similarities, k - 1)[:k]
+            similarities, candidates = similarities[best], candidates[best]
+        order = np.argsort(-similarities, kind="stable")
+        return [(self.case_ids[candidates[i]], float(similarities[i])) for i in order]
+
+    def search(self, queries, k=5, approximate=False, n_probe=4, exclude=()):
+        """
+        Return the k nearest cases for each query vector as `(case_id, cosine)` lists.
+
+        `queries` is a (M, dim) array of unit vectors; `exclude` holds case_ids that
+        must never be returned (e.g. the case being validated).
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        excluded = np.array([self._positions[c] for c in exclude if c in self._positions], dtype=np.intp)
+        if not len(self):
+            return [[] for _ in queries]
+
+        if not approximate:
+            similarities = queries @ self.vectors.T
+            similarities[:, excluded] = -np.inf
+            k = min(k, len(self) - len(excluded))
+            if k <= 0:
+                return [[] for _ in queries]
+            best = np.argpartition(similarities, -k, axis=1)[:, -k:]
+            best_scores = np.take_along_axis(similarities, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            return [
+                [(self.case_ids[i], float(score)) for i, score in zip(row, scores)]
+                for row, scores in zip(best, best_scores)
+            ]
+
+        if self._centroids is None:
+            self.build_ivf()
+        probes = np.argsort(-(queries @ self._centroids.T), axis=1)[:, :n_probe]
+        results = []
+        for query, lists in zip(queries, probes):
+            candidates = np.concatenate([self._lists[i] for i in lists])
+            results.append(self._top_k(self.vectors[candidates] @ query, candidates, k, excluded))
+        return results
+
+    @classmethod
+    def from_case_store(cls, store, cases_dir=HISTORICAL_CASES_DIR):
+        """Embed every case in a CaseStore, reading full case files where they exist"""
+        index = cls()
+        for entry in store.cases.values():
+            case = dict(entry)
+            file_path = entry.get("file_path")
+            if file_path and os.path.exists(os.path.join(cases_dir, file_path)):
+                case = {**jsonio.load(os.path.join(cases_dir, file_path)), **entry}
+            index.add(entry["case_id"], embed_case(case), {
+                "prediction_outcome": entry.get("prediction_outcome"),
+                "key_learning": entry.get("key_learning"),
+                "case_type": entry.get("case_type"),
+            })
+        return index
+
+# (log_path, cases_dir) -> (log stamp, case file paths, case files stamp, PrecedentIndex)
+_INDEX_CACHE = {}
+
+def _case_files(store, cases_dir):
+    # Watched even while missing, so creating a referenced file counts as a change
+    return tuple(os.path.join(cases_dir, entry["file_path"]) for entry in store.cases.values() if entry.get("file_path"))
+
+def load_precedent_index(log_path=DEFAULT_LOG_PATH, cases_dir=HISTORICAL_CASES_DIR):
+    """
+    Return the precedent index for a case log, rebuilt only when the log or
+    one of the case files it references changes
+    """
+    log_stamp = files_stamp((log_path,))
+    if log_stamp[0][1] is None:
+        return PrecedentIndex()
+    cached = _INDEX_CACHE.get((log_path, cases_dir))
+    if cached is None or cached[0] != log_stamp or cached[2] != files_stamp(cached[1]):
+        store = CaseStore(log_path)
+        case_files = _case_files(store, cases_dir)
+        # Stamped before reading, so an edit made mid-build forces another rebuild next time
+        case_stamp = files_stamp(case_files)
+        cached = (log_stamp, case_files, case_stamp, PrecedentIndex.from_case_store(store, cases_dir))
+        _INDEX_CACHE[(log_path, cases_dir)] = cached
+    return cached[3]
+
+def find_precedents(analyses, k=5, index=None, approximate=False):
+    """
+    Nearest archived cases for a batch of analyses.
+
+    Each result is a list of dicts with case_id, similarity, prediction_outcome,
+    historical_accuracy and key_learning; an analysis never matches its own case_id.
+    """
+    index = index if index is not None else load_precedent_index()
+    if not analyses:
+        return []
+    # One batched search; ask for one extra hit in case an analysis finds itself
+    queries = np.stack([embed_case(a) for a in analyses])
+    results = []
+    for analysis, matches in zip(analyses, index.search(queries, k=k + 1, approximate=approximate)):
+        matches = [(case_id, sim) for case_id, sim in matches if case_id != analysis.get("case_id")][:k]
+        results.append([
+            {
+                "case_id": case_id,
+                "similarity": round(similarity, 4),
+                "prediction_outcome": meta.get("prediction_outcome"),
+                "historical_accuracy": OUTCOME_ACCURACY.get(meta.get("prediction_outcome")),
+                "key_learning": meta.get("key_learning"),
+            }
+            for case_id, similarity in matches
+            for meta in (index.metadata_for(case_id),)
+        ])
+    return results
+
+def precedent_accuracy(precedents):
+    """Similarity-weighted accuracy of precedents with a known outcome, or None"""
+    scored = [(p["similarity"], p["historical_accuracy"]) for p in precedents if p["historical_accuracy"] is not None]
+    total = sum(max(similarity, 0.0) for similarity, _ in scored)
+    if not total:
+        return None
+    return round(sum(max(similarity, 0.0) * accuracy for similarity, accuracy in scored) / total, 4)
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(7)
+    tag_pool = ["low_bsi", "theoretical_override", "body_language", "finals_pressure", "power_game",
+                "comeback", "injury_return", "head_to_head", "surface_change", "crowd_factor"]
+
+    def synthetic_case():
+        return {
+            "intuitive_weighting": {"strength_factors": {
+                name: {"score": float(score)} for name, score in zip(STRENGTH_FACTORS, rng.uniform(3, 10, 4))
+            }},
+            "in_game_cascade": {"cascade_levels": [
+                {"completion": float(c)} for c in rng.uniform(20, 100, rng.integers(2, CASCADE_LEVELS + 1))
+            ]},
+            "tags": list(rng.choice(tag_pool, rng.integers(1, 4), replace=False)),
+            "prediction_outcome": str(rng.choice(OUTCOMES)),
+        }
+
+    n_cases = 50_000
+    synthetic = PrecedentIndex()
+    for i in range(n_cases):
+        synthetic.add(f"case_{i}", embed_case(synthetic_case()))
+    queries = np.stack([embed_case({**synthetic_case(), "prediction_outcome": None}) for _ in range(200)])
+
+    started = time.perf_counter()
+    exact = synthetic.search(queries, k=5)
+    exact_ms = (time.perf_counter() - started) * 1000
+    synthetic.build_ivf()
+    started = time.perf_counter()
+    approx = synthetic.search(queries, k=5, approximate=True, n_probe=8)
+    approx_ms = (time.perf_counter() - started) * 1000
+    recall = np.mean([
+        len({c for c, _ in a} & {c for c, _ in e}) / 5 for a, e in zip(approx, exact)
+    ])
+
+    print(f"🔎 {len(queries)} queries over {n_cases:,} cases")
+    print(f"   exact:       {exact_ms:.1f} ms")
+    print(f"   approximate: {approx_ms:.1f} ms (recall@5 {recall:.2f})")
+
+    test_analysis = {
+        "intuitive_weighting": {"strength_factors": {
+            "symbolic_alignment": {"score": 6.5},
+            "belief_intensity": {"score": 7.2},
+            "sentiment_intensity": {"score": 6.8},
+            "narrative_breathability": {"score": 5.9},
+        }},
+        "tags": ["finals_pressure"],
+    }
+    precedents = find_precedents([test_analysis])[0]
+    print(f"\n📚 Archive precedents: {precedents}")
+    print(f"🎯 Precedent accuracy: {precedent_accuracy(precedents)}")
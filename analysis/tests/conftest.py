@@ -0,0 +1,33 @@
+"""
+Shared setup for the analysis tests - Contra runs on the offline local backend, no API key needed
+"""
+
+import os
+import sys
+
+import pytest
+
+ANALYSIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# analysis/ is a folder of scripts, not a package; its modules import each other as top-level modules
+sys.path.insert(0, ANALYSIS_DIR)
+
+from contra_cache import ContraCache  # noqa: E402 (needs the path above)
+
+class BrokenCache:
+    """A ContraCache stand-in whose database is always locked"""
+
+    def get(self, key):
+        raise OSError("database is locked")
+
+    def put(self, key, response):
+        raise OSError("database is locked")
+
+@pytest.fixture
+def cache():
+    cache = ContraCache(":memory:")
+    yield cache
+    cache.close()
+
+@pytest.fixture
+def broken_cache():
+    return BrokenCache()
@@ -0,0 +1,56 @@
+"""
+BSISession edits against the single-read and batch re-path functions
+"""
+
+import random
+
+from bsi_repath import (
+    PATTERN_NAMES,
+    STRENGTH_FACTORS,
+    BSISession,
+    calculate_bsi_score,
+    calculate_bsi_scores,
+    detect_low_flexibility_patterns,
+    detect_low_flexibility_patterns_batch,
+)
+
+def make_analysis(scores, completions=()):
+    return {
+        "intuitive_weighting": {"strength_factors": {name: {"score": score} for name, score in scores.items()}},
+        "in_game_cascade": {"cascade_levels": [{"completion": completion} for completion in completions]},
+    }
+
+def test_edits_landing_on_the_threshold_match_calculate_bsi_score():
+    # 7.0 everywhere scores exactly low_bsi; a running sum reached 6.999999999999999
+    session = BSISession(make_analysis(dict(zip(STRENGTH_FACTORS, (6.1, 6.1, 6.1, 8.3)))))
+    assert session.repath_required
+    for name in STRENGTH_FACTORS:
+        delta = session.set_factor(name, 7.0)
+
+    assert session.bsi_score == calculate_bsi_score(make_analysis(dict.fromkeys(STRENGTH_FACTORS, 7.0))) == 7.0
+    assert not session.repath_required
+    assert delta["repath_required"] is False
+    assert session.result() == {"repath_required": False, "bsi_score": 7.0, "status": "Analysis quality acceptable"}
+
+def test_random_edits_agree_with_per_read_and_batch_paths():
+    rng = random.Random(4)
+    scores = {name: round(rng.uniform(1, 10), 1) for name in STRENGTH_FACTORS}
+    completions = [rng.randint(0, 100) for _ in range(4)]
+    flags = ["flag"] * 2
+    session = BSISession(make_analysis(scores, completions), flags)
+
+    for _ in range(2000):
+        if rng.random() < 0.8:
+            name = rng.choice(STRENGTH_FACTORS + ("extra_factor",))
+            scores[name] = round(rng.uniform(0, 10), 1)
+            session.set_factor(name, scores[name])
+        else:
+            index = rng.randrange(len(completions))
+            completions[index] = rng.randint(0, 100)
+            session.set_cascade_level(index, completions[index])
+
+        analysis = make_analysis(scores, completions)
+        assert session.bsi_score == calculate_bsi_score(analysis) == calculate_bsi_scores([analysis])[0]
+        assert session.patterns == detect_low_flexibility_patterns(analysis, flags)
+        batch_row = detect_low_flexibility_patterns_batch([analysis], [flags])[0]
+        assert session.patterns == [name for name, detected in zip(PATTERN_NAMES, batch_row) if detected]
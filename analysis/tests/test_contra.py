@@ -0,0 +1,74 @@
+"""
+check_read_with_contra / stream_read_with_contra caching through the local backend
+"""
+
+import pytest
+
+from contra import CONTRA_SYSTEM_PROMPT, check_read_with_contra, parse_contra_flags, stream_read_with_contra
+from contra_backends import ContraBackend, create_backend
+
+READ = (
+    "I expect them to win this easily. It could go either way while the new players settle in. "
+    "Their counter attack is a real weapon."
+)
+ERROR = "Error: Could not get analysis from Contra."
+
+class CountingBackend(ContraBackend):
+    """Local rules backend that records how often the model is actually called"""
+
+    def __init__(self):
+        self.backend = create_backend("local", "unused", CONTRA_SYSTEM_PROMPT)
+        self.model_name = self.backend.model_name
+        self.calls = 0
+
+    def generate_content(self, user_read, stream=False):
+        self.calls += 1
+        return self.backend.generate_content(user_read, stream=stream)
+
+class BlockedResponse:
+    @property
+    def text(self):
+        raise ValueError("response was blocked by the safety filter")
+
+class BlockedBackend(ContraBackend):
+    model_name = "blocked"
+
+    def generate_content(self, user_read, stream=False):
+        return BlockedResponse()
+
+@pytest.fixture
+def model():
+    return CountingBackend()
+
+def test_second_check_is_served_from_cache(model, cache):
+    first = check_read_with_contra(READ, model=model, cache=cache)
+    second = check_read_with_contra("  " + READ.replace(" ", "\n") + "  ", model=model, cache=cache)
+
+    assert second == first
+    assert model.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert parse_contra_flags(first)
+
+def test_use_cache_false_always_calls_the_model(model, cache):
+    check_read_with_contra(READ, model=model, cache=cache, use_cache=False)
+    check_read_with_contra(READ, model=model, cache=cache, use_cache=False)
+
+    assert model.calls == 2
+    assert cache.stats()["entries"] == 0
+
+def test_broken_cache_falls_back_to_the_model(model, broken_cache):
+    text = check_read_with_contra(READ, model=model, cache=broken_cache)
+
+    assert text == model.backend.generate_content(READ).text
+    assert model.calls == 1
+
+def test_blocked_response_is_reported_not_raised(cache):
+    assert check_read_with_contra(READ, model=BlockedBackend(), cache=cache) == ERROR
+    assert cache.stats()["entries"] == 0
+
+def test_stream_caches_the_joined_text(model, cache):
+    streamed = "".join(stream_read_with_contra(READ, model=model, cache=cache))
+
+    assert list(stream_read_with_contra(READ, model=model, cache=cache)) == [streamed]
+    assert check_read_with_contra(READ, model=model, cache=cache) == streamed
+    assert model.calls == 1
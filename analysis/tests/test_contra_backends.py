@@ -0,0 +1,23 @@
+"""
+Local rule-based Contra backend cues
+"""
+
+import pytest
+
+from contra_backends import _WEIGHTING, LocalContraBackend
+
+@pytest.mark.parametrize("text", ["I put 50% on her serve", "weighted at 70 %", "her serve is 60%"])
+def test_percentage_counts_as_weighting(text):
+    assert _WEIGHTING.search(text)
+
+def test_cues_still_need_a_whole_word():
+    assert not _WEIGHTING.search("the outweighted side")
+    assert _WEIGHTING.search("her serve outweighs the rest")
+
+def test_weighted_power_factor_is_not_flagged():
+    backend = LocalContraBackend()
+    unweighted = backend.analyze("Her serve is a real weapon.")
+    weighted = backend.analyze("Her serve is a real weapon, I put 60% of my call on it.")
+
+    assert [pattern for _, pattern, _ in unweighted] == ["Power Factor Without Weight Assignment"]
+    assert weighted == []
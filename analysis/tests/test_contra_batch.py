@@ -0,0 +1,164 @@
+"""
+check_reads_with_contra: ordering, caching, concurrency limit and retries
+"""
+
+import asyncio
+
+import pytest
+
+from contra import CONTRA_SYSTEM_PROMPT
+from contra_backends import ContraBackend, ContraResponse, create_backend
+import contra_batch
+from contra_batch import ERROR_RESPONSE, MinuteBudget, check_reads_with_contra
+
+READS = [
+    "I expect them to win this easily. It could go either way while the new players settle in.",
+    "Their counter attack is a real weapon.",
+    "She can only brawl, no technique at all.",
+    "A quiet read with nothing to flag.",
+]
+
+class SlowStub(ContraBackend):
+    """Async stub that records how many calls overlap and fails the first `failures` calls"""
+
+    model_name = "stub"
+
+    def __init__(self, failures=0, delay=0.01):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_content_async(self, user_read):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.calls <= self.failures:
+                raise ConnectionError("429 Resource exhausted")
+            return ContraResponse(f"analysis of {user_read}")
+        finally:
+            self.in_flight -= 1
+
+def run(reads, model, cache, **kwargs):
+    kwargs.setdefault("requests_per_minute", None)
+    return check_reads_with_contra(reads, model=model, cache=cache, **kwargs)
+
+def test_local_backend_results_in_order_and_cached(cache):
+    local = create_backend("local", "unused", CONTRA_SYSTEM_PROMPT)
+    expected = [local.generate_content(read).text for read in READS]
+
+    assert run(READS, local, cache) == expected
+    assert cache.misses == len(READS)
+    assert run(list(reversed(READS)), local, cache) == list(reversed(expected))
+    assert cache.hits == len(READS)
+
+def test_concurrency_is_bounded(cache):
+    stub = SlowStub()
+    results = run([f"read {i}" for i in range(10)], stub, cache, max_concurrency=3)
+
+    assert results == [f"analysis of read {i}" for i in range(10)]
+    assert stub.peak == 3
+
+def test_failed_call_is_retried(cache):
+    stub = SlowStub(failures=2)
+    results = run(["only read"], stub, cache, max_retries=3, base_delay=0)
+
+    assert results == ["analysis of only read"]
+    assert stub.calls == 3
+
+def test_error_response_after_retries_run_out(cache):
+    stub = SlowStub(failures=10)
+    results = run(["only read"], stub, cache, max_retries=2, base_delay=0)
+
+    assert results == [ERROR_RESPONSE]
+    assert stub.calls == 3
+    assert cache.stats()["entries"] == 0
+
+def test_broken_cache_falls_back_to_the_model(broken_cache):
+    stub = SlowStub()
+    results = run(READS, stub, broken_cache)
+
+    assert results == [f"analysis of {read}" for read in READS]
+    assert stub.calls == len(READS)
+
+class FakeClock:
+    """Stands in for time.monotonic and asyncio.sleep: sleeping advances the clock instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._real_sleep = asyncio.sleep
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        if seconds > 0:
+            self.sleeps.append(seconds)
+            self.now += seconds
+        await self._real_sleep(0)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(contra_batch.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(contra_batch.asyncio, "sleep", clock.sleep)
+    return clock
+
+def test_request_budget_waits_for_the_oldest_request_to_leave_the_window(clock):
+    async def acquire_all():
+        budget = MinuteBudget(requests_per_minute=2)
+        sent = []
+        for _ in range(5):
+            await budget.acquire()
+            sent.append(clock.now)
+        return sent
+
+    assert asyncio.run(acquire_all()) == [0.0, 0.0, 60.0, 60.0, 120.0]
+    assert clock.sleeps == [60.0, 60.0]
+
+def test_token_budget_waits_until_enough_tokens_are_freed(clock):
+    async def acquire_all():
+        budget = MinuteBudget(tokens_per_minute=100)
+        await budget.acquire(40)
+        clock.now = 10.0
+        await budget.acquire(40)
+        await budget.acquire(40)  # 120 > 100 until the first request expires at t=60
+        sent_third = clock.now
+        await budget.acquire(90)  # needs both remaining requests gone (t=70 and t=120)
+        return sent_third, clock.now
+
+    assert asyncio.run(acquire_all()) == (60.0, 120.0)
+    assert clock.sleeps == [50.0, 60.0]
+
+def test_oversized_request_is_not_held_back_forever(clock):
+    async def acquire():
+        await MinuteBudget(tokens_per_minute=10).acquire(50)
+
+    asyncio.run(acquire())
+    assert clock.sleeps == []
+
+def test_batched_reads_are_paced_by_the_request_budget(clock, cache):
+    stub = SlowStub(delay=0)
+    results = run([f"read {i}" for i in range(5)], stub, cache, requests_per_minute=2)
+
+    assert results == [f"analysis of read {i}" for i in range(5)]
+    assert clock.sleeps == [60.0, 60.0]
+
+def test_retries_back_off_with_full_jitter_up_to_the_cap(clock, cache, monkeypatch):
+    bounds = []
+
+    def uniform(low, high):
+        bounds.append((low, high))
+        return high / 2
+
+    monkeypatch.setattr(contra_batch.random, "uniform", uniform)
+    stub = SlowStub(failures=4, delay=0)
+    results = run(["only read"], stub, cache, max_retries=4, base_delay=1.0, max_delay=5.0)
+
+    assert results == ["analysis of only read"]
+    assert bounds == [(0, 1.0), (0, 2.0), (0, 4.0), (0, 5.0)]
+    assert clock.sleeps == [0.5, 1.0, 2.0, 2.5]
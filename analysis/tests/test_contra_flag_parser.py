@@ -0,0 +1,85 @@
+"""
+ContraFlagParser: records assembled from streamed chunks, wherever the chunks split
+"""
+
+from contra import ContraFlagParser, parse_contra_flags
+
+ANALYSIS = (
+    "### Contradictions\n"
+    "-   **Statement**: \"I expect them to win this easily.\"\n"
+    "    **Pattern**: Expectation vs. Condition Mismatch\n"
+    "    **Flag**: An easy win is expected while the new players are still settling in.\n"
+    "\n"
+    "-   **Statement**: \"Their counter attack is a real weapon.\"\n"
+    "    **Pattern**: power factor without weight assignment\n"
+    "    **Flag**: The counter attack is named as a strength\n"
+    "    but never weighed against anything else.\n"
+)
+
+FIRST = {
+    "statement": "\"I expect them to win this easily.\"",
+    "pattern": "Expectation vs. Condition Mismatch",
+    "flag": "An easy win is expected while the new players are still settling in.",
+}
+SECOND = {
+    "statement": "\"Their counter attack is a real weapon.\"",
+    "pattern": "Power Factor Without Weight Assignment",
+    "flag": "The counter attack is named as a strength but never weighed against anything else.",
+}
+
+def test_flag_split_across_chunks():
+    parser = ContraFlagParser()
+    split = ANALYSIS.index("while the new")
+
+    assert parser.feed(ANALYSIS[:split]) == []
+    assert parser.feed(ANALYSIS[split:]) == [FIRST]  # completed by the blank line
+    assert parser.close() == [SECOND]
+    assert parser.records == [FIRST, SECOND]
+
+def test_any_chunking_gives_the_same_records():
+    for size in (1, 2, 7, 64):
+        parser = ContraFlagParser()
+        for start in range(0, len(ANALYSIS), size):
+            parser.feed(ANALYSIS[start:start + size])
+        parser.close()
+        assert parser.records == [FIRST, SECOND], size
+
+def test_continuation_lines_extend_the_current_field():
+    records = parse_contra_flags(
+        "Statement: They can only brawl,\n"
+        "no technique at all.\n"
+        "Pattern: Fundamental Trait vs. Arbitrary Limitation\n"
+        "a continuation after the pattern is ignored\n"
+        "Flag: A fighting style is treated\n"
+        "   as a fixed limit.\n"
+    )
+
+    assert records == [{
+        "statement": "They can only brawl, no technique at all.",
+        "pattern": "Fundamental Trait vs. Arbitrary Limitation",
+        "flag": "A fighting style is treated as a fixed limit.",
+    }]
+
+def test_close_flushes_a_trailing_line_without_newline():
+    parser = ContraFlagParser()
+
+    assert parser.feed("Statement: It could go either way.\nPattern: Paradox\nFlag: Both outcomes are") == []
+    assert parser.close() == [{
+        "statement": "It could go either way.",
+        "pattern": "Paradox",
+        "flag": "Both outcomes are",
+    }]
+    assert parser.close() == []
+
+def test_malformed_lines_are_skipped():
+    records = parse_contra_flags(
+        "Here is the analysis you asked for.\n"
+        "Pattern: Expectation vs. Condition Mismatch\n"  # no statement, so no record
+        "Flag: orphaned flag\n"
+        "\n"
+        "Statement without a colon\n"
+        "Statement: A real statement.\n"
+        "Flag: Its flag.\n"
+    )
+
+    assert records == [{"statement": "A real statement.", "pattern": None, "flag": "Its flag."}]
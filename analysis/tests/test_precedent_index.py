@@ -0,0 +1,55 @@
+"""
+load_precedent_index cache invalidation on a scratch case archive
+"""
+
+import os
+
+import numpy as np
+
+from case_store import CaseStore
+from jsonio import dump
+from precedent_index import embed_case, load_precedent_index
+
+def write_case(path, breathability, mtime_ns):
+    dump({"intuitive_weighting": {"strength_factors": {"narrative_breathability": {"score": breathability}}}}, path)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def make_archive(tmp_path):
+    cases_dir = tmp_path / "cases"
+    cases_dir.mkdir()
+    log_path = str(cases_dir / "case_log.ndjson")
+    write_case(cases_dir / "case_a.json", 2.0, 10**18)
+    store = CaseStore(log_path)
+    store.add_case({"case_id": "case_a", "bsi_score": 6.0, "tags": ["comeback"], "file_path": "./case_a.json"})
+    store.add_case({"case_id": "case_b", "bsi_score": 8.0, "tags": ["power_game"]})
+    return log_path, str(cases_dir)
+
+def vector_of(index, case_id):
+    return index.vectors[index.case_ids.index(case_id)]
+
+def test_index_is_reused_while_nothing_changes(tmp_path):
+    log_path, cases_dir = make_archive(tmp_path)
+    assert load_precedent_index(log_path, cases_dir) is load_precedent_index(log_path, cases_dir)
+
+def test_editing_a_case_file_rebuilds_the_index(tmp_path):
+    log_path, cases_dir = make_archive(tmp_path)
+    before = load_precedent_index(log_path, cases_dir)
+
+    # The case log itself is untouched
+    write_case(os.path.join(cases_dir, "case_a.json"), 9.5, 10**18 + 1)
+    after = load_precedent_index(log_path, cases_dir)
+
+    assert after is not before
+    expected = embed_case({
+        "case_id": "case_a", "bsi_score": 6.0, "tags": ["comeback"], "file_path": "./case_a.json",
+        "intuitive_weighting": {"strength_factors": {"narrative_breathability": {"score": 9.5}}},
+    })
+    assert np.allclose(vector_of(after, "case_a"), expected)
+    assert not np.allclose(vector_of(before, "case_a"), expected)
+
+def test_appending_to_the_log_rebuilds_the_index(tmp_path):
+    log_path, cases_dir = make_archive(tmp_path)
+    assert len(load_precedent_index(log_path, cases_dir)) == 2
+
+    CaseStore(log_path).add_case({"case_id": "case_c", "bsi_score": 5.0})
+    assert len(load_precedent_index(log_path, cases_dir)) == 3
@@ -0,0 +1,61 @@
+"""
+ValidationLoop precedent memo against the bundled case archive
+"""
+
+from analysis_model import Analysis
+from validation_loop import ValidationLoop
+
+def make_analysis(breathability=5.9):
+    return {
+        "intuitive_weighting": {"strength_factors": {
+            "symbolic_alignment": {"score": 6.5},
+            "belief_intensity": {"score": 7.2},
+            "sentiment_intensity": {"score": 6.8},
+            "narrative_breathability": {"score": breathability},
+        }},
+        "tags": ["finals_pressure"],
+    }
+
+def make_loop(breathability=5.9):
+    return ValidationLoop(make_analysis(breathability))
+
+def test_precedents_are_memoized_and_copied():
+    loop = make_loop()
+    first = loop._find_historical_precedents()
+    first[0]["key_learning"] = "edited by the caller"
+
+    second = loop._find_historical_precedents()
+    assert second[0]["key_learning"] != "edited by the caller"
+    assert (loop.memo_hits, loop.memo_misses) == (1, 1)
+
+def test_editing_a_read_path_drops_the_memo():
+    loop = make_loop()
+    before = loop._find_historical_precedents()
+    loop.update_analysis(("intuitive_weighting", "strength_factors", "narrative_breathability", "score"), 9.8)
+    after = loop._find_historical_precedents()
+
+    assert loop.memo_misses == 2
+    assert after == make_loop(9.8)._find_historical_precedents()
+    assert after[0]["similarity"] != before[0]["similarity"]
+
+def test_unrelated_edits_keep_the_memo():
+    loop = make_loop()
+    loop._calculate_precedent_accuracy()
+    loop.update_analysis(("match_context", "venue"), "centre court")
+    loop._calculate_precedent_accuracy()
+
+    # First call misses for the accuracy and the precedents it reads; the second is one hit
+    assert (loop.memo_hits, loop.memo_misses) == (1, 2)
+
+def test_typed_analysis_validates_like_the_raw_document():
+    typed = ValidationLoop(Analysis.from_dict(make_analysis()))
+    raw = make_loop()
+
+    assert typed._check_narrative_completeness() == raw._check_narrative_completeness()
+    assert typed._find_historical_precedents() == raw._find_historical_precedents()
+
+    path = ("intuitive_weighting", "strength_factors", "narrative_breathability", "score")
+    typed.update_analysis(path, 9.8)
+    assert isinstance(typed.analysis, Analysis)
+    assert typed.analysis.intuitive_weighting.strength_factors.narrative_breathability.score == 9.8
+    assert typed._find_historical_precedents() == make_loop(9.8)._find_historical_precedents()
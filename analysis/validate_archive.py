@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Bulk Archive Validation
+Re-validates every archived case (and NDJSON files of daily reads) across a
+process pool and writes one newline-delimited JSON report per case
+"""
+
+import glob
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+try:
+    from . import jsonio
+    from .validation_loop import ValidationLoop
+except ImportError:  # run as a script from inside analysis/
+    import jsonio
+    from validation_loop import ValidationLoop
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORICAL_CASES_DIR = os.path.join(ANALYSIS_DIR, "historical_cases")
+DEFAULT_OUTPUT = os.path.join(ANALYSIS_DIR, "..", "trading_dashboard", "validation_reports.ndjson")
+
+# Derived files that live next to the cases but are not cases themselves
+SKIPPED_FILES = {"case_index.json", "case_log.ndjson"}
+
+def iter_validation_tasks(sources):
+    """
+    Stream validation tasks from case files, directories and NDJSON files.
+
+    A task is `(source, payload)`: for a `.json` case the payload is None and the
+    worker reads the file itself; for `.ndjson` / `.jsonl` sources each line is
+    one case and the payload is that line.
+    """
+    for source in sources:
+        if os.path.isdir(source):
+            paths = [
+                path
+                for pattern in ("*.json", "*.ndjson", "*.jsonl")
+                for path in sorted(glob.glob(os.path.join(source, pattern)))
+                if os.path.basename(path) not in SKIPPED_FILES
+            ]
+        else:
+            paths = [source]
+
+        for path in paths:
+            if path.endswith((".ndjson", ".jsonl")):
+                with open(path, encoding="utf-8") as f:
+                    for line_number, line in enumerate(f, 1):
+                        if line.strip():
+                            yield f"{path}:{line_number}", line
+            else:
+                yield path, None
+
+def validate_task(task):
+    """Worker: load one case and return `(ok, NDJSON report line)`"""
+    source, payload = task
+    try:
+        case = jsonio.load(source) if payload is None else jsonio.loads(payload)
+        report = ValidationLoop(case).run_all(max_workers=1)  # already one case per process
+        record = {"source": source, "case_id": case.get("case_id") or case.get("analysis_id"), "report": report}
+    except Exception as e:
+        return False, jsonio.dumps({"source": source, "error": f"{type(e).__name__}: {e}"})
+    return True, jsonio.dumps(record, default=str)
+
+def validate_archive(sources=(HISTORICAL_CASES_DIR,), output_path=DEFAULT_OUTPUT, workers=None, chunksize=16, progress_every=500):
+    """
+    Validate every case from `sources` in parallel, writing NDJSON reports to `output_path`.
+
+    Returns throughput counters: processed, failed, elapsed seconds and cases per second.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    processed = failed = 0
+    started = time.perf_counter()
+
+    with Pool(processes=workers) as pool, open(output_path, "w", encoding="utf-8") as out:
+        for ok, line in pool.imap_unordered(validate_task, iter_validation_tasks(sources), chunksize=chunksize):
+            out.write(line + "\n")
+            processed += 1
+            failed += not ok
+            if progress_every and processed % progress_every == 0:
+                elapsed = time.perf_counter() - started
+                print(f"⏳ {processed:,} cases validated ({failed} failed) - {processed / elapsed:,.0f} cases/s")
+
+    elapsed = time.perf_counter() - started
+    return {
+        "processed": processed,
+        "failed": failed,
+        "elapsed_seconds": round(elapsed, 3),
+        "cases_per_second": round(processed / elapsed, 1) if elapsed else 0.0,
+        "output_path": os.path.abspath(output_path),
+    }
+
+if __name__ == "__main__":
+    sources = sys.argv[1:] or [HISTORICAL_CASES_DIR]
+    print(f"🗂️  Validating archive: {', '.join(sources)}")
+    summary = validate_archive(sources)
+    print(f"\n✅ {summary['processed']:,} cases validated, {summary['failed']} failed")
+    print(f"⚡ {summary['cases_per_second']:,} cases/s in {summary['elapsed_seconds']}s")
+    print(f"📁 Reports written to {summary['output_path']}")
@@ -4,13 +4,131 @@ Validation Loop System
 Complete reality-check and feedback cycle for analysis validation
 """
 
-import json
+import copy
+import functools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
+try:
+    from . import jsonio
+    from .analysis_model import Record
+    from .case_store import HISTORICAL_CASES_DIR, files_stamp
+    from .precedent_index import find_precedents, precedent_accuracy
+except ImportError:  # run as a script from inside analysis/
+    import jsonio
+    from analysis_model import Record
+    from case_store import HISTORICAL_CASES_DIR, files_stamp
+    from precedent_index import find_precedents, precedent_accuracy
+
+# Validation steps and the steps that must finish before each one starts.
+# Backfill works out what is still missing, so it waits for the steps that
+# check the read, the sources and the historical record.
+STEP_DEPENDENCIES = {
+    "checklist": (),
+    "voices": (),
+    "reality_check": (),
+    "skincrawler": (),
+    "gaps": ("checklist", "reality_check", "skincrawler"),
+}
+
+# Everything a case is embedded from for precedent search (see precedent_index)
+PRECEDENT_PATHS = (
+    ('case_id',),
+    ('bsi_score',),
+    ('tags',),
+    ('prediction_outcome',),
+    ('intuitive_weighting', 'strength_factors'),
+    ('in_game_cascade', 'cascade_levels'),
+    ('original_low_bsi_read', 'bsi_indicators'),
+    ('reality_vs_read_analysis', 'prediction_outcome'),
+)
+PRECEDENT_COUNT = 5
+
+# Files the precedent search reads besides the analysis: the case log and case files
+ARCHIVE_PATHS = (HISTORICAL_CASES_DIR,)
+
+# Results handed out as they are; anything else is deep-copied per call
+_IMMUTABLE = (type(None), bool, int, float, str)
+
+def _reads(*paths, files=()):
+    """Memoize a zero-argument helper, keyed on the parts of self.analysis it reads
+
+    Each path is a tuple of keys into the analysis. The cached result is only
+    dropped when something at, above or below one of those paths changes
+    (see ValidationLoop.update_analysis), or when any of `files` changes on
+    disk. Only worth it for helpers that do real work: a memo hit costs a lock,
+    a files stamp and a copy. Callers get their own copy of a mutable result,
+    so editing it (or the report it ends up in) can't leak back.
+    """
+    def decorate(method):
+        name = method.__name__
+
+        @functools.wraps(method)
+        def memoized(self):
+            stamp = files_stamp(files) if files else None
+            with self._memo_lock:
+                entry = self._memo.get(name)
+                hit = entry is not None and entry[0] == stamp
+                if hit:
+                    self.memo_hits += 1
+                else:
+                    self.memo_misses += 1
+                generation = self._memo_generation
+            if hit:
+                result = entry[1]
+            else:
+                result = method(self)
+                with self._memo_lock:
+                    # Don't store a result computed from data invalidated in the meantime
+                    if generation == self._memo_generation:
+                        self._memo[name] = (stamp, result)
+            return result if isinstance(result, _IMMUTABLE) else copy.deepcopy(result)
+
+        memoized.analysis_paths = paths
+        return memoized
+    return decorate
+
+def _paths_overlap(a, b):
+    shorter = min(len(a), len(b))
+    return a[:shorter] == b[:shorter]
+
 class ValidationLoop:
     def __init__(self, analysis_data):
         self.analysis = analysis_data
         self.validation_results = {}
+        self.step_timings = {}
+        self._memo = {}  # helper name -> (files stamp, result)
+        self._memo_lock = threading.Lock()  # steps run on a thread pool
+        self._memo_generation = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    def update_analysis(self, path, value):
+        """Set one value in the analysis and drop only the memoized helpers that read it"""
+        typed = isinstance(self.analysis, Record)
+        # A typed analysis is edited as its JSON document and parsed back, so nested records keep their types
+        node = root = self.analysis.to_dict() if typed else self.analysis
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+        if typed:
+            self.analysis = type(self.analysis).from_dict(root)
+        self.invalidate(path)
+
+    def invalidate(self, path=None):
+        """Drop memoized helpers depending on `path` (or every helper when no path is given)"""
+        with self._memo_lock:
+            self._memo_generation += 1
+            if path is None:
+                self._memo.clear()
+                return
+            path = tuple(path)
+            for name in list(self._memo):
+                reads = getattr(type(self), name).analysis_paths
+                if any(_paths_overlap(path, read) for read in reads):
+                    self._memo.pop(name, None)
         
     def run_checklist_validation(self):
         """Step 1: Run through systematic checklist validation"""
@@ -96,10 +214,11 @@ class ValidationLoop:
     
     def generate_final_validation_report(self):
         """Generate comprehensive validation report with action items"""
+        overall_score = self._calculate_overall_score()
         report = {
             "validation_timestamp": datetime.now().isoformat(),
-            "overall_validation_score": self._calculate_overall_score(),
-            "validation_status": "passed" if self._calculate_overall_score() > 7.0 else "requires_revision",
+            "overall_validation_score": overall_score,
+            "validation_status": "passed" if overall_score > 7.0 else "requires_revision",
             "critical_issues": self._identify_critical_issues(),
             "action_items": self._generate_action_items(),
             "system_learning_points": self._extract_learning_points(),
@@ -108,6 +227,50 @@ class ValidationLoop:
         
         return report
     
+    def run_all(self, generated_voices=None, interviews=None, match_footage=None, stats=None, max_workers=None):
+        """Run every validation step, independent steps concurrently, and return the final report"""
+        steps = {
+            "checklist": self.run_checklist_validation,
+            "voices": lambda: self.compare_skitz_voices(generated_voices or []),
+            "reality_check": lambda: self.reality_check_against_sources(interviews, match_footage, stats),
+            "skincrawler": self.run_skincrawler_analysis,
+            "gaps": self.backfill_trading_dashboard,
+        }
+
+        def timed(name):
+            started = time.perf_counter()
+            try:
+                return steps[name]()
+            finally:
+                self.step_timings[name] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if max_workers == 1:
+            # STEP_DEPENDENCIES lists every step after the steps it needs
+            for name in STEP_DEPENDENCIES:
+                timed(name)
+        else:
+            self._run_steps_concurrently(timed, max_workers or len(steps))
+
+        report = self.generate_final_validation_report()
+        report["step_timings"] = {name: round(self.step_timings[name], 6) for name in STEP_DEPENDENCIES}
+        report["total_wall_time"] = round(time.perf_counter() - started, 6)
+        return report
+
+    def _run_steps_concurrently(self, run_step, max_workers):
+        """Run each step on a thread pool as soon as the steps it depends on have finished"""
+        done, running = set(), {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while len(done) < len(STEP_DEPENDENCIES):
+                for name, needs in STEP_DEPENDENCIES.items():
+                    if name not in done and name not in running.values() and all(dep in done for dep in needs):
+                        running[pool.submit(run_step, name)] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    future.result()  # re-raise step failures
+                    done.add(running.pop(future))
+
     # Helper methods for validation logic
     def _check_logical_consistency(self):
         """Check for logical contradictions in the analysis"""
@@ -170,20 +333,19 @@ class ValidationLoop:
             "Composure advantage not supported by pressure match data"
         ]
     
+    @_reads(*PRECEDENT_PATHS, files=ARCHIVE_PATHS)
     def _find_historical_precedents(self):
-        """Find similar historical matchups and their outcomes"""
-        return [
-            {"matchup": "Power vs Technique", "historical_accuracy": 0.65},
-            {"matchup": "Mental game emphasis", "historical_accuracy": 0.78}
-        ]
+        """Find the most similar archived cases and their outcomes"""
+        return find_precedents([self.analysis], k=PRECEDENT_COUNT)[0]
     
     def _identify_pattern_matches(self):
         """Identify patterns that match historical data"""
         return ["Mental state emphasis", "David vs Goliath narrative"]
     
+    @_reads(*PRECEDENT_PATHS, files=ARCHIVE_PATHS)
     def _calculate_precedent_accuracy(self):
         """Calculate accuracy of similar precedent predictions"""
-        return 0.72
+        return precedent_accuracy(self._find_historical_precedents())
     
     def _identify_outlier_factors(self):
         """Identify factors that make this case unique"""
@@ -263,24 +425,14 @@ if __name__ == "__main__":
     
     validator = ValidationLoop(test_analysis)
     
-    # Run full validation cycle
-    print("🔍 Running Checklist Validation...")
-    checklist = validator.run_checklist_validation()
-    
-    print("🎭 Comparing Skitz Voices...")
-    voice_check = validator.compare_skitz_voices(["voice_sample_1", "voice_sample_2"])
-    
-    print("👁️ Reality Checking Against Sources...")
-    reality = validator.reality_check_against_sources()
-    
-    print("🕷️ Running Skincrawler Analysis...")
-    skincrawler = validator.run_skincrawler_analysis()
-    
-    print("📊 Backfilling Trading Dashboard...")
-    gaps = validator.backfill_trading_dashboard()
+    # Run full validation cycle (independent steps run concurrently)
+    print("🔍 Running Checklist, 🎭 Skitz Voices, 👁️ Reality Check, 🕷️ Skincrawler...")
+    print("📊 Backfilling Trading Dashboard once its inputs are in...")
+    final_report = validator.run_all(generated_voices=["voice_sample_1", "voice_sample_2"])
     
-    print("📋 Generating Final Validation Report...")
-    final_report = validator.generate_final_validation_report()
+    print("📋 Final Validation Report generated")
+    for step, seconds in final_report["step_timings"].items():
+        print(f"   ⏱️  {step}: {seconds * 1000:.2f} ms")
     
     print(f"\n🎯 VALIDATION COMPLETE")
     print(f"Overall Score: {final_report['overall_validation_score']}")
@@ -289,7 +441,6 @@ if __name__ == "__main__":
     print(f"Action Items: {len(final_report['action_items'])}")
     
     # Save validation report
-    with open('../trading dashbaord/validation_report.json', 'w') as f:
-        json.dump(final_report, f, indent=2)
+    jsonio.dump(final_report, '../trading dashbaord/validation_report.json', indent=2)
     
     print("📁 Validation report saved to trading dashboard") 
\ No newline at end of file
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+BSI Weight Profiles
+Loads alternative BSI weightings and thresholds, compiles them into vectorized
+evaluators and scores whole archives under several profiles side by side
+
+A profile file is either JSON or plain `key: value` lines (`#` starts a comment).
+Keys are the four strength factor names (weights) and any DEFAULT_THRESHOLDS
+name; anything left out falls back to the built-in default. JSON profiles may
+also group keys under "weights" and "thresholds":
+
+    # breathability_first.txt
+    name: breathability_first
+    narrative_breathability: 0.4
+    belief_intensity: 0.2
+    low_bsi: 6.8
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from . import jsonio
+    from .bsi_repath import (
+        BSI_WEIGHTS,
+        DEFAULT_THRESHOLDS,
+        STRENGTH_FACTORS,
+        extract_pattern_features,
+        load_factor_matrix,
+        pattern_masks,
+        patterns_from_features,
+        weighted_factor_sum,
+    )
+except ImportError:  # run as a script from inside analysis/
+    import jsonio
+    from bsi_repath import (
+        BSI_WEIGHTS,
+        DEFAULT_THRESHOLDS,
+        STRENGTH_FACTORS,
+        extract_pattern_features,
+        load_factor_matrix,
+        pattern_masks,
+        patterns_from_features,
+        weighted_factor_sum,
+    )
+
+class WeightProfile:
+    """A compiled BSI weight profile: weight vector plus detection thresholds"""
+
+    def __init__(self, name, weights=BSI_WEIGHTS, thresholds=DEFAULT_THRESHOLDS, source=None):
+        self.name = name
+        self.weights = np.asarray(weights, dtype=float)
+        self.thresholds = dict(thresholds)
+        self.source = source
+
+    def __repr__(self):
+        return f"WeightProfile({self.name!r})"
+
+    def score(self, analyses):
+        """BSI scores for a batch of analyses under this profile"""
+        return weighted_factor_sum(load_factor_matrix(analyses), self.weights)
+
+    def evaluate(self, analyses, contra_flags_list):
+        """Scores, re-path flags and pattern matrix for a batch of analyses"""
+        return evaluate_profiles(analyses, contra_flags_list, [self])[self.name]
+
+DEFAULT_PROFILE = WeightProfile("default")
+
+def parse_profile_text(text):
+    """Parse profile file contents into a flat {key: number} dict (plus optional name)"""
+    stripped = text.strip()
+    if not stripped:
+        raise ValueError("weight profile is empty")
+
+    if stripped.startswith("{"):
+        raw = jsonio.loads(stripped)
+        values = {key: value for key, value in raw.items() if key not in ("weights", "thresholds")}
+        values.update(raw.get("weights", {}))
+        values.update(raw.get("thresholds", {}))
+        return values
+
+    values = {}
+    for line_number, line in enumerate(stripped.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        separator = ":" if ":" in line else "="
+        key, sep, value = line.partition(separator)
+        if not sep:
+            raise ValueError(f"line {line_number}: expected 'key: value', got {line!r}")
+        values[key.strip()] = value.strip()
+    return values
+
+def compile_profile(values, name=None, source=None):
+    """Compile parsed profile values into a WeightProfile"""
+    values = dict(values)
+    name = values.pop("name", None) or name or "unnamed"
+
+    weights = BSI_WEIGHTS.copy()
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for key, value in values.items():
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"profile {name!r}: {key} must be numeric, got {value!r}") from None
+        if key in STRENGTH_FACTORS:
+            weights[STRENGTH_FACTORS.index(key)] = number
+        elif key in thresholds:
+            thresholds[key] = number
+        else:
+            raise ValueError(f"profile {name!r}: unknown key {key!r}")
+
+    return WeightProfile(name, weights, thresholds, source)
+
+# path -> (mtime_ns, WeightProfile)
+_PROFILE_CACHE = {}
+
+def load_weight_profile(path):
+    """Load and compile a profile file, reusing the compiled profile until the file changes"""
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _PROFILE_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, encoding="utf-8") as f:
+        try:
+            values = parse_profile_text(f.read())
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+    default_name = os.path.splitext(os.path.basename(path))[0]
+    profile = compile_profile(values, name=default_name, source=path)
+
+    _PROFILE_CACHE[path] = (mtime, profile)
+    return profile
+
+def evaluate_profiles(analyses, contra_flags_list, profiles):
+    """Score and pattern-check a batch of analyses under several profiles in one pass
+
+    Factor scores and pattern features are extracted once; all profiles are then
+    applied together as a (4, P) weight matrix and per-profile threshold arrays.
+    Returns {profile name: {"bsi_scores", "repath_required", "patterns", "pattern_masks"}},
+    so profile names must be unique.
+    """
+    analyses = list(analyses)
+    profiles = list(profiles)
+    seen = {}
+    for profile in profiles:
+        if profile.name in seen:
+            raise ValueError(
+                f"duplicate weight profile name {profile.name!r}"
+                f" ({seen[profile.name].source or 'built-in'} and {profile.source or 'built-in'})"
+            )
+        seen[profile.name] = profile
+
+    scores = weighted_factor_sum(load_factor_matrix(analyses), np.column_stack([profile.weights for profile in profiles]))
+    thresholds = {key: np.array([profile.thresholds[key] for profile in profiles]) for key in DEFAULT_THRESHOLDS}
+    patterns = patterns_from_features(extract_pattern_features(analyses, contra_flags_list), thresholds)
+    repath_required = scores < thresholds["low_bsi"]
+
+    return {
+        profile.name: {
+            "bsi_scores": scores[:, column],
+            "repath_required": repath_required[:, column],
+            "patterns": patterns[:, column, :],
+            "pattern_masks": pattern_masks(patterns[:, column, :]),
+        }
+        for column, profile in enumerate(profiles)
+    }
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+
+    profiles = [DEFAULT_PROFILE] + [load_weight_profile(path) for path in sys.argv[1:]]
+
+    test_analysis = {
+        "intuitive_weighting": {
+            "strength_factors": {
+                "symbolic_alignment": {"score": 6.5},
+                "belief_intensity": {"score": 7.2},
+                "sentiment_intensity": {"score": 6.8},
+                "narrative_breathability": {"score": 5.9}
+            }
+        },
+        "in_game_cascade": {
+            "cascade_levels": [{"completion": 75}, {"completion": 45}, {"completion": 60}, {"completion": 30}]
+        }
+    }
+
+    results = evaluate_profiles([test_analysis], [["Power assessment contradiction"]], profiles)
+    for name, result in results.items():
+        print(f"⚖️  {name}: BSI {result['bsi_scores'][0]:.2f}, re-path {bool(result['repath_required'][0])}, patterns mask {result['pattern_masks'][0]}")
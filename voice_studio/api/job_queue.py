@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Synthesis job queue - priority queue drained by a bounded set of threads, one per TTS worker
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+MAX_QUEUED = int(os.getenv("VOICE_STUDIO_MAX_QUEUED", "100"))
+CLIENT_LIMIT = int(os.getenv("VOICE_STUDIO_CLIENT_LIMIT", "3"))  # queued + running jobs per client
+JOB_TTL = 3600  # finished jobs stay queryable this long
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+class QueueFullError(RuntimeError):
+    """The queue or the client's concurrency allowance is exhausted"""
+
+class Job:
+    def __init__(self, params: dict, client: str, priority: int):
+        self.id = uuid.uuid4().hex
+        self.seq = 0  # submission order, set by the queue
+        self.params = params
+        self.client = client
+        self.priority = priority
+        self.status = QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.future = Future()  # resolves to the job itself once it is finished
+
+    def to_dict(self, position: Optional[int] = None, estimate: Optional[float] = None) -> dict:
+        if self.status == RUNNING and estimate:
+            progress = min(0.95, (time.time() - self.started) / estimate)
+        else:
+            progress = 1.0 if self.status in FINISHED else 0.0
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "position": position,
+            "progress": round(progress, 2),
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "result": self.result,
+            "error": self.error,
+        }
+
+class JobQueue:
+    """
+    Jobs run highest priority first (FIFO within a priority) on `workers` threads.
+
+    A cancelled queued job is dropped when it reaches the front; a cancelled running
+    job finishes on its worker but its result is discarded, and it keeps counting
+    against its client's limit until then. stop() cancels whatever is still queued. Progress of a running
+    job is estimated from the seconds-per-character of recently finished jobs.
+    """
+
+    def __init__(self, runner: Callable[[dict], dict], workers: int, max_queued: int = MAX_QUEUED,
+                 client_limit: int = CLIENT_LIMIT, discard: Optional[Callable[[dict], None]] = None):
+        self.runner = runner
+        self.discard = discard  # cleans up the result of a job cancelled mid-run
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.client_limit = client_limit
+        self.jobs = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._queued = 0
+        self._active_by_client = {}
+        self._seconds_per_char = None
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopping = False
+
+    def start(self):
+        with self._cond:
+            self._stopping = False
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._drain, name=f"synthesis-job-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        """Cancel everything still queued, then wait for the running jobs to finish"""
+        with self._cond:
+            self._stopping = True
+            for _, _, job in self._heap:
+                if job.status == QUEUED:
+                    self._finish(job, CANCELLED, error="server shutting down")
+            self._heap = []
+            self._queued = 0
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    # --- Submission ---------------------------------------------------------
+
+    def submit(self, params: dict, client: str = "anonymous", priority: int = 0) -> Job:
+        """Queue a job (higher priority runs sooner); raises QueueFullError when over a limit"""
+        with self._cond:
+            self._prune()
+            if self._queued >= self.max_queued:
+                raise QueueFullError(f"queue is full ({self.max_queued} jobs waiting)")
+            if self._active_by_client.get(client, 0) >= self.client_limit:
+                raise QueueFullError(f"client {client} already has {self.client_limit} jobs queued or running")
+            job = Job(params, client, priority)
+            job.seq = next(self._seq)
+            self.jobs[job.id] = job
+            heapq.heappush(self._heap, (-priority, job.seq, job))
+            self._queued += 1
+            self._active_by_client[client] = self._active_by_client.get(client, 0) + 1
+            self._cond.notify()
+            return job
+
+    def record(self, params: dict, result: dict, client: str = "anonymous") -> Job:
+        """Register a job that is already done (e.g. served from the result cache) so it can be polled"""
+        with self._cond:
+            self._prune()
+            job = Job(params, client, 0)
+            job.status = DONE
+            job.started = job.finished = job.created
+            job.result = result
+            job.future.set_result(job)
+            self.jobs[job.id] = job
+            return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; finished jobs are left as they are"""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            if job.status == QUEUED:
+                self._queued -= 1
+                self._finish(job, CANCELLED, error="cancelled by client")
+            else:
+                # Still busy on a worker: the client's slot is released when the run actually ends
+                self._finish(job, CANCELLED, error="cancelled by client", release=False)
+            return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            position = None
+            if job.status == QUEUED:
+                key = (-job.priority, job.seq)
+                position = 1 + sum(1 for priority, seq, other in self._heap if other.status == QUEUED and (priority, seq) < key)
+            estimate = None
+            if job.status == RUNNING and self._seconds_per_char:
+                estimate = self._seconds_per_char * max(len(job.params.get("text", "")), 1)
+            return job.to_dict(position, estimate)
+
+    def status(self) -> dict:
+        with self._cond:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {"workers": self.workers, "max_queued": self.max_queued, "client_limit": self.client_limit, **counts}
+
+    # --- Execution ----------------------------------------------------------
+
+    def _finish(self, job: Job, status: str, result: Optional[dict] = None, error: Optional[str] = None,
+                release: bool = True):
+        # Caller holds the lock
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished = time.time()
+        if release:
+            self._release(job.client)
+        job.future.set_result(job)
+
+    def _release(self, client: str):
+        # Caller holds the lock
+        remaining = self._active_by_client.get(client, 1) - 1
+        if remaining:
+            self._active_by_client[client] = remaining
+        else:
+            self._active_by_client.pop(client, None)
+
+    def _prune(self):
+        cutoff = time.time() - JOB_TTL
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished and job.finished < cutoff]:
+            del self.jobs[job_id]
+
+    def _drain(self):
+        while True:
+            with self._cond:
+                while not self._stopping and not self._heap:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                if job.status != QUEUED:
+                    continue  # cancelled while waiting
+                self._queued -= 1
+                job.status = RUNNING
+                job.started = time.time()
+
+            try:
+                result, error = self.runner(job.params), None
+            except Exception as e:
+                result, error = None, str(e) or type(e).__name__
+
+            with self._cond:
+                if job.status == CANCELLED:
+                    self._release(job.client)
+                    if result is not None and self.discard:
+                        self.discard(result)
+                    continue
+                if error is None:
+                    seconds = (time.time() - job.started) / max(len(job.params.get("text", "")), 1)
+                    self._seconds_per_char = seconds if self._seconds_per_char is None else (
+                        0.8 * self._seconds_per_char + 0.2 * seconds
+                    )
+                    self._finish(job, DONE, result=result)
+                else:
+                    self._finish(job, FAILED, error=error)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Synthesis result cache - content-addressed WAVs on disk with a SQLite LRU index
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import wave
+from typing import Optional
+
+CACHE_DIR = os.path.expanduser(os.getenv("VOICE_STUDIO_CACHE_DIR", "~/.voice_studio/synthesis_cache"))
+CACHE_MAX_BYTES = int(os.getenv("VOICE_STUDIO_CACHE_MAX_MB", "2048")) * 1024 * 1024
+MODEL_VERSION = os.getenv("VOICE_STUDIO_MODEL_VERSION", "chatterbox-tts")
+
+def wav_is_complete(path: str) -> bool:
+    """True when path is a readable WAV whose data chunk holds every frame its header promises"""
+    try:
+        with open(path, "rb") as f, wave.open(f) as w:
+            # wave stops parsing right after the data chunk header, so this is where the frames start
+            data_start = f.tell()
+            expected = w.getnframes() * w.getnchannels() * w.getsampwidth()
+            return expected > 0 and data_start + expected <= os.fstat(f.fileno()).st_size
+    except (OSError, EOFError, wave.Error):
+        return False
+
+class SynthesisCache:
+    """
+    WAVs stored under objects/<k[:2]>/<key>.wav, where the key hashes text, voice
+    file content, preset settings and model version. Least recently used entries
+    are evicted once the stored bytes pass max_bytes. Empty or truncated WAVs are
+    refused on the way in and dropped on the way out.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self._voice_hashes = {}  # path -> (mtime_ns, size, sha256)
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " bytes INTEGER NOT NULL,"
+            " duration REAL,"
+            " hits INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._db.commit()
+
+    def voice_hash(self, voice_path: str) -> str:
+        """sha256 of the reference audio, re-hashed only when the file's mtime or size changes"""
+        stat = os.stat(voice_path)
+        cached = self._voice_hashes.get(voice_path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(voice_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self._voice_hashes[voice_path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+        return digest.hexdigest()
+
+    def make_key(self, text: str, voice_path: str, settings: dict, model_version: str = MODEL_VERSION) -> str:
+        """Hash of everything that determines the generated audio"""
+        digest = hashlib.sha256()
+        for part in (text.strip(), self.voice_hash(voice_path), json.dumps(settings, sort_keys=True), model_version):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.directory, "objects", key[:2], f"{key}.wav")
+
+    def get(self, key: str, output_path: str) -> Optional[dict]:
+        """Materialize a cached WAV at output_path; returns {"duration", "bytes"} or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT bytes, duration FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                # A copy, not a link, so editing the output can't corrupt the cache
+                tmp_path = f"{output_path}.{threading.get_ident()}.tmp"
+                try:
+                    shutil.copyfile(self._object_path(key), tmp_path)
+                    complete = wav_is_complete(tmp_path)
+                except FileNotFoundError:
+                    complete = False
+                if complete:
+                    os.replace(tmp_path, output_path)
+                else:
+                    # Object removed or damaged behind our back; forget the entry
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    self._forget(key)
+                    row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE results SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            self.bytes_saved += row[0]
+            return {"bytes": row[0], "duration": row[1]}
+
+    def _forget(self, key: str):
+        # Caller holds the lock
+        self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+        self._db.commit()
+        try:
+            os.remove(self._object_path(key))
+        except OSError:
+            pass
+
+    def put(self, key: str, wav_path: str, duration: Optional[float] = None) -> bool:
+        """
+        Store a generated WAV, evicting least recently used entries past max_bytes.
+        wav_path must be a file the caller owns and has finished writing; returns False
+        (and stores nothing) when the copy is not a complete WAV.
+        """
+        now = time.time()
+        object_path = self._object_path(key)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        tmp_path = f"{object_path}.{threading.get_ident()}.tmp"
+        shutil.copyfile(wav_path, tmp_path)
+        if not wav_is_complete(tmp_path):
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, object_path)
+        size = os.path.getsize(object_path)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, bytes, duration, hits, created_at, last_used)"
+                " VALUES (?, ?, ?, 0, ?, ?)",
+                (key, size, duration, now, now),
+            )
+            total = self._db.execute("SELECT COALESCE(SUM(bytes), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                evicted = []
+                for old_key, old_bytes in self._db.execute(
+                    "SELECT key, bytes FROM results WHERE key != ? ORDER BY last_used ASC", (key,)
+                ):
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append(old_key)
+                    total -= old_bytes
+                self._db.executemany("DELETE FROM results WHERE key = ?", [(k,) for k in evicted])
+                for old_key in evicted:
+                    try:
+                        os.remove(self._object_path(old_key))
+                    except OSError:
+                        pass
+                self.evictions += len(evicted)
+            self._db.commit()
+        return True
+
+    def stats(self) -> dict:
+        """Hit rate and bytes saved for this process, plus lifetime totals from the index"""
+        with self._lock:
+            entries, total_bytes, lifetime_hits, lifetime_saved = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0), COALESCE(SUM(hits), 0), COALESCE(SUM(hits * bytes), 0)"
+                " FROM results"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+            "entries": entries,
+            "total_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "lifetime_hits": lifetime_hits,
+            "lifetime_bytes_saved": lifetime_saved,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
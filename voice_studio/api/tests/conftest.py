@@ -0,0 +1,52 @@
+"""
+Shared fixtures for the voice API tests - everything runs on FakeTTS, no torch or model download
+"""
+
+import importlib
+import os
+import sys
+import wave
+
+import pytest
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The API modules import each other as top-level modules (uvicorn runs from this directory)
+sys.path.insert(0, API_DIR)
+
+@pytest.fixture
+def voice_dir(tmp_path):
+    """A chatterbox directory holding one tiny reference clip, mel.MP3"""
+    directory = tmp_path / "chatterbox"
+    directory.mkdir()
+    with wave.open(str(directory / "mel.MP3"), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(8000)
+        f.writeframes(b"\0\0" * 800)
+    return directory
+
+@pytest.fixture
+def api(monkeypatch, tmp_path, voice_dir):
+    """working_app with two fake workers, imported fresh against temp directories"""
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    monkeypatch.setenv("VOICE_STUDIO_FAKE_MODEL", "1")
+    monkeypatch.setenv("VOICE_STUDIO_FAKE_DELAY", "0.3")
+    monkeypatch.setenv("VOICE_STUDIO_WORKERS", "2")
+    monkeypatch.setenv("VOICE_STUDIO_OUTPUT_DIR", str(output_dir))
+    monkeypatch.setenv("VOICE_STUDIO_CHATTERBOX_DIR", str(voice_dir))
+    monkeypatch.setenv("VOICE_STUDIO_CACHE_DIR", str(tmp_path / "cache"))
+    modules = ("tts_worker", "job_queue", "synthesis_cache", "working_app")
+    saved = {name: sys.modules.pop(name, None) for name in modules}
+    try:
+        working_app = importlib.import_module("working_app")
+        from fastapi.testclient import TestClient
+
+        with TestClient(working_app.app) as client:
+            yield client, output_dir
+    finally:
+        for name, module in saved.items():
+            if module is not None:
+                sys.modules[name] = module
@@ -0,0 +1,156 @@
+"""
+JobQueue: priority order, cancellation, per-client limits and shutdown
+"""
+
+import threading
+
+import pytest
+
+from job_queue import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobQueue, QueueFullError
+
+TIMEOUT = 5
+
+class GatedRunner:
+    """Job runner that blocks every job until release() and records the run order"""
+
+    def __init__(self):
+        self.order = []
+        self.started = threading.Semaphore(0)
+        self._gate = threading.Event()
+
+    def __call__(self, params):
+        self.order.append(params["text"])
+        self.started.release()
+        self._gate.wait(TIMEOUT)
+        if params.get("fail"):
+            raise RuntimeError("generation failed")
+        return {"output_file": f"{params['text']}.wav"}
+
+    def wait_started(self):
+        assert self.started.acquire(timeout=TIMEOUT)
+
+    def release(self):
+        self._gate.set()
+
+@pytest.fixture
+def runner():
+    return GatedRunner()
+
+@pytest.fixture
+def make_queue(runner):
+    queues = []
+
+    def make(**kwargs):
+        queue = JobQueue(runner, **{"workers": 1, **kwargs})
+        queue.start()
+        queues.append(queue)
+        return queue
+
+    yield make
+    runner.release()
+    for queue in queues:
+        queue.stop()
+
+def wait(job):
+    return job.future.result(TIMEOUT)
+
+def test_higher_priority_runs_first_and_fifo_within_priority(runner, make_queue):
+    queue = make_queue()
+    first = queue.submit({"text": "blocker"}, client="a")
+    runner.wait_started()
+    jobs = [
+        queue.submit({"text": "low"}, client="b", priority=0),
+        queue.submit({"text": "high-1"}, client="c", priority=5),
+        queue.submit({"text": "high-2"}, client="d", priority=5),
+    ]
+
+    assert [queue.get(job.id)["position"] for job in jobs] == [3, 1, 2]
+    runner.release()
+    for job in [first] + jobs:
+        assert wait(job).status == DONE
+    assert runner.order == ["blocker", "high-1", "high-2", "low"]
+
+def test_failed_job_reports_error(runner, make_queue):
+    queue = make_queue()
+    job = queue.submit({"text": "bad", "fail": True})
+    runner.release()
+
+    assert wait(job).status == FAILED
+    assert queue.get(job.id)["error"] == "generation failed"
+
+def test_cancel_queued_job_never_runs(runner, make_queue):
+    queue = make_queue()
+    queue.submit({"text": "blocker"}, client="a")
+    runner.wait_started()
+    job = queue.submit({"text": "doomed"}, client="b")
+
+    queue.cancel(job.id)
+    assert wait(job).status == CANCELLED
+    runner.release()
+    queue.stop()
+    assert "doomed" not in runner.order
+
+def test_cancel_running_job_discards_result(runner):
+    discarded = []
+    queue = JobQueue(runner, workers=1, discard=discarded.append)
+    queue.start()
+    try:
+        job = queue.submit({"text": "running"})
+        runner.wait_started()
+        assert queue.get(job.id)["status"] == RUNNING
+
+        queue.cancel(job.id)
+        assert wait(job).status == CANCELLED  # resolves right away, not when the run ends
+        runner.release()
+    finally:
+        queue.stop()
+    assert discarded == [{"output_file": "running.wav"}]
+    assert job.status == CANCELLED
+
+def test_client_limit(runner, make_queue):
+    queue = make_queue(client_limit=2)
+    queue.submit({"text": "one"}, client="greedy")
+    queue.submit({"text": "two"}, client="greedy")
+
+    with pytest.raises(QueueFullError):
+        queue.submit({"text": "three"}, client="greedy")
+    assert queue.submit({"text": "other"}, client="polite").status == QUEUED
+
+def test_cancelled_running_job_holds_client_slot_until_it_ends(runner, make_queue):
+    queue = make_queue(workers=2, client_limit=1)
+    job = queue.submit({"text": "busy"}, client="c")
+    runner.wait_started()
+    queue.cancel(job.id)
+
+    # The worker is still generating, so cancel-and-resubmit must not get past the limit
+    with pytest.raises(QueueFullError):
+        queue.submit({"text": "again"}, client="c")
+
+    runner.release()
+    queue.stop()
+    queue.start()
+    assert wait(queue.submit({"text": "again"}, client="c")).status == DONE
+
+def test_queue_full(runner, make_queue):
+    queue = make_queue(max_queued=1)
+    queue.submit({"text": "blocker"}, client="a")
+    runner.wait_started()
+    queue.submit({"text": "waiting"}, client="b")
+
+    with pytest.raises(QueueFullError):
+        queue.submit({"text": "overflow"}, client="c")
+
+def test_stop_cancels_queued_jobs(runner, make_queue):
+    queue = make_queue()
+    running = queue.submit({"text": "running"}, client="a")
+    runner.wait_started()
+    waiting = queue.submit({"text": "waiting"}, client="b")
+
+    stopper = threading.Thread(target=queue.stop)
+    stopper.start()
+    # Waiters on queued jobs are released before the running job finishes
+    assert wait(waiting).status == CANCELLED
+    runner.release()
+    stopper.join(TIMEOUT)
+    assert wait(running).status == DONE
+    assert "waiting" not in runner.order
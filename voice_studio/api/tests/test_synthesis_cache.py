@@ -0,0 +1,124 @@
+"""
+SynthesisCache hits, eviction and damaged entries, plus concurrent jobs through the API
+"""
+
+import os
+import threading
+import wave
+
+import pytest
+
+from synthesis_cache import SynthesisCache, wav_is_complete
+
+SETTINGS = {"exaggeration": 0.5, "cfg_weight": 0.5, "temperature": 0.8}
+
+def write_wav(path, seconds, sample_rate=8000):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b"\1\0" * int(seconds * sample_rate))
+    return str(path)
+
+def duration(path):
+    with wave.open(str(path)) as f:
+        return f.getnframes() / f.getframerate()
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SynthesisCache(str(tmp_path / "cache"))
+    yield cache
+    cache.close()
+
+def test_miss_then_hit(cache, voice_dir, tmp_path):
+    key = cache.make_key("hello", str(voice_dir / "mel.MP3"), SETTINGS)
+    assert cache.get(key, str(tmp_path / "out.wav")) is None
+
+    assert cache.put(key, write_wav(tmp_path / "gen.wav", 0.5), 0.5)
+    hit = cache.get(key, str(tmp_path / "out.wav"))
+
+    assert hit == {"bytes": os.path.getsize(tmp_path / "gen.wav"), "duration": 0.5}
+    assert duration(tmp_path / "out.wav") == 0.5
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["bytes_saved"] == hit["bytes"]
+
+def test_key_follows_text_settings_and_voice_content(cache, voice_dir):
+    voice = str(voice_dir / "mel.MP3")
+    key = cache.make_key("hello", voice, SETTINGS)
+
+    assert cache.make_key("  hello ", voice, SETTINGS) == key
+    assert cache.make_key("hello!", voice, SETTINGS) != key
+    assert cache.make_key("hello", voice, {**SETTINGS, "temperature": 1.0}) != key
+    assert cache.make_key("hello", voice, SETTINGS, model_version="other") != key
+
+    write_wav(voice, 0.2)
+    os.utime(voice, ns=(0, 1))  # a re-recorded clip: new content and mtime
+    assert cache.make_key("hello", voice, SETTINGS) != key
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    entry_bytes = os.path.getsize(write_wav(tmp_path / "gen.wav", 0.5))
+    cache = SynthesisCache(str(tmp_path / "cache"), max_bytes=2 * entry_bytes)
+    try:
+        cache.put("a" * 64, str(tmp_path / "gen.wav"))
+        cache.put("b" * 64, str(tmp_path / "gen.wav"))
+        assert cache.get("a" * 64, str(tmp_path / "out.wav"))  # b is now least recently used
+        cache.put("c" * 64, str(tmp_path / "gen.wav"))
+
+        assert cache.get("b" * 64, str(tmp_path / "out.wav")) is None
+        assert cache.get("a" * 64, str(tmp_path / "out.wav"))
+        assert cache.get("c" * 64, str(tmp_path / "out.wav"))
+        assert cache.stats()["evictions"] == 1
+        assert not os.path.exists(cache._object_path("b" * 64))
+    finally:
+        cache.close()
+
+def test_put_refuses_empty_and_truncated_wavs(cache, tmp_path):
+    empty = tmp_path / "empty.wav"
+    empty.write_bytes(b"")
+    truncated = tmp_path / "truncated.wav"
+    truncated.write_bytes(open(write_wav(tmp_path / "gen.wav", 0.5), "rb").read()[:2000])
+
+    assert not wav_is_complete(str(empty))
+    assert not wav_is_complete(str(truncated))
+    assert not cache.put("a" * 64, str(empty))
+    assert not cache.put("b" * 64, str(truncated))
+    assert cache.stats()["entries"] == 0
+
+def test_damaged_object_is_dropped_not_served(cache, tmp_path):
+    key = "d" * 64
+    cache.put(key, write_wav(tmp_path / "gen.wav", 0.5))
+    with open(cache._object_path(key), "r+b") as f:
+        f.truncate(100)
+
+    assert cache.get(key, str(tmp_path / "out.wav")) is None
+    assert not os.path.exists(tmp_path / "out.wav")
+    assert cache.stats()["entries"] == 0
+
+def test_concurrent_jobs_get_their_own_files_and_cache_entries(api):
+    client, output_dir = api
+    texts = ["short one", "a much longer piece of text for the other worker to say"]
+    results = {}
+
+    def synthesize(text):
+        results[text] = client.post("/v1/synthesize", json={"text": text, "voice_file": "mel.MP3"}).json()
+
+    threads = [threading.Thread(target=synthesize, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results[texts[0]]["output_file"] != results[texts[1]]["output_file"]
+    for text in texts:
+        assert not results[text]["cached"]
+        assert duration(output_dir / results[text]["output_file"]) == pytest.approx(results[text]["duration"])
+    # Nothing left behind from the workers' private temp files
+    assert sorted(os.listdir(output_dir)) == sorted(result["output_file"] for result in results.values())
+
+    for text in texts:
+        cached = client.post("/v1/synthesize", json={"text": text, "voice_file": "mel.MP3"}).json()
+        assert cached["cached"]
+        assert cached["output_file"] != results[text]["output_file"]
+        assert duration(output_dir / cached["output_file"]) == pytest.approx(results[text]["duration"])
+    assert client.get("/v1/cache/stats").json()["hits"] == 2
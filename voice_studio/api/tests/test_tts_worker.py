@@ -0,0 +1,101 @@
+"""
+TTSWorkerPool with the fake model: warm workers, and replacement after a crash or hang
+"""
+
+import os
+import wave
+
+import pytest
+
+import tts_worker
+from tts_worker import STYLE_PRESETS, TTSWorkerPool, WorkerError, WorkerLoadTimeout
+
+SETTINGS = STYLE_PRESETS["normal"]["settings"]
+
+@pytest.fixture
+def pool(voice_dir):
+    pool = TTSWorkerPool(size=1, fake=True, chatterbox_dir=str(voice_dir))
+    pool.start()
+    yield pool
+    pool.stop()
+
+def synthesize(pool, voice_dir, output_path, text="hello there", **kwargs):
+    return pool.synthesize(text, str(voice_dir / "mel.MP3"), SETTINGS, str(output_path), **kwargs)
+
+def test_synthesize_writes_wav_of_reported_duration(pool, voice_dir, tmp_path):
+    result = synthesize(pool, voice_dir, tmp_path / "out.wav")
+
+    with wave.open(str(tmp_path / "out.wav")) as f:
+        assert f.getnframes() / f.getframerate() == pytest.approx(result["duration"])
+    assert result["output_path"] == str(tmp_path / "out.wav")
+    assert pool.status()["ready"] == 1
+    assert pool.status()["devices"] == ["fake"]
+
+def test_worker_stays_warm_between_jobs(pool, voice_dir, tmp_path):
+    synthesize(pool, voice_dir, tmp_path / "a.wav")
+    process = pool._workers[0].process
+    synthesize(pool, voice_dir, tmp_path / "b.wav")
+
+    assert pool._workers[0].process is process
+    assert process.poll() is None
+
+def test_generation_error_keeps_worker(pool, voice_dir, tmp_path):
+    synthesize(pool, voice_dir, tmp_path / "a.wav")
+    process = pool._workers[0].process
+
+    with pytest.raises(WorkerError):
+        synthesize(pool, voice_dir, tmp_path / "missing" / "out.wav")
+
+    assert pool._workers[0].process is process
+    synthesize(pool, voice_dir, tmp_path / "b.wav")
+
+def test_crashed_worker_is_replaced(pool, voice_dir, tmp_path):
+    synthesize(pool, voice_dir, tmp_path / "a.wav")
+    crashed = pool._workers[0].process
+    crashed.kill()
+    crashed.wait()
+
+    with pytest.raises(WorkerError):
+        synthesize(pool, voice_dir, tmp_path / "b.wav")
+
+    assert pool._workers[0].process is not crashed
+    synthesize(pool, voice_dir, tmp_path / "c.wav")
+    assert pool.status()["workers"] == 1
+    assert pool.status()["idle"] == 1
+
+def test_hung_worker_is_replaced(monkeypatch, voice_dir, tmp_path):
+    # Worker processes read the simulated generation time from the environment
+    monkeypatch.setenv("VOICE_STUDIO_FAKE_DELAY", "2")
+    pool = TTSWorkerPool(size=1, fake=True, chatterbox_dir=str(voice_dir))
+    pool.start()
+    try:
+        pool._workers[0].wait_ready(30)
+        hung = pool._workers[0].process
+
+        with pytest.raises(TimeoutError):
+            synthesize(pool, voice_dir, tmp_path / "a.wav", timeout=0.2)
+
+        assert hung.poll() is not None  # killed, not left generating
+        assert pool._workers[0].process is not hung
+        assert synthesize(pool, voice_dir, tmp_path / "b.wav", timeout=30)["duration"] > 0
+    finally:
+        pool.stop()
+
+def test_model_that_never_loads_is_a_load_timeout(monkeypatch, voice_dir, tmp_path):
+    # A "python" that never sends the ready message, and exits once it is sent anything
+    silent = tmp_path / "silent_python"
+    silent.write_text("#!/bin/sh\nhead -c 1 > /dev/null\n")
+    os.chmod(silent, 0o755)
+    monkeypatch.setattr(tts_worker, "LOAD_TIMEOUT", 0.2)
+    pool = TTSWorkerPool(size=1, fake=True, python=str(silent), chatterbox_dir=str(voice_dir))
+    pool.start()
+    try:
+        stuck = pool._workers[0].process
+
+        with pytest.raises(WorkerLoadTimeout, match="did not finish loading"):
+            synthesize(pool, voice_dir, tmp_path / "a.wav", timeout=30)
+
+        assert stuck.poll() is not None
+        assert pool._workers[0].process is not stuck
+    finally:
+        pool.stop()
@@ -0,0 +1,67 @@
+"""
+working_app endpoints: cache lookups off the event loop and how job outcomes map to HTTP statuses
+"""
+
+import asyncio
+import sys
+import threading
+import time
+
+def test_cache_lookup_runs_off_the_event_loop(api, monkeypatch):
+    client, _ = api
+    working_app = sys.modules["working_app"]
+    lookup = working_app.cached_voice
+    loops = []
+
+    def recording_lookup(*args):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return lookup(*args)
+
+    monkeypatch.setattr(working_app, "cached_voice", recording_lookup)
+    request = {"text": "off the loop", "voice_file": "mel.MP3"}
+    assert client.post("/v1/synthesize", json=request).status_code == 200
+    assert client.post("/v1/jobs", json=request).status_code == 202
+    assert loops == [None, None]
+
+def test_cancelled_synthesis_is_a_conflict_not_a_server_error(api):
+    client, _ = api
+    jobs = sys.modules["working_app"].synthesis_jobs
+    responses = []
+    request = threading.Thread(target=lambda: responses.append(
+        client.post("/v1/synthesize", json={"text": "cancel me", "voice_file": "mel.MP3"})
+    ))
+    request.start()
+
+    deadline = time.monotonic() + 5
+    while not jobs.jobs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    (job_id,) = jobs.jobs
+    assert client.delete(f"/v1/jobs/{job_id}").status_code == 200
+    request.join()
+
+    assert responses[0].status_code == 409
+    assert responses[0].json()["detail"] == "Voice cloning cancelled: cancelled by client"
+
+def test_failed_synthesis_is_a_server_error(api):
+    client, _ = api
+    response = client.post("/v1/synthesize", json={"text": "hello", "voice_file": "missing.wav"})
+
+    assert response.status_code == 500
+    assert "Voice file not found: missing.wav" in response.json()["detail"]
+
+def test_load_timeout_is_not_reported_as_a_job_timeout(api, monkeypatch):
+    client, _ = api
+    working_app = sys.modules["working_app"]
+
+    def never_loads(**kwargs):
+        raise working_app.WorkerLoadTimeout("TTS model did not finish loading within 600s")
+
+    monkeypatch.setattr(working_app.tts_pool, "synthesize", never_loads)
+    response = client.post("/v1/synthesize", json={"text": "still loading", "voice_file": "mel.MP3"})
+
+    assert response.status_code == 500
+    assert "did not finish loading (10 minutes)" in response.json()["detail"]
+    assert "timed out (5 minutes)" not in response.json()["detail"]
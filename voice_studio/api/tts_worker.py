@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Warm TTS workers - load ChatterboxTTS once per process and take synthesis jobs over a pipe
+"""
+
+import math
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import wave
+from multiprocessing.connection import Connection
+from typing import Optional
+
+CONDA_PYTHON = os.getenv("VOICE_STUDIO_PYTHON", "/Users/steve/miniconda3/envs/chatterbox/bin/python")
+CHATTERBOX_DIR = os.getenv("VOICE_STUDIO_CHATTERBOX_DIR", "/Users/steve/chatterbox")
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+OUTPUT_DIR = os.path.expanduser(os.getenv("VOICE_STUDIO_OUTPUT_DIR", "~/Desktop"))
+WORKER_COUNT = int(os.getenv("VOICE_STUDIO_WORKERS", "1"))
+# Set to 1 to run workers with FakeTTS in this interpreter (no torch, no model download)
+FAKE_MODEL = os.getenv("VOICE_STUDIO_FAKE_MODEL", "") not in ("", "0", "false")
+FAKE_DELAY = float(os.getenv("VOICE_STUDIO_FAKE_DELAY", "0"))  # simulated generation seconds
+
+LOAD_TIMEOUT = 600  # first model load may download weights
+JOB_TIMEOUT = 300
+
+# Same presets as voice_cloner_any.py; `label` is the style part of the output filename
+STYLE_PRESETS = {
+    "sassy": {"label": "sassy", "settings": {"exaggeration": 0.9, "cfg_weight": 0.4, "temperature": 1.1, "repetition_penalty": 1.4}},
+    "roast": {"label": "roast_mode", "settings": {"exaggeration": 1.1, "cfg_weight": 0.35, "temperature": 1.2, "repetition_penalty": 1.3}},
+    "energetic": {"label": "energetic", "settings": {"exaggeration": 0.8, "cfg_weight": 0.7, "temperature": 0.9}},
+    "dramatic": {"label": "dramatic", "settings": {"exaggeration": 1.2, "cfg_weight": 0.3, "temperature": 1.0}},
+    "normal": {"label": "normal", "settings": {"exaggeration": 0.5, "cfg_weight": 0.5, "temperature": 0.8}},
+    "natural": {"label": "natural", "settings": {"exaggeration": 0.4, "cfg_weight": 0.6, "temperature": 0.7}},
+}
+DEFAULT_STYLE = "normal"
+
+class WorkerError(RuntimeError):
+    """A worker failed to load the model or to synthesize a job"""
+
+class WorkerLoadTimeout(TimeoutError):
+    """A worker did not finish loading the model within LOAD_TIMEOUT (as opposed to a job timing out)"""
+
+class FakeTTS:
+    """Stand-in for ChatterboxTTS: instant load, a short tone whose length follows the text"""
+
+    sr = 24000
+
+    def generate(self, text, audio_prompt_path=None, **settings):
+        time.sleep(FAKE_DELAY)
+        seconds = min(0.05 * len(text.split()) + 0.2, 30.0)
+        return [0.2 * math.sin(2 * math.pi * 220 * i / self.sr) for i in range(int(seconds * self.sr))]
+
+def load_model(fake: bool = False):
+    """Load the TTS model on the best available device (returns the model and device name)"""
+    if fake:
+        return FakeTTS(), "fake"
+
+    import torch
+    from chatterbox.tts import ChatterboxTTS
+
+    if torch.cuda.is_available():
+        device = "cuda"
+    elif torch.backends.mps.is_available():
+        device = "mps"
+    else:
+        device = "cpu"
+    return ChatterboxTTS.from_pretrained(device=device), device
+
+def save_wav(path: str, wav, sample_rate: int) -> float:
+    """Write generated audio as 16-bit PCM (as the cloner scripts do); returns the duration in seconds"""
+    if hasattr(wav, "cpu"):  # torch tensor from ChatterboxTTS
+        import soundfile as sf
+
+        samples = wav.squeeze().cpu().numpy()
+        sf.write(path, samples, sample_rate, subtype="PCM_16")
+        return len(samples) / sample_rate
+
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(struct.pack(f"<{len(wav)}h", *(int(max(-1.0, min(1.0, s)) * 32767) for s in wav)))
+    return len(wav) / sample_rate
+
+def generate_direct(model, text, audio_prompt_path, **settings):
+    return model.generate(text, audio_prompt_path=audio_prompt_path, **settings)
+
+def worker_main(reader, writer, fake: bool, chatterbox_dir: str):
+    """Worker process loop: load once, then answer one job message at a time until None"""
+    if os.path.isdir(chatterbox_dir):
+        os.chdir(chatterbox_dir)
+    started = time.perf_counter()
+    try:
+        model, device = load_model(fake)
+    except Exception:
+        writer.send({"ok": False, "error": traceback.format_exc()})
+        return
+    if fake:
+        generate = generate_direct
+    else:
+        # Reference clip conditioning is computed once per clip and reused (scripts/speaker_cache.py)
+        sys.path.insert(0, SCRIPTS_DIR)
+        from speaker_cache import generate
+    writer.send({"ok": True, "ready": True, "device": device, "load_seconds": time.perf_counter() - started})
+
+    while True:
+        try:
+            job = reader.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        started = time.perf_counter()
+        try:
+            wav = generate(model, job["text"], job["voice_path"], **job["settings"])
+            duration = save_wav(job["output_path"], wav, model.sr)
+            writer.send({"ok": True, "output_path": job["output_path"], "duration": duration,
+                         "seconds": time.perf_counter() - started})
+        except Exception:
+            writer.send({"ok": False, "error": traceback.format_exc()})
+
+class _Worker:
+    """
+    One worker process, talking length-prefixed pickled messages over its stdin/stdout
+    (multiprocessing.connection framing) instead of answering interactive prompts.
+    """
+
+    def __init__(self, python: str, fake: bool, chatterbox_dir: str):
+        args = [python, os.path.abspath(__file__), "--worker", chatterbox_dir] + (["--fake"] if fake else [])
+        self.process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.writer = Connection(os.dup(self.process.stdin.fileno()), readable=False)
+        self.reader = Connection(os.dup(self.process.stdout.fileno()), writable=False)
+        self.process.stdin.close()
+        self.process.stdout.close()
+        self.info = None  # the ready message once the model is loaded
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def wait_ready(self, timeout: float):
+        if self.info is None:
+            try:
+                self.info = self.request(None, timeout, send=False)
+            except TimeoutError:
+                raise WorkerLoadTimeout(f"TTS model did not finish loading within {timeout:.0f}s") from None
+        return self.info
+
+    def request(self, job, timeout: float, send: bool = True):
+        try:
+            if send:
+                self.writer.send(job)
+            if not self.reader.poll(timeout):
+                raise TimeoutError(f"worker did not answer within {timeout:.0f}s")
+            reply = self.reader.recv()
+        except (EOFError, BrokenPipeError):
+            raise WorkerError(f"worker exited (code {self.process.poll()})") from None
+        if not reply["ok"]:
+            raise WorkerError(reply["error"])
+        return reply
+
+    def stop(self, timeout: float = 5):
+        try:
+            self.writer.send(None)
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.writer.close()
+        self.reader.close()
+
+class TTSWorkerPool:
+    """
+    Fixed set of warm worker processes, each holding one loaded model.
+
+    Workers run under the chatterbox conda interpreter, so the API itself doesn't
+    need torch. A job borrows an idle worker; a worker that hangs, crashes or
+    fails to load is replaced with a fresh one.
+    """
+
+    def __init__(self, size: int = WORKER_COUNT, fake: bool = FAKE_MODEL, python: Optional[str] = None,
+                 chatterbox_dir: str = CHATTERBOX_DIR):
+        self.size = max(1, size)
+        self.fake = fake
+        self.chatterbox_dir = chatterbox_dir
+        # Fake workers need nothing from the conda env, so they reuse this interpreter
+        self.python = python or (sys.executable if fake else CONDA_PYTHON)
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Spawn the workers; models load in the background while the API starts serving"""
+        with self._lock:
+            while len(self._workers) < self.size:
+                worker = _Worker(self.python, self.fake, self.chatterbox_dir)
+                self._workers.append(worker)
+                self._idle.put(worker)
+
+    def stop(self):
+        with self._lock:
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._idle = queue.Queue()
+
+    def _replace(self, worker):
+        worker.process.kill()
+        worker.stop()
+        with self._lock:
+            fresh = _Worker(self.python, self.fake, self.chatterbox_dir)
+            self._workers = [fresh if w is worker else w for w in self._workers]
+        return fresh
+
+    def synthesize(self, text: str, voice_path: str, settings: dict, output_path: str,
+                   timeout: float = JOB_TIMEOUT) -> dict:
+        """Run one job on a warm worker; returns output_path, duration and generation seconds"""
+        worker = self._idle.get()
+        try:
+            worker.wait_ready(LOAD_TIMEOUT)
+            job = {"text": text, "voice_path": voice_path, "settings": settings, "output_path": output_path}
+            return worker.request(job, timeout)
+        except (TimeoutError, WorkerError) as e:
+            # A generation error leaves the worker usable; hangs, crashes and failed loads get a fresh process
+            if isinstance(e, TimeoutError) or worker.info is None or not worker.alive():
+                worker = self._replace(worker)
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def status(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "idle": self._idle.qsize(),
+            "fake_model": self.fake,
+            "ready": sum(worker.info is not None for worker in self._workers),
+            "devices": sorted({worker.info["device"] for worker in self._workers if worker.info}),
+        }
+
+if __name__ == "__main__":
+    if "--worker" not in sys.argv:
+        sys.exit("tts_worker.py is started by the voice API (TTSWorkerPool), not run directly")
+    # Keep the message channel on the original stdout; stray prints from the model go to stderr
+    channel = os.dup(1)
+    os.dup2(2, 1)
+    worker_main(
+        Connection(os.dup(0), writable=False),
+        Connection(channel, readable=False),
+        fake="--fake" in sys.argv,
+        chatterbox_dir=sys.argv[sys.argv.index("--worker") + 1],
+    )
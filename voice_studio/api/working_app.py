@@ -3,19 +3,23 @@
 Working Voice Cloning API - Uses your working conda environment
 """
 
+import asyncio
 import os
-import sys
-import subprocess
 import tempfile
-import json
+import uuid
 from datetime import datetime
 from typing import Optional
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
+from job_queue import QueueFullError, JobQueue
+from synthesis_cache import MODEL_VERSION, SynthesisCache
+from tts_worker import (CHATTERBOX_DIR, DEFAULT_STYLE, LOAD_TIMEOUT, OUTPUT_DIR, STYLE_PRESETS, TTSWorkerPool,
+                        WorkerLoadTimeout)
+
 app = FastAPI(title="Voice Cloning API", version="1.0.0")
 
 # Add CORS middleware
@@ -27,10 +31,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+VOICE_FILES = [
+    "anisimova_segment1.mp3",
+    "anisimova_segment2.mp3",
+    "mel.MP3",
+    "mel_cloned_speech.wav",
+    "mel_sassy_converted.wav",
+    "mel_speaks_142733.wav",
+    "mel_speaks_142857.wav",
+    "mel_speaks_143053.wav",
+    "mel_speaks_144223.wav",
+    "mel_speaks_145149.wav",
+    "mel_tuned_151217_e0.9_c0.4_t1.1.wav",
+    "rhod_voice.mp3",
+    "swiatek_voice_segment1.mp3",
+    "swiatek_voice_segment2.mp3",
+    "youtube_voice.mp3"
+]
+
+# Warm model workers (loaded once at startup instead of once per request)
+tts_pool = TTSWorkerPool()
+
+# Finished WAVs keyed by (text, voice file content, preset settings, model version)
+synthesis_cache = SynthesisCache()
+CACHE_MODEL_VERSION = "fake" if tts_pool.fake else MODEL_VERSION
+
 class VoiceRequest(BaseModel):
     text: str
     voice_file: str
     style: str = "normal"
+    priority: int = 0  # higher runs sooner
 
 class VoiceResponse(BaseModel):
     success: bool
@@ -38,99 +68,89 @@ class VoiceResponse(BaseModel):
     output_file: Optional[str] = None
     duration: Optional[float] = None
     error: Optional[str] = None
+    cached: bool = False
 
-def clone_voice_working(text: str, voice_file: str, style: str = "normal") -> dict:
-    """Use your working voice_cloner_any.py script"""
-    
-    # Map style names to numbers
-    style_map = {
-        "sassy": "1",
-        "roast": "2", 
-        "energetic": "3",
-        "dramatic": "4",
-        "normal": "5",
-        "natural": "6"
-    }
-    
-    # Find voice file number
-    voice_files = [
-        "anisimova_segment1.mp3",
-        "anisimova_segment2.mp3", 
-        "mel.MP3",
-        "mel_cloned_speech.wav",
-        "mel_sassy_converted.wav",
-        "mel_speaks_142733.wav",
-        "mel_speaks_142857.wav",
-        "mel_speaks_143053.wav",
-        "mel_speaks_144223.wav",
-        "mel_speaks_145149.wav",
-        "mel_tuned_151217_e0.9_c0.4_t1.1.wav",
-        "rhod_voice.mp3",
-        "swiatek_voice_segment1.mp3",
-        "swiatek_voice_segment2.mp3",
-        "youtube_voice.mp3"
-    ]
-    
+def output_name(voice_file: str, preset: dict) -> str:
+    """
+    voice_cloner_any.py naming (cloned_<voice>_<style>_<timestamp>.wav) plus a short
+    unique suffix, since concurrent jobs for the same voice and style land in the same second
+    """
+    timestamp = datetime.now().strftime("%m%d_%H%M%S")
+    voice_name = os.path.splitext(voice_file)[0]
+    return f"cloned_{voice_name}_{preset['label']}_{timestamp}_{uuid.uuid4().hex[:8]}.wav"
+
+def private_output_path() -> str:
+    """Hidden temp WAV in OUTPUT_DIR that only the calling job writes; os.replace it into place when done"""
+    fd, path = tempfile.mkstemp(prefix=".cloning_", suffix=".wav", dir=OUTPUT_DIR)
+    os.close(fd)
+    return path
+
+def cache_key(text: str, voice_file: str, preset: dict) -> Optional[str]:
     try:
-        voice_index = voice_files.index(voice_file)
-        voice_choice = str(voice_index + 1)
-    except ValueError:
+        return synthesis_cache.make_key(text, os.path.join(CHATTERBOX_DIR, voice_file), preset["settings"],
+                                        CACHE_MODEL_VERSION)
+    except OSError:
+        return None  # missing voice file; the worker reports the real error
+
+def cached_voice(text: str, voice_file: str, style: str = "normal") -> Optional[dict]:
+    """Serve a previously generated WAV for the same text, voice and preset, or None"""
+    if voice_file not in VOICE_FILES:
+        return None
+    preset = STYLE_PRESETS.get(style.lower(), STYLE_PRESETS[DEFAULT_STYLE])
+    key = cache_key(text, voice_file, preset)
+    if key is None:
+        return None
+    output_file = output_name(voice_file, preset)
+    hit = synthesis_cache.get(key, os.path.join(OUTPUT_DIR, output_file))
+    if hit is None:
+        return None
+    return {
+        "success": True,
+        "output_file": output_file,
+        "duration": hit["duration"],
+        "message": "Voice cloned successfully (cached)",
+        "cached": True
+    }
+
+def clone_voice_working(text: str, voice_file: str, style: str = "normal") -> dict:
+    """Synthesize on a warm worker (the model is already loaded, so this is generation time only)"""
+    if voice_file not in VOICE_FILES:
         return {
             "success": False,
             "error": f"Voice file not found: {voice_file}",
             "message": "Voice cloning failed"
         }
-    
-    style_choice = style_map.get(style.lower(), "5")
-    
-    # Create input for the voice cloner
-    input_data = f"{voice_choice}\n{style_choice}\ne\n{text}\n"
-    
+
+    preset = STYLE_PRESETS.get(style.lower(), STYLE_PRESETS[DEFAULT_STYLE])
+    output_file = output_name(voice_file, preset)
+    tmp_path = None
+
     try:
-        result = subprocess.run([
-            '/Users/steve/miniconda3/envs/chatterbox/bin/python',
-            '/Users/steve/ReflexBigChex/voiceclone/voice_cloner_any.py'
-        ], input=input_data, text=True, capture_output=True, cwd='/Users/steve/chatterbox', timeout=300)
-        
-        # Parse the output to find the generated file
-        output_lines = result.stdout.split('\n')
-        for line in output_lines:
-            if 'Saved to Desktop:' in line:
-                # Extract filename from line like "✅ Saved to Desktop: cloned_anisimova_segment1_normal_1009_151310.wav"
-                filename = line.split('Saved to Desktop: ')[1].strip()
-                
-                # Extract duration from line like "⏱️  Duration: 1.0 seconds"
-                duration = None
-                for dur_line in output_lines:
-                    if 'Duration:' in dur_line:
-                        try:
-                            duration = float(dur_line.split('Duration: ')[1].split(' seconds')[0])
-                        except:
-                            pass
-                        break
-                
-                return {
-                    "success": True,
-                    "output_file": filename,
-                    "duration": duration or 1.0,
-                    "message": "Voice cloned successfully"
-                }
-        
-        # If no success message found, check for errors
-        if result.returncode != 0:
-            return {
-                "success": False,
-                "error": result.stderr or "Unknown error",
-                "message": "Voice cloning failed"
-            }
-        else:
-            return {
-                "success": False,
-                "error": "No output file found in results",
-                "message": "Voice cloning failed"
-            }
-    
-    except subprocess.TimeoutExpired:
+        tmp_path = private_output_path()
+        result = tts_pool.synthesize(
+            text=text,
+            voice_path=os.path.join(CHATTERBOX_DIR, voice_file),
+            settings=preset["settings"],
+            output_path=tmp_path,
+        )
+        # Cache from the job's own file, before the rename, so no other job can be writing it
+        key = cache_key(text, voice_file, preset)
+        if key is not None:
+            synthesis_cache.put(key, tmp_path, result["duration"])
+        os.replace(tmp_path, os.path.join(OUTPUT_DIR, output_file))
+        return {
+            "success": True,
+            "output_file": output_file,
+            "duration": result["duration"],
+            "message": "Voice cloned successfully"
+        }
+    except WorkerLoadTimeout:
+        return {
+            "success": False,
+            "error": f"TTS model did not finish loading ({LOAD_TIMEOUT // 60} minutes)",
+            "message": "Voice cloning failed"
+        }
+    except TimeoutError:
         return {
             "success": False,
             "error": "Voice cloning timed out (5 minutes)",
@@ -142,6 +162,45 @@ def clone_voice_working(text: str, voice_file: str, style: str = "normal") -> di
             "error": str(e),
             "message": "Voice cloning failed"
         }
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)  # failed or timed out before the rename
+
+def run_synthesis_job(params: dict) -> dict:
+    """Job runner: one synthesis on a warm worker, raising on failure so the job is marked failed"""
+    result = clone_voice_working(**params)
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+    return result
+
+def discard_output(result: dict):
+    """Delete the WAV of a job that was cancelled while it was generating"""
+    try:
+        os.remove(os.path.join(OUTPUT_DIR, result["output_file"]))
+    except OSError:
+        pass
+
+# One job thread per warm worker, so throughput scales with VOICE_STUDIO_WORKERS
+synthesis_jobs = JobQueue(run_synthesis_job, workers=tts_pool.size, discard=discard_output)
+
+def submit_job(request: VoiceRequest, http_request: Request):
+    client = http_request.headers.get("x-client-id") or (http_request.client.host if http_request.client else "anonymous")
+    params = {"text": request.text, "voice_file": request.voice_file, "style": request.style}
+    try:
+        return synthesis_jobs.submit(params, client=client, priority=request.priority)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+@app.on_event("startup")
+def start_workers():
+    tts_pool.start()
+    synthesis_jobs.start()
+
+@app.on_event("shutdown")
+def stop_workers():
+    synthesis_jobs.stop()
+    tts_pool.stop()
+    synthesis_cache.close()
 
 @app.get("/")
 async def root():
@@ -149,53 +208,72 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "conda_env": "/Users/steve/miniconda3/envs/chatterbox"}
+    return {"status": "healthy", "conda_env": "/Users/steve/miniconda3/envs/chatterbox", "tts_workers": tts_pool.status(),
+            "jobs": synthesis_jobs.status(), "cache": synthesis_cache.stats()}
 
 @app.get("/voices")
 async def list_voices():
     """List available voice files"""
-    voice_files = [
-        "anisimova_segment1.mp3",
-        "anisimova_segment2.mp3", 
-        "mel.MP3",
-        "mel_cloned_speech.wav",
-        "mel_sassy_converted.wav",
-        "mel_speaks_142733.wav",
-        "mel_speaks_142857.wav",
-        "mel_speaks_143053.wav",
-        "mel_speaks_144223.wav",
-        "mel_speaks_145149.wav",
-        "mel_tuned_151217_e0.9_c0.4_t1.1.wav",
-        "rhod_voice.mp3",
-        "swiatek_voice_segment1.mp3",
-        "swiatek_voice_segment2.mp3",
-        "youtube_voice.mp3"
-    ]
-    return {"voices": voice_files}
+    return {"voices": VOICE_FILES}
 
 @app.post("/v1/synthesize", response_model=VoiceResponse)
-async def synthesize_voice(request: VoiceRequest):
-    """Synthesize voice using your working conda environment"""
-    
-    # Clone voice using your working script
-    result = clone_voice_working(
-        text=request.text,
-        voice_file=request.voice_file,
-        style=request.style
-    )
-    
-    if result["success"]:
+async def synthesize_voice(request: VoiceRequest, http_request: Request):
+    """Synthesize voice and wait for the result (queued like any job, without blocking the event loop)"""
+    # Hashing the voice file and copying the cached WAV is disk work, so keep it off the event loop
+    cached = await asyncio.to_thread(cached_voice, request.text, request.voice_file, request.style)
+    if cached:
+        return VoiceResponse(**cached)
+
+    job = submit_job(request, http_request)
+    await asyncio.wrap_future(job.future)
+
+    if job.status == "done":
         return VoiceResponse(
             success=True,
-            message=result["message"],
-            output_file=result["output_file"],
-            duration=result["duration"]
+            message=job.result["message"],
+            output_file=job.result["output_file"],
+            duration=job.result["duration"]
         )
+    elif job.status == "cancelled":
+        # Cancelled through DELETE /v1/jobs/{id} (or by a shutdown); nothing went wrong on the server
+        raise HTTPException(status_code=409, detail=f"Voice cloning cancelled: {job.error}")
     else:
         raise HTTPException(
             status_code=500,
-            detail=f"Voice cloning failed: {result['error']}"
+            detail=f"Voice cloning failed: {job.error}"
         )
 
+@app.post("/v1/jobs", status_code=202)
+async def create_job(request: VoiceRequest, http_request: Request):
+    """Queue a synthesis and return its job id right away; poll GET /v1/jobs/{id} for the result"""
+    cached = await asyncio.to_thread(cached_voice, request.text, request.voice_file, request.style)
+    if cached:
+        params = {"text": request.text, "voice_file": request.voice_file, "style": request.style}
+        job = synthesis_jobs.record(params, cached)
+        return synthesis_jobs.get(job.id)
+
+    job = submit_job(request, http_request)
+    return synthesis_jobs.get(job.id)
+
+@app.get("/v1/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, queue position, estimated progress and (when done) the result of a job"""
+    job = synthesis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+@app.get("/v1/cache/stats")
+async def cache_stats():
+    """Result cache hit rate, bytes saved and size"""
+    return synthesis_cache.stats()
+
+@app.delete("/v1/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    if synthesis_jobs.cancel(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return synthesis_jobs.get(job_id)
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+📜 LONG TEXT MODE
+Synthesize multi-paragraph scripts chunk by chunk!
+
+Splits the script at paragraph and sentence boundaries (falling back to word
+boundaries for unpunctuated text like the Pep roast), generates the chunks in
+parallel CPU worker processes that each load the model once, and streams them
+into one WAV with short crossfades. Only one chunk of audio is ever held in
+memory, however long the script (the models themselves cost one copy per worker).
+"""
+
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import soundfile as sf
+
+import speaker_cache
+
+MAX_CHUNK_CHARS = 300
+# Every CPU worker loads its own ChatterboxTTS (a few GB resident), so peak
+# memory grows with the worker count; pass `workers` explicitly to go higher
+DEFAULT_MAX_WORKERS = 2
+CROSSFADE_SECONDS = 0.05
+PARAGRAPH_PAUSE_SECONDS = 0.35
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def _split_words(text, max_chars):
+    chunk = []
+    length = 0
+    for token in text.split():
+        # A single token longer than the limit (a URL, a run of symbols) is cut into limit-sized pieces
+        for start in range(0, len(token), max_chars):
+            word = token[start:start + max_chars]
+            if chunk and length + 1 + len(word) > max_chars:
+                yield " ".join(chunk)
+                chunk, length = [], 0
+            length += len(word) + (1 if chunk else 0)
+            chunk.append(word)
+    if chunk:
+        yield " ".join(chunk)
+
+def split_text(text, max_chars=MAX_CHUNK_CHARS):
+    """
+    Split into (chunk, starts_paragraph) pairs of at most max_chars.
+
+    Sentences are packed together up to the limit; a sentence longer than the
+    limit is cut at word boundaries, into pieces of even length, so no chunk
+    ends up as a stub. A single word longer than the limit is cut mid-word.
+    """
+    chunks = []
+    for paragraph in re.split(r"\n\s*\n", text.strip()):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        current = ""
+        first = True
+        for sentence in _SENTENCE_END.split(paragraph):
+            if len(sentence) > max_chars:
+                pieces = -(-len(sentence) // max_chars)
+                parts = list(_split_words(sentence, min(max_chars, -(-len(sentence) // pieces) + 20)))
+            else:
+                parts = [sentence]
+            for part in parts:
+                if current and len(current) + 1 + len(part) > max_chars:
+                    chunks.append((current, first))
+                    current, first = "", False
+                current = f"{current} {part}" if current else part
+        if current:
+            chunks.append((current, first))
+    return chunks
+
+# --- Worker processes ---------------------------------------------------------
+
+_model = None
+_worker_args = None
+
+def _init_worker(device, threads, cache_dir):
+    """Load the model once per worker process"""
+    global _model, _worker_args
+    import torch
+    from chatterbox.tts import ChatterboxTTS
+
+    torch.set_num_threads(threads)
+    _model = ChatterboxTTS.from_pretrained(device=device)
+    _worker_args = {"cache_dir": cache_dir}
+
+def _synthesize_chunk(job):
+    text, reference_audio, settings, chunk_path = job
+    wav = speaker_cache.generate(_model, text, reference_audio, cache_dir=_worker_args["cache_dir"], **settings)
+    sf.write(chunk_path, wav.squeeze().cpu().numpy(), _model.sr, subtype="FLOAT")
+    return chunk_path
+
+# --- Stitching ----------------------------------------------------------------
+
+def _ramps(n):
+    angle = np.linspace(0.0, np.pi / 2, n, dtype=np.float32)
+    return np.sin(angle), np.cos(angle)  # equal-power fade in / fade out
+
+def stitch(chunk_paths, paragraph_starts, output_path, crossfade=CROSSFADE_SECONDS, pause=PARAGRAPH_PAUSE_SECONDS):
+    """
+    Stream chunk WAVs (in order) into output_path as 16-bit PCM, deleting each
+    chunk file once written. Chunks crossfade into each other; a new paragraph
+    fades out, pauses and fades back in. Returns the duration in seconds.
+    """
+    out = None
+    tail = np.zeros(0, dtype=np.float32)  # end of the previous chunk, held back for the crossfade
+    sample_rate = None
+    for chunk_path, new_paragraph in zip(chunk_paths, paragraph_starts):
+        audio, sr = sf.read(chunk_path, dtype="float32")
+        os.remove(chunk_path)
+        if out is None:
+            sample_rate = sr
+            out = sf.SoundFile(output_path, "w", samplerate=sr, channels=1, subtype="PCM_16")
+        elif sr != sample_rate:
+            raise ValueError(f"chunk sample rate {sr} != {sample_rate}")
+
+        fade = int(crossfade * sample_rate)
+        n = min(fade, len(tail), len(audio))
+        if n:
+            fade_in, fade_out = _ramps(n)
+            out.write(tail[:-n])
+            if new_paragraph:
+                out.write(tail[-n:] * fade_out)
+                out.write(np.zeros(int(pause * sample_rate), dtype=np.float32))
+                audio[:n] *= fade_in
+            else:
+                audio[:n] = audio[:n] * fade_in + tail[-n:] * fade_out
+        else:
+            out.write(tail)
+
+        keep = min(fade, len(audio))
+        out.write(audio[:len(audio) - keep])
+        tail = audio[len(audio) - keep:].copy()
+
+    if out is None:
+        raise ValueError("no chunks to stitch")
+    out.write(tail)
+    frames = out.frames
+    out.close()
+    return frames / sample_rate
+
+def synthesize_long_text(text, reference_audio, output_path, settings, model=None, workers=None,
+                         max_chars=MAX_CHUNK_CHARS, cache_dir=speaker_cache.CONDS_DIR):
+    """
+    Chunked synthesis of a long script into output_path.
+
+    With `model` (e.g. already loaded on MPS/CUDA) chunks are generated one after
+    another in this process; without it, `workers` CPU processes each load their
+    own model and generate chunks in parallel. Each of those holds a full model
+    in memory, so the default is at most DEFAULT_MAX_WORKERS. Returns duration
+    and chunk count.
+    """
+    chunks = split_text(text, max_chars)
+    if not chunks:
+        raise ValueError("no text to synthesize")
+    reference_audio = os.path.abspath(reference_audio)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as tmp_dir:
+        jobs = [
+            (chunk, reference_audio, settings, os.path.join(tmp_dir, f"chunk_{i:04d}.wav"))
+            for i, (chunk, _) in enumerate(chunks)
+        ]
+        paragraph_starts = [starts for _, starts in chunks]
+
+        if model is not None:
+            def generate_in_process():
+                for chunk, voice, chunk_settings, chunk_path in jobs:
+                    wav = speaker_cache.generate(model, chunk, voice, cache_dir=cache_dir, **chunk_settings)
+                    sf.write(chunk_path, wav.squeeze().cpu().numpy(), model.sr, subtype="FLOAT")
+                    yield chunk_path
+
+            duration = stitch(generate_in_process(), paragraph_starts, output_path)
+            return {"duration": duration, "chunks": len(chunks), "workers": 1}
+
+        cpus = os.cpu_count() or 1
+        workers = max(1, min(workers or min(DEFAULT_MAX_WORKERS, max(1, cpus // 2)), len(chunks)))
+        # Workers load the speaker conditioning from disk when it is cached; on a cold cache each
+        # worker computes it for itself and the first one to finish publishes it for later runs
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=("cpu", max(1, cpus // workers), cache_dir),
+        ) as pool:
+            # map() yields in chunk order, so stitching starts as soon as the first chunk is done
+            duration = stitch(pool.map(_synthesize_chunk, jobs), paragraph_starts, output_path)
+        return {"duration": duration, "chunks": len(chunks), "workers": workers}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        sys.exit("usage: long_text.py SCRIPT.txt REFERENCE_AUDIO OUTPUT.wav [WORKERS]")
+    with open(sys.argv[1], encoding="utf-8") as f:
+        script = f.read()
+    for i, (chunk, starts) in enumerate(split_text(script), 1):
+        print(f"{'¶' if starts else ' '} {i:>3}. ({len(chunk)} chars) {chunk[:60]}...")
+    result = synthesize_long_text(
+        script,
+        sys.argv[2],
+        sys.argv[3],
+        {"exaggeration": 0.5, "cfg_weight": 0.5, "temperature": 0.8},
+        workers=int(sys.argv[4]) if len(sys.argv) > 4 else None,
+    )
+    print(f"🎉 {result['chunks']} chunks on {result['workers']} workers → {sys.argv[3]} ({result['duration']:.1f} seconds)")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+🎙️ SPEAKER CONDITIONING CACHE
+Decode and embed each reference clip once!
+
+ChatterboxTTS re-reads, resamples and re-embeds the reference audio on every
+generate(audio_prompt_path=...) call. This keeps the resulting conditionals
+(model.conds) on disk as .npy arrays keyed by the clip's content hash, memory
+mapped on load, so repeat syntheses with a voice skip straight to generation.
+Editing or replacing a clip changes its hash, which invalidates the entry.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+CONDS_DIR = os.path.expanduser(os.getenv("VOICE_STUDIO_CONDS_DIR", "~/.voice_studio/speaker_conds"))
+MAX_ENTRIES = 64
+FORMAT_VERSION = 1
+
+_hashes = {}  # abspath -> (mtime_ns, size, sha256)
+
+def content_hash(path):
+    """sha256 of the clip, re-read only when its mtime or size changes"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _hashes.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    _hashes[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    return digest.hexdigest()
+
+def _entry_dir(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}_v{FORMAT_VERSION}")
+
+def save_conditionals(conds, key, source=None, cache_dir=CONDS_DIR):
+    """Write conds.t3 fields and conds.gen entries as one .npy per tensor, atomically"""
+    import torch
+
+    final_dir = _entry_dir(key, cache_dir)
+    tmp_dir = f"{final_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    meta = {"source": source, "created": time.time(), "t3": {}, "gen": {}}
+    for group, values in (("t3", vars(conds.t3)), ("gen", conds.gen)):
+        for name, value in values.items():
+            if torch.is_tensor(value):
+                np.save(os.path.join(tmp_dir, f"{group}.{name}.npy"), value.detach().cpu().numpy())
+                meta[group][name] = {"tensor": True}
+            else:
+                meta[group][name] = {"tensor": False, "value": value}
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    try:
+        os.replace(tmp_dir, final_dir)
+    except OSError:
+        # Renaming onto a non-empty directory fails; if another process published first, keep theirs
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isdir(final_dir):
+            raise
+    _prune(cache_dir)
+
+def load_conditionals(key, device, cache_dir=CONDS_DIR):
+    """Rebuild Conditionals from memory-mapped arrays, or None when not cached"""
+    import torch
+    from chatterbox.models.t3.modules.cond_enc import T3Cond
+    from chatterbox.tts import Conditionals
+
+    entry_dir = _entry_dir(key, cache_dir)
+    try:
+        with open(os.path.join(entry_dir, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    groups = {}
+    for group in ("t3", "gen"):
+        groups[group] = {}
+        for name, info in meta[group].items():
+            if info["tensor"]:
+                # Copy-on-write map: pages are read lazily and the array stays writable for torch
+                array = np.load(os.path.join(entry_dir, f"{group}.{name}.npy"), mmap_mode="c")
+                groups[group][name] = torch.from_numpy(array)
+            else:
+                groups[group][name] = info["value"]
+    os.utime(entry_dir)  # mark as recently used
+    return Conditionals(T3Cond(**groups["t3"]), groups["gen"]).to(device)
+
+def _prune(cache_dir, max_entries=MAX_ENTRIES):
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if not name.endswith(".tmp")]
+    entries.sort(key=os.path.getmtime)
+    for path in entries[:-max_entries]:
+        shutil.rmtree(path, ignore_errors=True)
+
+def use_speaker(model, audio_path, exaggeration=0.5, cache_dir=CONDS_DIR):
+    """Point model.conds at the clip's conditioning, computing and caching it on first use"""
+    key = content_hash(audio_path)
+    if getattr(model, "_speaker_key", None) == key and model.conds is not None:
+        return True  # already loaded in this process
+
+    os.makedirs(cache_dir, exist_ok=True)
+    conds = load_conditionals(key, model.device, cache_dir)
+    hit = conds is not None
+    if hit:
+        model.conds = conds
+    else:
+        model.prepare_conditionals(audio_path, exaggeration=exaggeration)
+        save_conditionals(model.conds, key, source=os.path.abspath(audio_path), cache_dir=cache_dir)
+    model._speaker_key = key
+    return hit
+
+def generate(model, text, audio_prompt_path, cache_dir=CONDS_DIR, **settings):
+    """model.generate() with the reference clip's conditioning served from the cache"""
+    if not hasattr(model, "prepare_conditionals"):
+        return model.generate(text, audio_prompt_path=audio_prompt_path, **settings)
+    use_speaker(model, audio_prompt_path, exaggeration=settings.get("exaggeration", 0.5), cache_dir=cache_dir)
+    # generate() swaps in the requested exaggeration itself when it differs from the cached one
+    return model.generate(text, **settings)
@@ -14,6 +14,8 @@ import soundfile as sf
 from datetime import datetime
 import glob
 
+import speaker_cache
+
 # Make sure we're in the right directory
 CHATTERBOX_DIR = "/Users/steve/chatterbox"
 os.chdir(CHATTERBOX_DIR)
@@ -136,9 +138,11 @@ def main():
         
         # Generate with settings
         settings = presets[style_choice]['settings']
-        wav = model.generate(
+        # Reference clip conditioning comes from the speaker cache after the first run
+        wav = speaker_cache.generate(
+            model,
             text,
-            audio_prompt_path=reference_audio,
+            reference_audio,
             **settings
         )
         
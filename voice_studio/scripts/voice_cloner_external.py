@@ -12,11 +12,14 @@ import soundfile as sf
 from datetime import datetime
 import glob
 
+import long_text
+
 # External drive configuration - EVERYTHING goes here
 EXTERNAL_DRIVE = "/Volumes/$teve"
 CHATTERBOX_DIR = "/Users/steve/chatterbox"
 EXTERNAL_OUTPUT = f"{EXTERNAL_DRIVE}/voice_cloning_output"
 EXTERNAL_TEMP = f"{EXTERNAL_DRIVE}/voice_cloning_temp"
+EXTERNAL_CONDS = f"{EXTERNAL_DRIVE}/speaker_conds"
 
 def setup_external_storage():
     """Setup external drive directories for ALL voice cloning files"""
@@ -24,7 +27,8 @@ def setup_external_storage():
         f"{EXTERNAL_DRIVE}/torch_cache",
         f"{EXTERNAL_DRIVE}/huggingface_cache", 
         f"{EXTERNAL_DRIVE}/voice_cloning_temp",
-        f"{EXTERNAL_DRIVE}/voice_cloning_output"
+        f"{EXTERNAL_DRIVE}/voice_cloning_output",
+        EXTERNAL_CONDS
     ]
     
     print("🔧 Setting up external drive storage...")
@@ -136,38 +140,45 @@ so go back to catalonia open up steam download football manager 2012 live in the
             device = "cpu"
             print("🖥️  Device: CPU (slower but stable)")
         
-        print(f"⏳ Loading model to {device}...")
-        print("📥 Using cached model from external drive...")
-        
-        # Load model - cache will be stored on external drive
-        model = ChatterboxTTS.from_pretrained(device=device)
-        print("✅ Model loaded successfully!")
-        
-        print(f"🎬 Generating speech with NORMAL settings...")
-        print(f"⏱️  Estimated time: 2-4 minutes for full script...")
-        print("🔄 Processing with natural pacing...")
-        
-        # Generate the full script with normal settings
-        wav = model.generate(
-            full_script,
-            audio_prompt_path=reference_audio,
-            **normal_settings
-        )
-        
-        print("✅ Speech generation complete!")
-        
         # Create output filename on external drive
         timestamp = datetime.now().strftime("%m%d_%H%M%S")
         voice_name = os.path.splitext(reference_audio)[0]
         output_file = f"pep_roast_{voice_name}_normal_{timestamp}.wav"
         external_path = f"{EXTERNAL_OUTPUT}/{output_file}"
-        
-        print(f"💾 Saving to external drive...")
-        # Save to external drive
-        sf.write(external_path, wav.squeeze().numpy(), model.sr, subtype='PCM_16')
-        
+
+        # Long text mode: the script is split into chunks and stitched with crossfades
+        chunks = long_text.split_text(full_script)
+        if device == "cpu":
+            # Parallel CPU workers, each loading the model once
+            print(f"🧩 Long text mode: {len(chunks)} chunks across parallel CPU workers...")
+            model = None
+        else:
+            print(f"⏳ Loading model to {device}...")
+            print("📥 Using cached model from external drive...")
+
+            # Load model - cache will be stored on external drive
+            model = ChatterboxTTS.from_pretrained(device=device)
+            print("✅ Model loaded successfully!")
+            print(f"🧩 Long text mode: {len(chunks)} chunks on {device}...")
+
+        print(f"🎬 Generating speech with NORMAL settings...")
+        print("🔄 Processing with natural pacing...")
+
+        # Reference clip conditioning comes from the speaker cache after the first run;
+        # chunks stream straight into the file on the external drive
+        result = long_text.synthesize_long_text(
+            full_script,
+            reference_audio,
+            external_path,
+            normal_settings,
+            model=model,
+            cache_dir=EXTERNAL_CONDS
+        )
+
+        print(f"✅ Speech generation complete! ({result['chunks']} chunks, {result['workers']} workers)")
+
         # Calculate stats
-        duration = wav.shape[-1] / model.sr
+        duration = result["duration"]
         file_size = os.path.getsize(external_path) / (1024 * 1024)
         
         print(f"\n🎉 NORMAL MODE COMPLETE!")